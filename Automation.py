@@ -3,14 +3,25 @@ from AppOpener import close, open as appopen  # Import functions to open and clo
 from webbrowser import open as webopen        # Import web browser functionality.
 from pywhatkit import search, playonyt        # Import functions for google search and Youtube playback
 from dotenv import dotenv_values              # Import dotenv to manage environment variables.
-from bs4 import BeautifulSoup                 # Import BeautifulSoup for parsing HTML Content.
+from html.parser import HTMLParser            # Import HTMLParser for streaming HTML parsing.
 from rich import print                        # Import rich for styled console output
 from groq import Groq                         # Import Groq for AI char functionalities
 import webbrowser                             # Import webbrowser for opening urls
 import subprocess                             # Import subprocess for interacting with the system
-import requests                               # Import requests for making HTTP requests.
 import keyboard                               # Import keyboard for keyboard-related actions
 import asyncio                                # Import asyncio for asynchronous programming.
+import threading                              # Import threading to guard shared caches.
+import contextvars                            # Import contextvars so handler spans nest under their command's span.
+import functools                              # Import functools to bind handlers to their context.
+from collections import OrderedDict         # Import an ordered dict for the bounded content history.
+from concurrent.futures import ThreadPoolExecutor  # Import a thread pool for bounded command execution.
+from Backend.CommandRegistry import Commands  # Import the shared command registry.
+from Backend.Tracer import Span, Traced  # Import the tracer to time each stage of a turn.
+from Backend.Cassette import CassetteSession, HttpxClient  # Import the record-and-replay layer for network calls.
+from Backend.PresentationGenerator import generate_presentations  # Import the batch presentation generator.
+from Backend.Session import ChatSession      # Import the bounded, locked chat history.
+import json                                   # Import json to persist caches on disk.
+import time                                   # Import time for cache expiry timestamps.
 import os                                     # Import os for operating system functionalities.
 
 # Load Environment variables form the .env file.
@@ -26,7 +37,7 @@ classes = ["zCubwf", "hgKElc", "LTKOO sY7ric", "Z0LcW", "gsrt vk_bk FzvWSb YwPhn
 useragent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.75 Safari/537.36'
 
 # Initialize the Groq client with the API key
-client = Groq(api_key=GroqAPIKey)
+client = Groq(api_key=GroqAPIKey, http_client=HttpxClient())
 
 # Predefined professional responses for user interactions.
 professional_responses = [
@@ -34,9 +45,6 @@ professional_responses = [
     "I'm at your service for any additional questions or support you may need-don't hesitate to ask."
 ]
 
-# List to store Chatbot messages
-messages = []
-
 # System message to provide context to the chatbot.
 SystemChatBot = [{
     "role": "system",
@@ -48,7 +56,63 @@ def GoogleSearch(Topic):
     search(Topic)  # USe pywhatkit's search function to perform Google Search.
     return True
 
-# Function to generate content using AI and Save it to a file.
+# Bounded content history: the most recent topics, each a session keeping only its last few messages.
+ContentHistory = OrderedDict()
+ContentHistoryTopics = 16    # Maximum number of topics remembered.
+ContentHistoryMessages = 6   # Maximum number of messages remembered per topic.
+ContentHistoryLock = threading.Lock()
+
+# Incremental filter that drops <think>...</think> reasoning blocks from streamed text.
+class ThinkTagFilter:
+
+    def __init__(self):
+        self.buffer = ""        # Text held back because it may be the start of a tag.
+        self.thinking = False   # True while inside a reasoning block.
+
+    # Function to feed a chunk and return the part of it that is safe to show.
+    def feed(self, text):
+        self.buffer += text
+        output = ""
+
+        while True:
+            tag = "</think>" if self.thinking else "<think>"
+            index = self.buffer.find(tag)
+
+            if index == -1:
+                # Hold back any suffix that could be the beginning of the tag.
+                keep = 0
+                for length in range(min(len(tag) - 1, len(self.buffer)), 0, -1):
+                    if self.buffer.endswith(tag[:length]):
+                        keep = length
+                        break
+                if not self.thinking:
+                    output += self.buffer[:len(self.buffer) - keep]
+                self.buffer = self.buffer[len(self.buffer) - keep:]
+                return output
+
+            if not self.thinking:
+                output += self.buffer[:index]
+            self.buffer = self.buffer[index + len(tag):]
+            self.thinking = not self.thinking
+
+    # Function to return whatever is left once the stream ends.
+    def flush(self):
+        rest = "" if self.thinking else self.buffer
+        self.buffer = ""
+        return rest
+
+# Function to get the bounded message history for a content topic.
+def ContentTopicHistory(topic):
+    with ContentHistoryLock:
+        if topic in ContentHistory:
+            ContentHistory.move_to_end(topic)
+        else:
+            ContentHistory[topic] = ChatSession(topic, max_messages=ContentHistoryMessages)
+            if len(ContentHistory) > ContentHistoryTopics:
+                ContentHistory.popitem(last=False)  # Forget the least recently used topic.
+        return ContentHistory[topic]
+
+# Function to generate content using AI and stream it to a file.
 def Content(Topic):
 
     # Nested function to open a file in notepad.
@@ -56,13 +120,13 @@ def Content(Topic):
         default_text_editor = 'notepad.exe' # Default text editor.
         subprocess.Popen([default_text_editor, File])  # Opent the file in NotePad.
     
-    # Nested function to generate content using the AI chatbot.
-    def ContentWriterAI(prompt):
-        messages.append({"role": "user", "content": f"{prompt}"})  # Add the user's prompt to messages.
+    # Nested function to stream content from the AI chatbot into a file.
+    def ContentWriterAI(prompt, File):
+        history = ContentTopicHistory(prompt.lower())
 
         completion = client.chat.completions.create(
             model = "deepseek-r1-distill-llama-70b",   # Specify the AI model.
-            messages = SystemChatBot + messages,  # Include system instructions and chat history.
+            messages = SystemChatBot + history.History() + [{"role": "user", "content": f"{prompt}"}],  # Include system instructions and topic history.
             max_tokens = 8192,  # Limit the maximum tokens in the response.
             temperature = 0.7,  # Adjust the response randomness
             top_p = 1,   # Use nucleus sampling for response diversity
@@ -70,26 +134,41 @@ def Content(Topic):
             stop= None    # Allow the model to determine stopping conditions.
         )
 
-        Answer = "" #Initialize an empty string for the response.
-
-        # Process stramed response chunks.
-        for chunk in completion:
-            if chunk.choices[0].delta.content:  # Check for content in the current chunk.
-                Answer += chunk.choices[0].delta.content  # Append the content to the answer.
-        
-        Answer = Answer.replace("</s>", "") # Remove unwanted tokens from the response.
-        messages.append({"role": "assistant", "content": Answer})  # Add the AI's response to messages/
+        Answer = "" # Initialize an empty string for the response.
+        think_filter = ThinkTagFilter()
+        opened = False
+
+        with open(File, "w", encoding="utf-8") as file:
+
+            # Nested function to write visible text and open the editor once the first chunk lands.
+            def Write(text):
+                nonlocal Answer, opened
+                if not Answer:
+                    text = text.lstrip()  # Drop the blank lines left behind by a reasoning block.
+                if not text:
+                    return
+                Answer += text
+                file.write(text)
+                file.flush()
+                if not opened:
+                    OpenNotePad(File)
+                    opened = True
+
+            # Process streamed response chunks as they arrive.
+            for chunk in completion:
+                if chunk.choices[0].delta.content:  # Check for content in the current chunk.
+                    Write(think_filter.feed(chunk.choices[0].delta.content.replace("</s>", "")))
+            Write(think_filter.flush())
+
+        if not opened:
+            OpenNotePad(File)  # Still show the (empty) file if nothing was generated.
+
+        # Remember the prompt with the AI's response for this topic.
+        history.Record({"role": "user", "content": f"{prompt}"}, {"role": "assistant", "content": Answer})
         return Answer
     
-    Topic: str = Topic.replace("Content ", "") # Remove 'Content ' from the topic
-    ContentByAI = ContentWriterAI(Topic)       # Generate contetn using AI
-
-    # Save the generatede content to a text file.
-    with open(rf"Data\{Topic.lower().replace(' ','')}.txt", "w", encoding="utf-8") as file:
-        file.write(ContentByAI)  # write the content tot he file
-        file.close()
-    
-    OpenNotePad(rf"Data\{Topic.lower().replace(' ','')}.txt")  # Open the file in Notepad.
+    Topic: str = Topic.replace("Content ", "").removeprefix("content ") # Remove 'Content ' from the topic
+    ContentWriterAI(Topic, rf"Data\{Topic.lower().replace(' ','')}.txt")  # Stream the content into a text file.
     return True  # Indicate Success.
 
 # Function to search for a topic on Youtube.
@@ -103,38 +182,130 @@ def PlayYouTube(query):
     playonyt(query)  # Use pywhatkit's playonyt function to play the video.
     return True  # Indicate Success.
 
+# Path of the persistent website resolution cache and how long a resolved entry stays valid.
+WebsiteCachePath = r"Data\WebsiteCache.json"
+WebsiteCacheTTL = 7 * 24 * 60 * 60  # One week, in seconds.
+
+# Common websites that are resolved without touching the network.
+SeedWebsites = {
+    "facebook": "https://www.facebook.com",
+    "instagram": "https://www.instagram.com",
+    "youtube": "https://www.youtube.com",
+    "google": "https://www.google.com",
+    "gmail": "https://mail.google.com",
+    "twitter": "https://twitter.com",
+    "x": "https://x.com",
+    "linkedin": "https://www.linkedin.com",
+    "whatsapp": "https://web.whatsapp.com",
+    "telegram": "https://web.telegram.org",
+    "reddit": "https://www.reddit.com",
+    "github": "https://github.com",
+    "stackoverflow": "https://stackoverflow.com",
+    "wikipedia": "https://www.wikipedia.org",
+    "amazon": "https://www.amazon.com",
+    "netflix": "https://www.netflix.com",
+    "spotify": "https://open.spotify.com",
+    "chatgpt": "https://chatgpt.com",
+}
+
+WebsiteCache = {}                    # Resolved websites as {name: {"url": ..., "time": ...}}.
+WebsiteCacheLock = threading.Lock()  # Guards the cache, since apps are opened from worker threads.
+
+# Function to load the website cache from disk.
+def LoadWebsiteCache():
+    try:
+        with open(WebsiteCachePath, "r", encoding="utf-8") as f:
+            WebsiteCache.update(json.load(f))
+    except (OSError, ValueError):
+        pass  # A missing or corrupt cache simply starts empty.
+
+# Function to save the website cache to disk.
+def SaveWebsiteCache():
+    try:
+        with open(WebsiteCachePath, "w", encoding="utf-8") as f:
+            json.dump(WebsiteCache, f, indent=4)
+    except OSError as e:
+        print(f"Could not save website cache: {e}")
+
+# Function to normalize an app name for the website lookups; the DMM emits names like "(facebook)".
+def WebsiteKey(app):
+    return app.lower().strip("() ")
+
+# Function to look up a website for an app name, returning None on a miss or an expired entry.
+def ResolveWebsite(app):
+    name = WebsiteKey(app)
+
+    if name in SeedWebsites:
+        return SeedWebsites[name]
+
+    with WebsiteCacheLock:
+        entry = WebsiteCache.get(name)
+
+    if entry and time.time() - entry["time"] < WebsiteCacheTTL:
+        return entry["url"]
+    return None
+
+# Function to remember the website resolved for an app name.
+def RememberWebsite(app, url):
+    with WebsiteCacheLock:
+        WebsiteCache[WebsiteKey(app)] = {"url": url, "time": time.time()}
+        SaveWebsiteCache()
+
+# Streaming HTML parser that stops at the first Google result link.
+class FirstResultLinkParser(HTMLParser):
+
+    def __init__(self):
+        super().__init__()
+        self.link = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.link is None and tag == "a":
+            attrs = dict(attrs)
+            if attrs.get("jsname") == "UWckNb" and attrs.get("href"):
+                self.link = attrs["href"]
+
+LoadWebsiteCache()
+
 # Function to open an application or a releavnt webpage.
-def OpenApp(app, sess=requests.session()):
+def OpenApp(app, sess=CassetteSession()):
 
     try:
         appopen(app, match_closest=True, output=True, throw_error=True)  # Attemptto open the app.
         return True  # Indicate Success.
     
     except:
-        # Nested function to extract links from HTML content.
-        def extract_links(html):
-            if html is None:
-                return []
-            soup = BeautifulSoup(html, 'html.parser')  # Parse the HTML content.
-            links = soup.find_all('a', {'jsname': 'UWckNb'})  # Find relevant links.
-            return [link.get('href') for link in links]  # Return the links.
-        
-        # Nested function to perform a Google Search and retrieve HTML.
+        # Serve repeat opens from the cache without touching the network.
+        link = ResolveWebsite(app)
+        if link:
+            webopen(link)
+            return True
+
+        # Nested function to stream a Google Search and return the first result link.
         def search_google(query):
             url = f"https://www.google.com/search?q={query}"  # Construct the Google search URL
             headers = {"User-Agent": useragent}   # Use the predefined user-agent
-            response = sess.get(url, headers=headers)  # peform the GET request.
+            response = sess.get(url, headers=headers, stream=True)  # Peform the GET request without reading the body.
 
-            if response.status_code == 200:
-                return response.text  # Return the HTML content.
-            else:
-                print("Failed to retrieve search results.")  # Print an error message.
-            return None
+            try:
+                if response.status_code != 200:
+                    print("Failed to retrieve search results.")  # Print an error message.
+                    return None
+
+                # Feed the body to the parser chunk by chunk and stop at the first matching link.
+                response.encoding = response.encoding or "utf-8"
+                parser = FirstResultLinkParser()
+                for chunk in response.iter_content(chunk_size=8192, decode_unicode=True):
+                    parser.feed(chunk)
+                    if parser.link:
+                        break
+                return parser.link
+            finally:
+                response.close()
         
-        html = search_google(app)  # Perform the Google search.
+        link = search_google(app)  # Perform the Google search.
 
-        if html:
-            link = extract_links(html)[0]   # Extract the first link from the search results.
+        if link:
+            RememberWebsite(app, link)  # Cache the resolution for repeat opens.
             webopen(link)  # Open the link in a web browser.
         
         return True   # Indicate success.
@@ -182,71 +353,121 @@ def System(command):
 
     return True # Indicate success
 
+# Function to generate a PowerPoint presentation on a topic.
+def Presentation(Topic):
+    Topic = Topic.strip("() ")
+    # Charts render in process: worker processes would re-import the assistant's main module.
+    results = generate_presentations([Topic], llm_workers=1, chart_workers=0) if Topic else []
+    if not results:  # The generator drops blank topics.
+        print("Presentation failed: no topic given")
+        return False
+    result = results[0]
+    if result["error"]:
+        print(f"Presentation failed: {result['error']}")
+        return False
+    if hasattr(os, "startfile"):
+        os.startfile(os.path.abspath(result["file"]))  # Open the deck in PowerPoint.
+    return True  # Indicate success.
+
+# Dedicated bounded pool for blocking automation commands, so a burst of commands cannot spawn unbounded threads.
+CommandExecutor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="Automation")
+
+# Bind the automation handlers to the shared command registry.
+Commands.Register("open", OpenApp)
+Commands.Register("close", CloseApp)
+Commands.Register("play", PlayYouTube)
+Commands.Register("content", Content)
+Commands.Register("google search", GoogleSearch)
+Commands.Register("youtube search", YouTubeSearch)
+Commands.Register("system", System)
+Commands.Register("presentation", Presentation)
+
+# Function to find the indexes of earlier commands that a command has to wait for.
+def CommandDependencies(plan, index):
+    command, target = plan[index]
+    dependencies = []
+
+    for earlier in range(index):
+        earlier_command, earlier_target = plan[earlier]
+
+        # Commands on the same target run in order, and a close finishes before anything after it starts.
+        if earlier_target == target or earlier_command.name == "close":
+            dependencies.append(earlier)
+
+    return dependencies
+
+# Function to translate commands into a plan of (command, argument) steps.
+def TranslateCommands(commands: list[str]):
+
+    plan = []  # List to store the planned commands.
+
+    for text in commands:
+
+        if text == "open file":  # Ignore "open file" commands.
+            continue
+
+        match = Commands.Match(text)  # Look the command up in the registry.
+
+        if match is None:
+            print(f"No Function Found. For {text}")  # Print an error for unrecognized commands.
+
+        elif match[0].handler is not None:  # Skip decision-only commands such as "general".
+            if match[0].idempotent and match in plan:
+                continue  # Run repeated idempotent commands only once.
+            plan.append(match)
+
+    return plan
+
 # Asynchronous function to translate and execute user commands.
 async def TranslateAndExecute(commands: list[str]):
 
-    funcs = []  # List to store asynchronous tasks.
+    plan = TranslateCommands(commands)
+    loop = asyncio.get_running_loop()
+    tasks = []  # List to store asynchronous tasks, one per planned command.
 
-    for command in commands:
+    # Nested coroutine to run one command after its dependencies, within its deadline.
+    async def RunCommand(index):
+        command, argument = plan[index]
 
-        if command.startswith("open "):   # Handle "open" commands.
+        for dependency in CommandDependencies(plan, index):
+            await asyncio.wait([tasks[dependency]])  # Wait for the dependency whatever its outcome.
 
-            if "open it" in command:   # Ignore "open it" commands.
-                pass
+        with Span(f"automation.{command.name}", argument=argument) as span:
+            result = {"command": f"{command.name} {argument}", "success": False, "result": None, "error": None}
+            started = time.monotonic()
 
-            if "open file" == command:  # Ignore "open file" commands.
-                pass
-            
+            if command.blocking:
+                # Run the handler in a copy of this context, so the spans it opens nest under this one.
+                context = contextvars.copy_context()
+                work = loop.run_in_executor(CommandExecutor, functools.partial(context.run, command.handler, argument))
             else:
-                fun = asyncio.to_thread(OpenApp, command.removeprefix("open "))  # Schedule app opening.
-                funcs.append(fun)
-        
-        elif command.startswith("general "):  # Placeholder for general commands.
-            pass
+                work = command.handler(argument)
 
-        elif command.startswith("realtime "):   # Placeholder for real-time commands.
-            pass
-        
-        elif command.startswith("close "):   # Handle "close" commands.
-            fun = asyncio.to_thread(CloseApp, command.removeprefix("close "))  # Schedule app closing.
-            funcs.append(fun)
-        
-        elif command.startswith("play "):   # Handle 'play' commands.
-            fun = asyncio.to_thread(PlayYouTube, command.removeprefix("play "))  # Schedule YouTube Playback.
-            funcs.append(fun)
-
-        elif command.startswith("content "):    # Handle  "content" commands.
-            fun = asyncio.to_thread(GoogleSearch, command.removeprefix("content ")) # Schedule content creation.
-            funcs.append(fun)
+            try:
+                result["result"] = await asyncio.wait_for(work, timeout=command.timeout)
+                result["success"] = result["result"] is not False
+            except asyncio.TimeoutError:
+                result["error"] = "timed out"
+            except Exception as e:
+                result["error"] = str(e)
 
-        elif command.startswith("google search "):  # Handle Google Search commands.
-            fun = asyncio.to_thread(GoogleSearch, command.removeprefix("google search "))  # Schedule google search
-            funcs.append(fun)
+            result["elapsed"] = time.monotonic() - started
+            span.args["success"] = result["success"]
+        return result
 
-        elif command.startswith("youtube search "):   # Handle youtbe search.
-            fun = asyncio.to_thread(YouTubeSearch, command.removeprefix("youtube search "))  # Schedule Youtube searcj.
-            funcs.append(fun)
-        
-        elif command.startswith("system "):    # Handle system command.
-            fun = asyncio.to_thread(System, command.removeprefix("system "))  # Schedule system command.
-            funcs.append(fun)
-        
-        else:
-            print(f"No Function Found. For {command}")  # Print an error for unrecognized commands.
-    
-    results = await asyncio.gather(*funcs) # Executr all tasks concurrently.
+    for index in range(len(plan)):
+        tasks.append(asyncio.create_task(RunCommand(index)))
 
-    for result in results:  # Process the results.
-        if isinstance(result, str):
-            yield result
-        else:
-            yield result
+    for finished in asyncio.as_completed(tasks):  # Stream results back as each command completes.
+        yield await finished
 
 # Asynchronous function to automate command execution.
+@Traced("automation")
 async def Automation(commands: list[str]):
 
     async for result in TranslateAndExecute(commands):   # Translate And Execute commands.
-        pass
+        if not result["success"]:
+            print(f"Command failed: {result['command']} ({result['error'] or 'returned False'})")
 
     return True   # Indicate success.
 
@@ -259,6 +480,9 @@ if __name__ == "__main__":
     if not os.path.exists("Data"):
         os.makedirs("Data")
     
+    # Bounded history of the conversation in this console
+    console = ChatSession("console")
+    
     # Function to process user input and execute appropriate commands
     async def process_command():
         print("[bold green]JARVIS AI Assistant initialized. Ready for commands.[/bold green]")
@@ -292,8 +516,8 @@ if __name__ == "__main__":
                 
                 # If no specific command pattern is recognized, use AI to respond or execute
                 else:
-                    # Add the user message to the conversation history
-                    messages.append({"role": "user", "content": user_input})
+                    # Add the user message to a snapshot of the conversation history
+                    messages = console.History() + [{"role": "user", "content": user_input}]
                     
                     # Get a response from the AI
                     print("[bold blue]Processing with AI...[/bold blue]")
@@ -320,7 +544,7 @@ if __name__ == "__main__":
                     
                     # Clean up the response and add it to the message history
                     answer = answer.replace("</s>", "")
-                    messages.append({"role": "assistant", "content": answer})
+                    console.Record(messages[-1], {"role": "assistant", "content": answer})
                     print("\n")
                     
             except Exception as e:
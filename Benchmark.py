@@ -0,0 +1,516 @@
+# Offline replay benchmark for the assistant pipeline.
+# Recorded sessions are replayed through the same stages as MainExecution in Main.py (speech
+# recognition, translation, decision model, automation, image generation, chatbot or realtime
+# search, text-to-speech) against local fakes for the microphone page, Cohere, Groq, Google search,
+# edge-tts, pygame and the Hugging Face endpoint, so it runs without a mic, network or API keys.
+#
+#     python -m Backend.Benchmark [sessions...] [--speed 0] [--rounds 5] [--baseline Benchmark.json]
+#
+# A session is a JSON file {"name": ..., "turns": [turn, ...]}; every field of a turn but the
+# transcript is optional:
+#
+#     {
+#         "transcript": "who is ada lovelace",           text the microphone page recognizes
+#         "audio": "Data\\Benchmark\\ada.wav",           recording, its length is the time spent listening
+#         "speech_seconds": 1.5,                         listening time when there is no recording
+#         "language": "hi", "translation": "...",        input language and the translator's output
+#         "decision": stream,                            Cohere decision model output
+#         "search": {"results": [{"title", "description", "url"}], "seconds": 0.6},
+#         "answer": stream,                              Groq chatbot / realtime / content output
+#         "automation": {"open chrome": 0.8},            seconds each automation command takes
+#         "image": {"seconds": 6.0},                     Hugging Face latency per image
+#         "synthesis": {"delays": [0.2, 0.05]},          edge-tts delay before each audio chunk
+#         "playback_seconds": 3.5                        length of the spoken answer
+#     }
+#
+# A stream is either a string or {"chunks": [...], "delays": [...]}, each delay being the seconds
+# recorded before its chunk. Delays are multiplied by --speed: 1 replays the recorded timing, the
+# default 0 drops it so only the assistant's own processing is measured.
+#
+# With --baseline the results are compared against a saved run and the exit status is 1 when a
+# stage's p95 latency or the turn throughput regressed by more than --tolerance, so CI can fail on it.
+
+from types import ModuleType, SimpleNamespace  # Import helpers to build the fake modules.
+import argparse                                 # Import argparse for the command line options.
+import asyncio                                  # Import asyncio to run the async stages.
+import tempfile                                 # Import tempfile for the scratch working directory.
+import json                                     # Import json to read sessions and write results.
+import time                                     # Import time to replay recorded delays.
+import wave                                     # Import wave to read the length of recorded audio.
+import sys                                      # Import sys to install the fake modules.
+import os                                       # Import os for paths and the environment.
+
+# Multiplier applied to every recorded delay.
+ReplaySpeed = 0.0
+
+# Turn currently being replayed; the fakes read their recorded responses from it.
+CurrentTurn = {}
+
+# Settings written to the scratch .env the pipeline modules load.
+BenchmarkEnv = {
+    "Username": "Benchmark",
+    "Assistantname": "Jarvis",
+    "InputLanguage": "en",
+    "AssistantVoice": "en-CA-LiamNeural",
+    "CohereAPIKey": "offline",
+    "GroqAPIKey": "offline",
+    "HuggingFaceAPIKey": "offline",
+}
+
+# Session replayed when no session file is given, covering each kind of turn.
+SampleSession = {
+    "name": "sample",
+    "turns": [
+        {
+            "transcript": "how are you today",
+            "speech_seconds": 1.2,
+            "decision": {"chunks": ["general", " how are you today?"], "delays": [0.35, 0.02]},
+            "answer": {"chunks": ["I am doing well", ", thank you", " for asking."], "delays": [0.25, 0.03, 0.03]},
+            "synthesis": {"delays": [0.3, 0.05, 0.05]},
+            "playback_seconds": 2.0,
+        },
+        {
+            "transcript": "who is ada lovelace",
+            "speech_seconds": 1.4,
+            "decision": {"chunks": ["realtime who is ada lovelace?"], "delays": [0.4]},
+            "search": {
+                "seconds": 0.6,
+                "results": [
+                    {"title": "Ada Lovelace", "description": "English mathematician, 1815-1852.", "url": "https://example.org/ada"},
+                    {"title": "Analytical Engine", "description": "Notes on Babbage's engine.", "url": "https://example.org/engine"},
+                ],
+            },
+            "answer": {"chunks": ["Ada Lovelace was", " an English mathematician", " known for her notes on the Analytical Engine."], "delays": [0.3, 0.04, 0.04]},
+            "synthesis": {"delays": [0.3, 0.05, 0.05, 0.05]},
+            "playback_seconds": 4.0,
+        },
+        {
+            "transcript": "open chrome and tell me a joke",
+            "speech_seconds": 1.8,
+            "decision": {"chunks": ["open chrome,", " general tell me a joke."], "delays": [0.35, 0.03]},
+            "automation": {"open chrome": 0.8},
+            "answer": {"chunks": ["Why did the computer", " go to the doctor?", " It had a virus."], "delays": [0.25, 0.03, 0.03]},
+            "synthesis": {"delays": [0.3, 0.05, 0.05]},
+            "playback_seconds": 3.0,
+        },
+        {
+            "transcript": "generate image of a lighthouse at night",
+            "speech_seconds": 2.0,
+            "decision": {"chunks": ["generate image a lighthouse at night,", " general generate image of a lighthouse at night."], "delays": [0.4, 0.03]},
+            "image": {"seconds": 6.0},
+            "answer": "Here are your images of a lighthouse at night.",
+            "synthesis": {"delays": [0.3, 0.05]},
+            "playback_seconds": 2.5,
+        },
+        {
+            "transcript": "aaj mausam kaisa hai",
+            "language": "hi",
+            "translation": "how is the weather today",
+            "speech_seconds": 1.6,
+            "decision": {"chunks": ["realtime how is the weather today?"], "delays": [0.4]},
+            "search": {"seconds": 0.5, "results": [{"title": "Weather", "description": "Sunny, 24 degrees.", "url": "https://example.org/weather"}]},
+            "answer": {"chunks": ["It is sunny", " and 24 degrees today."], "delays": [0.3, 0.03]},
+            "synthesis": {"delays": [0.3, 0.05]},
+            "playback_seconds": 2.0,
+        },
+    ],
+}
+
+# Function to wait for a recorded delay, scaled by the replay speed.
+def Pause(seconds):
+    if seconds and ReplaySpeed > 0:
+        time.sleep(seconds * ReplaySpeed)
+
+# Function to turn a recorded stream into (chunk, delay) pairs.
+def StreamOf(spec):
+    if spec is None:
+        return []
+    if isinstance(spec, str):
+        return [(spec, 0.0)]
+    delays = list(spec.get("delays", []))
+    return [(chunk, delays[index] if index < len(delays) else 0.0) for index, chunk in enumerate(spec["chunks"])]
+
+# Function to get how long the user speaks in the current turn.
+def SpeechSeconds(turn):
+    if turn.get("audio"):
+        with wave.open(turn["audio"], "rb") as f:
+            return f.getnframes() / f.getframerate()
+    return turn.get("speech_seconds", 0.0)
+
+# Fake Cohere client replaying the recorded decision.
+class FakeCohereClient:
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def chat_stream(self, message=None, **kwargs):
+        for text, delay in StreamOf(CurrentTurn.get("decision", "general " + str(message))):
+            Pause(delay)
+            yield SimpleNamespace(event_type="text-generation", text=text)
+        yield SimpleNamespace(event_type="stream-end", text="")
+
+# Fake Groq chat completions replaying the recorded answer.
+class FakeGroqCompletions:
+
+    def create(self, stream=False, **kwargs):
+        pairs = StreamOf(CurrentTurn.get("answer", ""))
+        if not stream:
+            Pause(sum(delay for _, delay in pairs))
+            message = SimpleNamespace(content="".join(text for text, _ in pairs))
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+        return self.Stream(pairs)
+
+    def Stream(self, pairs):
+        for text, delay in pairs:
+            Pause(delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+class FakeGroq:
+
+    def __init__(self, *args, **kwargs):
+        self.chat = SimpleNamespace(completions=FakeGroqCompletions())
+
+# Fake googlesearch.search replaying the recorded results.
+def FakeGoogleSearch(query, num_results=10, advanced=False, **kwargs):
+    recorded = CurrentTurn.get("search", {})
+    Pause(recorded.get("seconds", 0.0))
+    for result in recorded.get("results", [])[:num_results]:
+        yield SimpleNamespace(url=result.get("url", ""), title=result.get("title", ""), description=result.get("description", "")) if advanced else result.get("url", "")
+
+# Fake edge-tts communicator replaying the recorded synthesis timing.
+class FakeCommunicate:
+
+    def __init__(self, text, voice=None, **kwargs):
+        self.text = text
+
+    async def stream(self):
+        for delay in CurrentTurn.get("synthesis", {}).get("delays", [0.0]):
+            if delay and ReplaySpeed > 0:
+                await asyncio.sleep(delay * ReplaySpeed)
+            yield {"type": "audio", "data": bytes(4096)}
+
+# Fake pygame mixer whose music plays for the recorded playback length.
+class FakeMusic:
+
+    def __init__(self):
+        self.until = 0.0
+
+    def load(self, path):
+        pass
+
+    def play(self):
+        self.until = time.monotonic() + CurrentTurn.get("playback_seconds", 0.0) * ReplaySpeed
+
+    def get_busy(self):
+        return time.monotonic() < self.until
+
+    def stop(self):
+        self.until = 0.0
+
+class FakeMixer:
+
+    def __init__(self):
+        self.music = FakeMusic()
+        self.initialized = False
+
+    def init(self, *args, **kwargs):
+        self.initialized = True
+
+    def get_init(self):
+        return self.initialized
+
+    def quit(self):
+        self.initialized = False
+
+class FakeClock:
+
+    def tick(self, framerate=0):
+        if framerate and ReplaySpeed > 0:
+            time.sleep(1 / framerate)
+
+# Fake Chrome driver standing in for the speech recognition page.
+class FakeElement:
+
+    def __init__(self, driver, element_id):
+        self.driver = driver
+        self.element_id = element_id
+
+    @property
+    def text(self):
+        return self.driver.Text(self.element_id)
+
+    def click(self):
+        self.driver.Click(self.element_id)
+
+class FakeDriver:
+
+    def __init__(self, *args, **kwargs):
+        self.listening_since = None
+        self.duration = 0.0
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by=None, value=None):
+        return FakeElement(self, value)
+
+    def execute_script(self, script):
+        pass
+
+    def quit(self):
+        pass
+
+    def Click(self, element_id):
+        self.listening_since = time.monotonic() if element_id == "start" else None
+        self.duration = SpeechSeconds(CurrentTurn) * ReplaySpeed
+
+    # Function to reveal the transcript word by word as interim text, then as the final result.
+    def Text(self, element_id):
+        if self.listening_since is None:
+            return ""
+        words = CurrentTurn.get("transcript", "").split()
+        progress = (time.monotonic() - self.listening_since) / self.duration if self.duration > 0 else 1.0
+        if element_id == "output":
+            return " ".join(words) if progress >= 1.0 else ""
+        if element_id == "interim":
+            return " ".join(words[:int(len(words) * progress)]) if progress < 1.0 else ""
+        return ""
+
+# Fake translator returning the recorded translation.
+def FakeTranslate(text, target="en", source="auto"):
+    Pause(CurrentTurn.get("translate_seconds", 0.0))
+    return CurrentTurn.get("translation", text)
+
+# Fake Hugging Face inference endpoint returning a placeholder image.
+def FakeHuggingFacePost(url, headers=None, json=None, **kwargs):
+    Pause(CurrentTurn.get("image", {}).get("seconds", 0.0))
+    return SimpleNamespace(headers={"Content-Type": "image/jpeg"}, content=bytes(1024), text="")
+
+# Function to build a fake module with the given attributes.
+def FakeModule(name, **attributes):
+    module = ModuleType(name)
+    module.__dict__.update(attributes)
+    return module
+
+# Function to install the fakes in place of the services and devices the pipeline imports.
+def InstallFakes():
+    mixer = FakeMixer()
+    fakes = {
+        "cohere": FakeModule("cohere", Client=FakeCohereClient),
+        "groq": FakeModule("groq", Groq=FakeGroq),
+        "googlesearch": FakeModule("googlesearch", search=FakeGoogleSearch),
+        "edge_tts": FakeModule("edge_tts", Communicate=FakeCommunicate),
+        "pygame": FakeModule("pygame", mixer=mixer, time=SimpleNamespace(Clock=FakeClock)),
+        "mtranslate": FakeModule("mtranslate", translate=FakeTranslate),
+        "selenium": FakeModule("selenium"),
+        "selenium.webdriver": FakeModule("selenium.webdriver", Chrome=FakeDriver),
+        "selenium.webdriver.common": FakeModule("selenium.webdriver.common"),
+        "selenium.webdriver.common.by": FakeModule("selenium.webdriver.common.by", By=SimpleNamespace(ID="id")),
+        "selenium.webdriver.chrome": FakeModule("selenium.webdriver.chrome"),
+        "selenium.webdriver.chrome.service": FakeModule("selenium.webdriver.chrome.service", Service=lambda *args, **kwargs: None),
+        "selenium.webdriver.chrome.options": FakeModule("selenium.webdriver.chrome.options", Options=lambda: SimpleNamespace(add_argument=lambda argument: None)),
+        "webdriver_manager": FakeModule("webdriver_manager"),
+        "webdriver_manager.chrome": FakeModule("webdriver_manager.chrome", ChromeDriverManager=lambda: SimpleNamespace(install=lambda: "")),
+        "AppOpener": FakeModule("AppOpener", open=lambda *args, **kwargs: None, close=lambda *args, **kwargs: None),
+        "pywhatkit": FakeModule("pywhatkit", search=lambda *args, **kwargs: None, playonyt=lambda *args, **kwargs: None),
+        "keyboard": FakeModule("keyboard", press_and_release=lambda *args, **kwargs: None),
+    }
+    sys.modules.update(fakes)
+
+    import webbrowser
+    webbrowser.open = lambda *args, **kwargs: True  # Never open a real browser during a replay.
+
+# Function to create a scratch working directory so replays never touch the real chat log.
+def PrepareWorkspace():
+    workspace = tempfile.mkdtemp(prefix="AssistantBenchmark")
+    os.makedirs(os.path.join(workspace, "Data"), exist_ok=True)
+    os.makedirs(os.path.join(workspace, "Frontend", "Files"), exist_ok=True)
+    with open(os.path.join(workspace, ".env"), "w", encoding="utf-8") as f:
+        f.write("".join(f"{key}={value}\n" for key, value in BenchmarkEnv.items()))
+    os.environ.update(BenchmarkEnv)
+    os.chdir(workspace)
+    return workspace
+
+# Function to import the pipeline stages once the fakes and workspace are in place.
+def LoadPipeline():
+    from Backend import SpeechToText, Model, Automation, Chatbot, RealtimeSearchEngine, TextToSpeech, Tracer, Prompt
+    from Backend.CommandRegistry import Commands
+    import Backend.Reminder  # Registers the reminder command like Main.py does.
+
+    # Automation handlers act on the desktop, so they are replaced by ones replaying the recorded time.
+    for command in Commands.commands.values():
+        if command.automation:
+            Commands.Register(command.name, AutomationReplayer(command.name))
+
+    return SimpleNamespace(
+        SpeechToText=SpeechToText,
+        SpeechRecognition=SpeechToText.SpeechRecognition,
+        BargeInMonitor=SpeechToText.BargeInMonitor,
+        FirstLayerDMM=Model.FirstLayerDMM,
+        AnswerDecision=Model.AnswerDecision,
+        Automation=Automation.Automation,
+        ChatBot=Chatbot.ChatBot,
+        RealtimeSearchEngine=RealtimeSearchEngine.RealtimeSearchEngine,
+        TextToSpeech=TextToSpeech.TextToSpeech,
+        Commands=Commands,
+        Tracer=Tracer,
+        Prompt=Prompt,
+    )
+
+# Automation handler taking the time recorded for its command.
+class AutomationReplayer:
+
+    def __init__(self, name):
+        self.name = name
+
+    def __call__(self, argument):
+        Pause(CurrentTurn.get("automation", {}).get(f"{self.name} {argument}".strip(), 0.0))
+        return True
+
+# Function to replay image generation the way ImageGeneration.py requests its four images.
+async def ReplayImageGeneration(prompt):
+    tasks = [asyncio.to_thread(FakeHuggingFacePost, "huggingface", json={"inputs": prompt}) for _ in range(4)]
+    return await asyncio.gather(*tasks)
+
+# Function to replay one turn through the stages of MainExecution.
+def ReplayTurn(pipeline, turn):
+    global CurrentTurn
+    CurrentTurn = turn
+    pipeline.SpeechToText.InputLanguage = turn.get("language", BenchmarkEnv["InputLanguage"])
+    Span = pipeline.Tracer.Span
+
+    with Span("turn"):
+        Query = pipeline.SpeechRecognition()
+        Decision = pipeline.FirstLayerDMM(Query)
+
+        if any(pipeline.Commands.IsAutomation(queries) for queries in Decision):
+            asyncio.run(pipeline.Automation(list(Decision)))
+
+        for queries in Decision:
+            if "generate" in queries:
+                with Span("image"):
+                    asyncio.run(ReplayImageGeneration(queries))
+                break
+
+        Answer, _ = pipeline.AnswerDecision(Decision)  # The same dispatch as MainExecution.
+        if Answer:
+            pipeline.TextToSpeech(Answer, pipeline.BargeInMonitor(Answer))
+
+# Function to load a session file, or the built-in sample session.
+def LoadSession(path=None):
+    if path is None:
+        return SampleSession
+    with open(path, "r", encoding="utf-8") as f:
+        session = json.load(f)
+    session.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    for turn in session["turns"]:
+        if turn.get("audio") and not os.path.isabs(turn["audio"]):
+            turn["audio"] = os.path.join(os.path.dirname(os.path.abspath(path)), turn["audio"])
+    return session
+
+# Function to replay the sessions and summarise latency and throughput per stage.
+def RunBenchmark(sessions, rounds=5, speed=0.0):
+    global ReplaySpeed
+    ReplaySpeed = speed
+
+    InstallFakes()
+    PrepareWorkspace()
+    pipeline = LoadPipeline()
+    Tracer = pipeline.Tracer
+
+    # Warm up once so imports and first-call caches are not measured.
+    ReplayTurn(pipeline, sessions[0]["turns"][0])
+    with Tracer.TraceLock:
+        Tracer.TraceEvents.clear()
+        Tracer.StageDurations.clear()
+    pipeline.Prompt.PromptLog.clear()
+
+    turns = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for session in sessions:
+            for turn in session["turns"]:
+                ReplayTurn(pipeline, turn)
+                turns += 1
+    wall_seconds = time.perf_counter() - started
+
+    with Tracer.TraceLock:
+        durations = {name: sorted(values) for name, values in Tracer.StageDurations.items() if values}
+
+    stages = {}
+    for name, values in durations.items():
+        busy_seconds = sum(values) / 1000
+        stages[name] = {
+            "count": len(values),
+            "p50": Tracer.Percentile(values, 50),
+            "p95": Tracer.Percentile(values, 95),
+            "mean": sum(values) / len(values),
+            "throughput": len(values) / busy_seconds if busy_seconds > 0 else float("inf"),
+        }
+
+    return {
+        "speed": speed,
+        "rounds": rounds,
+        "turns": turns,
+        "seconds": wall_seconds,
+        "throughput": turns / wall_seconds if wall_seconds > 0 else float("inf"),
+        "stages": stages,
+        "prompts": pipeline.Prompt.PromptSummary(),
+    }
+
+# Function to print the per-stage results.
+def PrintResults(results):
+    print(f"{'stage':<28}{'n':>6}{'p50 ms':>11}{'p95 ms':>11}{'mean ms':>11}{'per s':>11}")
+    for name, stats in sorted(results["stages"].items()):
+        print(f"{name:<28}{stats['count']:>6}{stats['p50']:>11.2f}{stats['p95']:>11.2f}{stats['mean']:>11.2f}{stats['throughput']:>11.1f}")
+    for name, stats in sorted(results.get("prompts", {}).items()):
+        print(f"prompt {name:<21}{stats['count']:>6} calls, {stats['static_bytes']} B static + {stats['dynamic_bytes']:.0f} B per call, {stats['total_ms']:.2f} ms per call")
+    print(f"{results['turns']} turns in {results['seconds']:.2f} s ({results['throughput']:.1f} turns/s, speed {results['speed']})")
+
+# Function to list the regressions of the results against a baseline.
+# Latencies below the slack in ms are ignored, since sub-millisecond stages are dominated by noise.
+def CompareBaseline(results, baseline, tolerance=0.25, slack=2.0):
+    regressions = []
+
+    for name, stats in baseline.get("stages", {}).items():
+        current = results["stages"].get(name)
+        if current is None:
+            continue
+        limit = stats["p95"] * (1 + tolerance) + slack
+        if current["p95"] > limit:
+            regressions.append(f"{name}: p95 {current['p95']:.2f} ms > {limit:.2f} ms (baseline {stats['p95']:.2f} ms)")
+
+    if baseline.get("speed") == results["speed"] and results["throughput"] < baseline["throughput"] * (1 - tolerance):
+        regressions.append(f"throughput {results['throughput']:.1f} turns/s < {baseline['throughput'] * (1 - tolerance):.1f} turns/s (baseline {baseline['throughput']:.1f})")
+
+    return regressions
+
+# Main entry point: replay the sessions, print the results and check them against the baseline.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded sessions through the assistant pipeline offline.")
+    parser.add_argument("sessions", nargs="*", help="session JSON files (default: built-in sample session)")
+    parser.add_argument("--rounds", type=int, default=5, help="times each session is replayed")
+    parser.add_argument("--speed", type=float, default=0.0, help="multiplier for recorded delays, 1 for real time")
+    parser.add_argument("--baseline", help="results JSON to compare against; exit status 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    parser.add_argument("--save", help="write the results JSON here, e.g. to record a new baseline")
+    options = parser.parse_args()
+
+    # Resolve paths before the benchmark moves into its scratch directory.
+    sessions = [LoadSession(path) for path in options.sessions] or [LoadSession()]
+    baseline_path = os.path.abspath(options.baseline) if options.baseline else None
+    save_path = os.path.abspath(options.save) if options.save else None
+
+    results = RunBenchmark(sessions, rounds=options.rounds, speed=options.speed)
+    PrintResults(results)
+
+    if save_path:
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
+
+    if baseline_path:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            regressions = CompareBaseline(results, json.load(f), tolerance=options.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,272 @@
+# Record-and-replay layer for the assistant's network calls.
+# With Cassette=record in .env every HTTP response the backends receive (Groq, Cohere, Hugging Face,
+# Ollama, website lookups) is saved to the cassette file with the delay before each streamed chunk.
+# With Cassette=replay the responses are served from the cassette instead of the network, either
+# instantly or with the recorded timing scaled by CassetteSpeed (1 for the original timing).
+#
+#     Cassette=replay
+#     CassettePath=Data\Cassette.jsonl
+#     CassetteSpeed=1
+#
+# Requests are matched on method, URL and body; a request whose body changed (e.g. the date in a
+# system prompt) falls back to the next unused recording for the same URL, in recording order.
+#
+# The cassette holds one interaction per line and each recording is appended to it, so recording
+# stays cheap however large the cassette grows (e.g. with generated images in it).
+
+from requests.adapters import HTTPAdapter          # Import the adapter base class for requests sessions.
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from dotenv import dotenv_values                   # Import dotenv to read the cassette settings.
+import requests                                    # Import requests for the sessions handed out.
+import threading                                   # Import threading to guard the cassette.
+import hashlib                                     # Import hashlib to fingerprint request bodies.
+import base64                                      # Import base64 to store binary chunks.
+import json                                        # Import json to read and write the cassette.
+import time                                        # Import time to record and replay chunk timing.
+import os                                          # Import os for atomic cassette writes.
+
+# Load environment variables from the .env file.
+env_vars = dotenv_values(".env")
+CassetteMode = str(env_vars.get("Cassette") or "off").lower()   # "off", "record" or "replay".
+CassettePath = env_vars.get("CassettePath") or r"Data\Cassette.jsonl"
+CassetteSpeed = float(env_vars.get("CassetteSpeed") or 0)       # 0 replays instantly, 1 in real time.
+
+# Response headers dropped when recording, since the stored body is already decoded and unframed.
+FramingHeaders = {"content-encoding", "content-length", "transfer-encoding"}
+
+# Raised in replay mode when the cassette has no response for a request.
+class CassetteMiss(LookupError):
+    pass
+
+# Function to fingerprint a request by method, URL and body.
+def Fingerprint(method, url, body):
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    return hashlib.sha256(f"{method.upper()} {url}\n".encode("utf-8") + (body or b"")).hexdigest()
+
+# Function to store a chunk as text when it is UTF-8, and as base64 otherwise.
+def EncodeChunk(delay, data):
+    try:
+        return {"delay": round(delay, 6), "text": data.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"delay": round(delay, 6), "base64": base64.b64encode(data).decode("ascii")}
+
+def DecodeChunk(chunk):
+    if "text" in chunk:
+        return chunk["delay"], chunk["text"].encode("utf-8")
+    return chunk["delay"], base64.b64decode(chunk["base64"])
+
+# Function to yield recorded chunks, waiting the recorded delay scaled by the replay speed.
+def ReplayChunks(chunks, speed=None):
+    speed = CassetteSpeed if speed is None else speed
+    for chunk in chunks:
+        delay, data = DecodeChunk(chunk)
+        if delay and speed > 0:
+            time.sleep(delay * speed)
+        yield data
+
+# Function to read a response chunk by chunk, noting the delay before each one.
+def TimedChunks(chunks, started):
+    last = started
+    for data in chunks:
+        now = time.monotonic()
+        if data:
+            yield now - last, data
+        last = now
+
+# A cassette file of recorded interactions.
+class CassetteStore:
+
+    def __init__(self, path=CassettePath, mode=CassetteMode):
+        self.path = path
+        self.mode = mode
+        self.interactions = []
+        self.used = set()
+        self.lock = threading.Lock()
+        if mode == "replay" or (mode == "record" and os.path.exists(path)):
+            self.Load()
+
+    def Load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                text = f.read()
+            if text.lstrip().startswith('{"interactions"'):  # Cassette written as one JSON document.
+                self.interactions = json.loads(text)["interactions"]
+            else:
+                self.interactions = [json.loads(line) for line in text.splitlines() if line.strip()]
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Could not load cassette {self.path}: {e}")
+            self.interactions = []
+
+    # Function to append one interaction to the cassette file; called with the lock held.
+    def Append(self, interaction):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(interaction) + "\n")
+
+    # Function to add a finished interaction and append it to the cassette, returning the interaction.
+    def Record(self, method, url, body, status, headers, timed_chunks):
+        interaction = {
+            "request": {"method": method.upper(), "url": url, "fingerprint": Fingerprint(method, url, body)},
+            "response": {
+                "status": status,
+                "headers": [[key, value] for key, value in headers if key.lower() not in FramingHeaders],
+                "chunks": [EncodeChunk(delay, data) for delay, data in timed_chunks],
+            },
+        }
+        with self.lock:
+            self.interactions.append(interaction)
+            self.Append(interaction)
+        return interaction
+
+    # Function to find the recorded response for a request, preferring an exact unused match.
+    def Find(self, method, url, body):
+        method = method.upper()
+        fingerprint = Fingerprint(method, url, body)
+
+        with self.lock:
+            for exact, unused in ((True, True), (False, True), (True, False)):
+                for index, interaction in enumerate(self.interactions):
+                    request = interaction["request"]
+                    if request["method"] != method or request["url"] != url:
+                        continue
+                    if exact and request["fingerprint"] != fingerprint:
+                        continue
+                    if unused and index in self.used:
+                        continue
+                    self.used.add(index)
+                    return interaction["response"]
+
+        raise CassetteMiss(f"No recorded response for {method} {url} in {self.path}")
+
+    # Function to start replaying the cassette from the beginning again.
+    def Rewind(self):
+        with self.lock:
+            self.used.clear()
+
+# The shared cassette.
+Cassette = CassetteStore()
+
+# Body of a replayed requests response, streaming the recorded chunks.
+class ReplayBody:
+
+    def __init__(self, chunks, speed=None):
+        self.chunks = chunks
+        self.speed = speed
+
+    def stream(self, amt=None, decode_content=True):
+        yield from ReplayChunks(self.chunks, self.speed)
+
+    def read(self, amt=None, decode_content=True, **kwargs):
+        return b"".join(self.stream())
+
+    def close(self):
+        pass
+
+    def release_conn(self):
+        pass
+
+# Transport adapter recording or replaying the responses of a requests session.
+class CassetteAdapter(HTTPAdapter):
+
+    def send(self, request, stream=False, **kwargs):
+        if Cassette.mode == "replay":
+            return self.Replay(request, Cassette.Find(request.method, request.url, request.body))
+
+        started = time.monotonic()
+        response = super().send(request, stream=True, **kwargs)
+        try:
+            timed_chunks = list(TimedChunks(response.iter_content(chunk_size=None), started))
+        finally:
+            response.close()
+        interaction = Cassette.Record(request.method, request.url, request.body, response.status_code, response.headers.items(), timed_chunks)
+
+        # The body was read while recording, so hand back a response serving it without delay.
+        return self.Replay(request, interaction["response"], speed=0)
+
+    def Replay(self, request, recorded, speed=None):
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response.raw = ReplayBody(recorded["chunks"], speed)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        return response
+
+# Function to create a requests session that records or replays through the cassette.
+def CassetteSession():
+    session = requests.Session()
+    if CassetteMode in ("record", "replay"):
+        adapter = CassetteAdapter()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+    return session
+
+# Transport for the httpx clients of the Groq and Cohere SDKs, recording or replaying through the cassette.
+class CassetteTransport:
+
+    def __init__(self):
+        import httpx  # Imported here since only the Groq and Cohere SDKs bring it in.
+        self.httpx = httpx
+        self.inner = httpx.HTTPTransport() if Cassette.mode == "record" else None
+
+    def handle_request(self, request):
+        body = request.read()
+
+        if Cassette.mode == "replay":
+            recorded = Cassette.Find(request.method, str(request.url), body)
+            return self.httpx.Response(recorded["status"], headers=recorded["headers"], content=ReplayChunks(recorded["chunks"]), request=request)
+
+        started = time.monotonic()
+        response = self.inner.handle_request(request)
+        headers = response.headers.multi_items()
+        return self.httpx.Response(
+            response.status_code,
+            headers=[(key, value) for key, value in headers if key.lower() not in FramingHeaders],
+            content=self.Recording(request, body, response, started),
+            request=request,
+        )
+
+    # Generator passing the decoded body through while recording it, saved once the body is read.
+    def Recording(self, request, body, response, started):
+        timed_chunks = []
+        decoder = self.httpx.Response(response.status_code, headers=response.headers, stream=response.stream)
+        try:
+            for delay, data in TimedChunks(decoder.iter_bytes(), started):
+                timed_chunks.append((delay, data))
+                yield data
+        finally:
+            decoder.close()
+            Cassette.Record(request.method, str(request.url), body, response.status_code, response.headers.multi_items(), timed_chunks)
+
+    def close(self):
+        if self.inner is not None:
+            self.inner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+# Function to create the httpx client handed to the Groq and Cohere SDKs, or None to keep their default.
+def HttpxClient():
+    if CassetteMode not in ("record", "replay"):
+        return None
+    import httpx
+    return httpx.Client(transport=CassetteTransport(), timeout=httpx.Timeout(180.0))
+
+# Main entry point: list the interactions of a cassette with their time to first chunk and total time.
+if __name__ == "__main__":
+    import sys
+    store = CassetteStore(sys.argv[1] if len(sys.argv) > 1 else CassettePath, mode="replay")
+    for interaction in store.interactions:
+        request, response = interaction["request"], interaction["response"]
+        delays = [chunk["delay"] for chunk in response["chunks"]]
+        first = delays[0] if delays else 0.0
+        print(f"{request['method']:<6} {response['status']} {request['url'][:60]:<60} chunks={len(delays):<5} first={first * 1000:8.1f} ms total={sum(delays) * 1000:8.1f} ms")
@@ -1,7 +1,10 @@
 from groq import Groq               # Importing the Groq library to use its API
-from json import load, dump         # Importing functions to read and write JSON files.
 import datetime                     # Importing the datetime module for real-time data and time information.
 from dotenv import dotenv_values    # Importing dotenv_values to read environment variables from a .env file.
+from Backend.Tracer import Span, Traced  # Importing the tracer to time each stage of a turn.
+from Backend.Cassette import HttpxClient  # Importing the record-and-replay layer for API calls.
+from Backend.Prompt import PromptPrefix  # Importing the prompt assembly layer to reuse the static prompt.
+from Backend.Session import GetSession  # Importing the per-session chat history.
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -12,10 +15,7 @@ Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
 # Initialize the Groq Client using the provided API key.
-client = Groq(api_key= GroqAPIKey)
-
-# Initialize an empty list to store chat messages.
-messages = []
+client = Groq(api_key= GroqAPIKey, http_client=HttpxClient())
 
 # Define a system message that proveds context to the AI chatbot about its role and behavior.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which also has real-time up-to-date information from the internet.
@@ -29,14 +29,14 @@ SystemChatBot = [
     {"role": "system", "content": System}
 ]
 
-# Attempt to load the chat log from a JSON file.
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f) # Load existing messages form the chat log
-except:
-    # If the file doesn't exist, create a empty JSON file to store chat logs.
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
+# The static prompt prefix, shared by every call; the real-time information goes last so the prefix stays cacheable.
+ChatBotPrompt = PromptPrefix("chatbot", SystemChatBot)
+
+# Number of tries per query: after a failure the chat log is reset and the query tried again.
+ChatBotAttempts = 2
+
+# Load the chat log of the default session, creating an empty one if it doesn't exist.
+GetSession()
 
 # Function to get real-time date and time information
 def RealtimeInformation():
@@ -64,54 +64,62 @@ def AnswerModifier(Answer):
     return modified_answer
 
 # Main chatbot function to handle user queries.
-def ChatBot(Query):
-    """ This function sends the user's query to the chatbot and returns the AI response."""
-
-    try:
-        # Load the existing chat log from the JSON file.
-        with open(r"Data\ChatLog.json", "r") as f:
-            messages = load(f)
+@Traced("chatbot")
+def ChatBot(Query, session=None, on_token=None):
+    """ This function sends the user's query to the chatbot and returns the AI response, passing each streamed piece to on_token if given."""
+
+    session = session or GetSession()
+
+    for attempt in range(ChatBotAttempts):
+        streamed = False  # Whether on_token has been given part of this attempt's answer.
+        try:
+            # Take a snapshot of the session's chat history and add the user's query to it.
+            messages = session.History()
+            messages.append({"role": "user", "content": f"{Query}"})
+
+            # Include system instructions, chat history and, last, the real-time info.
+            prompt_messages = ChatBotPrompt.Messages(messages, RealtimeInformation())
+
+            # Make a request to the Groq API for a response.
+            with Span("chatbot.llm", model="llama3-70b-8192"), ChatBotPrompt.Call(prompt_messages) as call:
+                completion = client.chat.completions.create(
+                    model = "llama3-70b-8192",   # Specify the AI model to use.
+                    messages=prompt_messages,
+                    max_tokens=1024,  # Limit the maximum tokens in the response.
+                    temperature=0.7,  # Adjust the response randomness (higher means more random).
+                    top_p= 1,       # Use nucleus sampling to control diversity
+                    stream=True,   # Enable streaming response.
+                    stop=None      # Allow the model to determint when to stop.
+                )
+
+                call.Answered()
+                Answer = ""   # Initialize an empty string to store the AI's response.
+
+                # Process the streamed response chunks.
+                for chunk in completion:
+                    call.Usage(chunk)
+                    if chunk.choices[0].delta.content:  # Check if there's content in the current chunk.
+                        call.Token()
+                        Answer += chunk.choices[0].delta.content  # Append the content to the answer.
+                        if on_token:  # Pass the piece on, e.g. to a server client.
+                            streamed = True
+                            on_token(chunk.choices[0].delta.content)
         
-        # Append the user's query to the message list.
-        messages.append({"role": "user", "content": f"{Query}"})
-
-        # Make a request to the Groq API for a response.
-        completion = client.chat.completions.create(
-            model = "llama3-70b-8192",   # Specify the AI model to use.
-            messages=SystemChatBot + [{"role": "system", "content": RealtimeInformation()}] + messages,  # Include system instructions, real-time info and chat history
-            max_tokens=1024,  # Limit the maximum tokens in the response.
-            temperature=0.7,  # Adjust the response randomness (higher means more random).
-            top_p= 1,       # Use nucleus sampling to control diversity
-            stream=True,   # Enable streaming response.
-            stop=None      # Allow the model to determint when to stop.
-        )
-
-        Answer = ""   # Initialize an empty string to store the AI's response.
-
-        # Process the streamed response chunks.
-        for chunk in completion:
-            if chunk.choices[0].delta.content:  # Check if there's content in the current chunk.
-                Answer += chunk.choices[0].delta.content  # Append the content to the answer.
-        
-        Answer = Answer.replace("</s>", "")   # Clean up any unwanted tokens from the response.
-
-        # APPend the chatbot's response to the messages list.
-        messages.append({"role": "assistant", "content": Answer})
+            Answer = Answer.replace("</s>", "")   # Clean up any unwanted tokens from the response.
 
-        # Save the updated chat log to the JSON file.
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump(messages, f, indent=4)
+            # Record the query with the chatbot's response in the session, which saves its chat log.
+            session.Record(messages[-1], {"role": "assistant", "content": Answer})
         
-        # Return the formatted response.
-        return AnswerModifier(Answer=Answer)
-    
-    except Exception as e:
-        # Handle errors by printing the exception and resetting the chat log.
-        print(f"Error: {e}")
-        with open(r"Data\ChatLog.json", "w") as f:
-            dump([], f, indent=4)
-        return ChatBot(Query) # Retry the query after resetting the log.
+            # Return the formatted response.
+            return AnswerModifier(Answer=Answer)
     
+        except Exception as e:
+            print(f"Error: {e}")
+            if streamed:
+                raise  # Part of the answer was already passed on; let the caller report the error.
+            if attempt == ChatBotAttempts - 1:
+                return f"An error occurred: {e}"
+            session.Reset()  # Reset the chat log, then retry the query.
 
 # Main program entry point
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+# Shared registry of decision commands ("open", "google search", "reminder", ...).
+# The DMM filter in Model.py, the dispatcher in Main.py and the executor in Automation.py all
+# route through the one trie below, so a new command is plugged in by registering it once.
+
+# Default deadline in seconds for each cost class.
+CostTimeouts = {
+    "light": 10,
+    "medium": 30,
+    "heavy": 180,
+}
+
+# A registered command and its metadata.
+class Command:
+
+    def __init__(self, name, handler=None, blocking=True, idempotent=False, cost="light", automation=False, timeout=None):
+        self.name = name                # Prefix the command is recognized by, e.g. "google search".
+        self.handler = handler          # Function taking the command argument, or None for decision-only commands.
+        self.blocking = blocking        # True runs the handler on a worker thread, False awaits it as a coroutine.
+        self.idempotent = idempotent    # True lets repeated identical commands in one batch run only once.
+        self.cost = cost                # "light", "medium" or "heavy".
+        self.automation = automation    # True if Automation executes the command.
+        self.timeout = timeout if timeout is not None else CostTimeouts[cost]
+
+    def __repr__(self):
+        return f"Command({self.name!r}, cost={self.cost!r}, automation={self.automation})"
+
+# A node of the prefix trie.
+class TrieNode:
+    __slots__ = ("children", "command")
+
+    def __init__(self):
+        self.children = {}
+        self.command = None
+
+# Prefix trie mapping command names to commands, matched in one pass over the text.
+class CommandTrie:
+
+    def __init__(self):
+        self.root = TrieNode()
+        self.commands = {}
+
+    # Function to register a command, or to update an already declared one.
+    def Register(self, name, handler=None, **metadata):
+        command = self.commands.get(name)
+
+        if command is None:
+            command = Command(name, handler, **metadata)
+            node = self.root
+            for char in name:
+                node = node.children.setdefault(char, TrieNode())
+            node.command = command
+            self.commands[name] = command
+        else:
+            if handler is not None:
+                command.handler = handler
+            for key, value in metadata.items():
+                setattr(command, key, value)
+            if "cost" in metadata and "timeout" not in metadata:
+                command.timeout = CostTimeouts[command.cost]
+
+        return command
+
+    # Function to find the longest registered command prefixing the text, returning (command, argument).
+    def Match(self, text):
+        node = self.root
+        match = None
+
+        for index, char in enumerate(text):
+            node = node.children.get(char)
+            if node is None:
+                break
+
+            # A command only matches on a word boundary, so "opening" is not "open".
+            if node.command is not None and (index + 1 == len(text) or text[index + 1] in " ("):
+                match = (node.command, text[index + 1:].strip())
+
+        return match
+
+    # Function to check whether the text is a command Automation executes.
+    def IsAutomation(self, text):
+        match = self.Match(text)
+        return match is not None and match[0].automation
+
+# The shared registry instance.
+Commands = CommandTrie()
+
+# Decision-only commands handled directly by Main.py.
+for name in ["exit", "general", "realtime", "generate image", "reminder"]:
+    Commands.Register(name)
+
+# Automation commands; Automation.py binds the handlers when it is imported.
+Commands.Register("open", automation=True, cost="medium", timeout=20)
+Commands.Register("close", automation=True, cost="light", idempotent=True)
+Commands.Register("play", automation=True, cost="medium", timeout=20)
+Commands.Register("content", automation=True, cost="heavy")
+Commands.Register("google search", automation=True, cost="medium", timeout=15, idempotent=True)
+Commands.Register("youtube search", automation=True, cost="light", idempotent=True)
+Commands.Register("system", automation=True, cost="light", timeout=5)
+Commands.Register("presentation", automation=True, cost="heavy", timeout=600)
@@ -1,7 +1,8 @@
-from PyQt5.QtWidgets import QApplication, QMainWindow, QTextEdit, QStackedWidget, QWidget, QLineEdit, QGridLayout, QVBoxLayout, QHBoxLayout, QPushButton, QFrame, QLabel, QSizePolicy
-from PyQt5.QtGui import QIcon, QPainter, QMovie, QColor, QTextCharFormat, QFont, QPixmap, QTextBlockFormat
-from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QWidget, QLineEdit, QGridLayout, QVBoxLayout, QHBoxLayout, QPushButton, QFrame, QLabel, QSizePolicy, QListView, QStyledItemDelegate, QAbstractItemView
+from PyQt5.QtGui import QIcon, QPainter, QColor, QFont, QPixmap, QFontMetrics, QImageReader
+from PyQt5.QtCore import Qt, QSize, QTimer, QAbstractListModel, QModelIndex, QObject, QFileSystemWatcher, pyqtSignal, QEvent, QElapsedTimer
 from dotenv import dotenv_values
+import time
 import sys
 import os
 
@@ -11,6 +12,11 @@ current_dir = os.getcwd()
 old_chat_message = ""
 TempDirPath = rf"{current_dir}\Frontend\Files"
 GraphicsDirPath = rf"{current_dir}\Frontend\Graphics"
+StatusPollInterval = None
+data_file_watcher = None
+animation_service = None
+pixmap_cache = {}
+icon_cache = {}
 
 def AnswerModifier(Answer):
     lines = Answer.split('\n')
@@ -18,26 +24,6 @@ def AnswerModifier(Answer):
     modified_answer = '\n'.join(non_empty_lines)
     return modified_answer
 
-def QueryModifier(Query):
-
-    new_query = Query.lower().strip()
-    query_words = new_query.split()
-    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", "what's", "where's", "how's"]
-
-    if any(word + " " in new_query for word in question_words):
-        if query_words[-1][-1] in ['.', '?', '!']:
-            new_query = new_query[:-1] + "?"
-        else:
-            new_query += "?"
-
-    else:
-        if query_words[-1][-1] in ['.', '?', '!']:
-            new_query = new_query[:-1] + '.'
-        else:
-            new_query += "."
-    
-    return new_query.capitalize()
-
 def SetMicrophoneStatus(Command):
     with open(rf'{TempDirPath}\Mic.data', 'w', encoding='utf-8') as file:
         file.write(Command)
@@ -66,6 +52,26 @@ def GraphicsDirectoryPath(Filename):
     Path = rf'{GraphicsDirPath}\{Filename}'
     return Path
 
+def CachedPixmap(Path, width = None, height = None):
+    key = (Path, width, height)
+    pixmap = pixmap_cache.get(key)
+    if pixmap is None:
+        pixmap = QPixmap(Path)
+        if width is not None and height is not None:
+            pixmap = pixmap.scaled(width, height)
+        pixmap_cache[key] = pixmap
+    return pixmap
+
+def GraphicsPixmap(Filename, width = None, height = None):
+    return CachedPixmap(GraphicsDirectoryPath(Filename), width, height)
+
+def GraphicsIcon(Filename):
+    icon = icon_cache.get(Filename)
+    if icon is None:
+        icon = QIcon(GraphicsPixmap(Filename))
+        icon_cache[Filename] = icon
+    return icon
+
 def TempDirectoryPath(Filename):
     Path = rf'{TempDirPath}\{Filename}'
     return Path
@@ -74,6 +80,266 @@ def ShowTextToScreen(Text):
     with open(rf'{TempDirPath}\Responses.data', 'w', encoding='utf-8') as file:
         file.write(Text)
 
+class DataFileWatcher(QObject):
+
+    changed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.onFileChanged)
+
+    def watch(self, filename):
+        path = TempDirectoryPath(filename)
+        if path not in self.watcher.files():
+            self.watcher.addPath(path)
+        return path
+
+    def onFileChanged(self, path):
+        if path not in self.watcher.files() and os.path.exists(path):
+            self.watcher.addPath(path)
+        self.changed.emit(path)
+
+def GetDataFileWatcher():
+    global data_file_watcher
+    if data_file_watcher is None:
+        data_file_watcher = DataFileWatcher(QApplication.instance())
+    return data_file_watcher
+
+class SharedAnimation(QObject):
+
+    FrameCacheBudget = 8 * 1024 * 1024  # Short or small animations are pre-decoded; larger ones decode one frame at a time.
+    IdleFrameInterval = 100
+    MinFrameInterval = 20
+
+    def __init__(self, path, size, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.size = size
+        self.labels = []
+        self.frames = []
+        self.index = 0
+        self.position = 0
+        self.idle = False
+        self.reader = None
+        self.current = None
+        self.current_delay = 100
+        self.clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.tick)
+
+        reader = self.openReader()
+        frame_bytes = size.width() * size.height() * 4
+        if reader.imageCount() > 0 and reader.imageCount() * frame_bytes <= self.FrameCacheBudget:
+            while True:
+                image = reader.read()
+                if image.isNull():
+                    break
+                self.frames.append((QPixmap.fromImage(image), max(reader.nextImageDelay(), self.MinFrameInterval)))
+        else:
+            self.reader = reader
+            self.readNextFrame()
+
+        if self.frames:
+            self.current, self.current_delay = self.frames[0]
+
+    def openReader(self):
+        reader = QImageReader(self.path)
+        reader.setScaledSize(self.size)
+        return reader
+
+    def readNextFrame(self):
+        image = self.reader.read()
+        if image.isNull():
+            self.reader = self.openReader()
+            image = self.reader.read()
+        if not image.isNull():
+            self.current = QPixmap.fromImage(image)
+            self.current_delay = max(self.reader.nextImageDelay(), self.MinFrameInterval)
+
+    def attach(self, label):
+        self.labels.append(label)
+        label.installEventFilter(self)
+        label.destroyed.connect(lambda: self.labels.remove(label) if label in self.labels else None)
+        if self.current is not None:
+            label.setPixmap(self.current)
+        self.updateRunning()
+
+    def eventFilter(self, watched, event):
+        if event.type() in (QEvent.Show, QEvent.Hide):
+            QTimer.singleShot(0, self.updateRunning)
+        return False
+
+    def visibleLabels(self):
+        return [label for label in self.labels if label.isVisible()]
+
+    def setIdle(self, idle):
+        if idle != self.idle:
+            self.idle = idle
+            self.updateRunning()
+
+    def updateRunning(self):
+        if not self.visibleLabels() or (len(self.frames) == 1 and self.reader is None):
+            self.timer.stop()
+            return
+        if self.frames:
+            interval = min(delay for _, delay in self.frames)
+        else:
+            interval = self.current_delay
+        if self.idle:
+            interval = max(interval, self.IdleFrameInterval)
+        self.timer.setInterval(interval)
+        if not self.timer.isActive():
+            self.clock.start()
+            self.position = 0
+            self.timer.start()
+            for label in self.visibleLabels():
+                label.setPixmap(self.current)
+
+    def tick(self):
+        self.position += self.clock.restart()
+        changed = False
+        while self.position >= self.current_delay:
+            self.position -= self.current_delay
+            if self.frames:
+                self.index = (self.index + 1) % len(self.frames)
+                self.current, self.current_delay = self.frames[self.index]
+            else:
+                self.readNextFrame()
+            changed = True
+        if changed:
+            for label in self.visibleLabels():
+                label.setPixmap(self.current)
+
+class AnimationService(QObject):
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.animations = {}
+        self.idle = False
+        watcher = GetDataFileWatcher()
+        self.status_path = watcher.watch('Status.data')
+        watcher.changed.connect(self.onDataFileChanged)
+        self.onDataFileChanged(self.status_path)
+
+    def attach(self, label, path, size):
+        key = (path, size.width(), size.height())
+        animation = self.animations.get(key)
+        if animation is None:
+            animation = SharedAnimation(path, size, self)
+            animation.setIdle(self.idle)
+            self.animations[key] = animation
+        animation.attach(label)
+        return animation
+
+    def onDataFileChanged(self, path):
+        if path != self.status_path:
+            return
+        try:
+            idle = "Available" in GetAssistantStatus()
+        except OSError:
+            return
+        if idle != self.idle:
+            self.idle = idle
+            for animation in self.animations.values():
+                animation.setIdle(idle)
+
+def GetAnimationService():
+    global animation_service
+    if animation_service is None:
+        animation_service = AnimationService(QApplication.instance())
+    return animation_service
+
+class ChatModel(QAbstractListModel):
+
+    MaxVisibleMessages = 200
+    LoadBatchSize = 50
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.messages = []
+        self.first = 0
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.messages) - self.first
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        text, color = self.messages[self.first + index.row()]
+        if role == Qt.DisplayRole:
+            return text
+        if role == Qt.ForegroundRole:
+            return QColor(color)
+        return None
+
+    def appendMessage(self, text, color):
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.messages.append((text, color))
+        self.endInsertRows()
+
+    def updateLastMessage(self, text):
+        if self.rowCount() == 0:
+            return
+        self.messages[-1] = (text, self.messages[-1][1])
+        index = self.index(self.rowCount() - 1)
+        self.dataChanged.emit(index, index)
+
+    def trimVisible(self):
+        extra = self.rowCount() - self.MaxVisibleMessages
+        if extra > 0:
+            self.beginRemoveRows(QModelIndex(), 0, extra - 1)
+            self.first += extra
+            self.endRemoveRows()
+
+    def loadOlder(self):
+        count = min(self.first, self.LoadBatchSize)
+        if count == 0:
+            return 0
+        self.beginInsertRows(QModelIndex(), 0, count - 1)
+        self.first -= count
+        self.endInsertRows()
+        return count
+
+class ChatDelegate(QStyledItemDelegate):
+
+    Margin = 10
+
+    def __init__(self, view):
+        super().__init__(view)
+        self.view = view
+        self.size_cache = {}
+        self.cache_width = None
+
+    def textWidth(self):
+        return max(self.view.viewport().width() - 2 * self.Margin, 1)
+
+    def paint(self, painter, option, index):
+        painter.save()
+        painter.setFont(option.font)
+        painter.setPen(index.data(Qt.ForegroundRole) or QColor('white'))
+        rect = option.rect.adjusted(self.Margin, self.Margin, -self.Margin, 0)
+        painter.drawText(rect, Qt.TextWordWrap | Qt.AlignLeft | Qt.AlignTop, index.data(Qt.DisplayRole))
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        width = self.textWidth()
+        if width != self.cache_width:
+            self.size_cache.clear()
+            self.cache_width = width
+        text = index.data(Qt.DisplayRole)
+        size = self.size_cache.get(text)
+        if size is None:
+            rect = QFontMetrics(option.font).boundingRect(0, 0, width, 0, Qt.TextWordWrap, text)
+            size = QSize(width, rect.height() + self.Margin)
+            if len(self.size_cache) > 1000:
+                self.size_cache.clear()
+            self.size_cache[text] = size
+        return size
+
 class ChatSection(QWidget):
 
     def __init__(self):
@@ -81,28 +347,29 @@ class ChatSection(QWidget):
         layout = QVBoxLayout(self)
         layout.setContentsMargins(-10,40,40,100)
         layout.setSpacing(-100)
-        self.chat_text_edit = QTextEdit()
-        self.chat_text_edit.setReadOnly(True)
-        self.chat_text_edit.setTextInteractionFlags(Qt.NoTextInteraction)  # No text interaction
-        self.chat_text_edit.setFrameStyle(QFrame.NoFrame)
-        layout.addWidget(self.chat_text_edit)
+        self.chat_model = ChatModel(self)
+        self.chat_list_view = QListView()
+        self.chat_list_view.setModel(self.chat_model)
+        self.chat_list_view.setItemDelegate(ChatDelegate(self.chat_list_view))
+        self.chat_list_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.chat_list_view.setFocusPolicy(Qt.NoFocus)
+        self.chat_list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.chat_list_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.chat_list_view.setResizeMode(QListView.Adjust)
+        self.chat_list_view.setFrameStyle(QFrame.NoFrame)
+        self.chat_list_view.verticalScrollBar().valueChanged.connect(self.loadOlderMessages)
+        layout.addWidget(self.chat_list_view)
         self.setStyleSheet("background-color: black;")
         layout.setSizeConstraint(QVBoxLayout.SetDefaultConstraint)
         layout.setStretch(1,1)
         self.setSizePolicy(QSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding))
-        text_color = QColor(Qt.blue)
-        text_color_text = QTextCharFormat()
-        text_color_text.setForeground(text_color)
-        self.chat_text_edit.setCurrentCharFormat(text_color_text)
+        self.responses_text = None
         self.gif_label = QLabel()
         self.gif_label.setStyleSheet("border: none;")
-        movie = QMovie(GraphicsDirectoryPath('Jarvis.gif'))
         max_gif_size_W = 480
         max_gif_size_H = 270
-        movie.setScaledSize(QSize(max_gif_size_W, max_gif_size_H))
         self.gif_label.setAlignment(Qt.AlignRight | Qt.AlignBottom)
-        self.gif_label.setMovie(movie)
-        movie.start()
+        GetAnimationService().attach(self.gif_label, GraphicsDirectoryPath('Jarvis.gif'), QSize(max_gif_size_W, max_gif_size_H))
         layout.addWidget(self.gif_label)
         self.label = QLabel("")
         self.label.setStyleSheet("color: white; font-size:16px; margin-right: 195px; border: none; margin-top: -30px;")
@@ -112,12 +379,20 @@ class ChatSection(QWidget):
         layout.addWidget(self.gif_label)
         font = QFont()
         font.setPointSize(13)
-        self.chat_text_edit.setFont(font)
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.loadMessages)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(5)
-        self.chat_text_edit.viewport().installEventFilter(self)
+        self.chat_list_view.setFont(font)
+        if StatusPollInterval:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.loadMessages)
+            self.timer.timeout.connect(self.SpeechRecogText)
+            self.timer.start(StatusPollInterval)
+        else:
+            watcher = GetDataFileWatcher()
+            self.responses_path = watcher.watch('Responses.data')
+            self.status_path = watcher.watch('Status.data')
+            watcher.changed.connect(self.onDataFileChanged)
+            self.loadMessages()
+            self.SpeechRecogText()
+        self.chat_list_view.viewport().installEventFilter(self)
         self.setStyleSheet("""
                            QScrollBar:vertical {
                            border: none;
@@ -160,31 +435,48 @@ class ChatSection(QWidget):
 
         global old_chat_message
 
-        with open(TempDirectoryPath('Responses.data'), 'r', encoding='utf-8') as file:
-            messages = file.read()
+        try:
+            with open(TempDirectoryPath('Responses.data'), 'r', encoding='utf-8') as file:
+                messages = file.read()
+        except OSError:
+            return
 
-            if None == messages:
-                pass
+        # Compare contents rather than mtime: the file is truncated before each write, and both can share one mtime.
+        if messages == self.responses_text:
+            return
+        self.responses_text = messages
 
-            elif len(messages) <=1:
-                pass
-                
-            elif str(old_chat_message) == str(messages):
-                pass
+        if None == messages:
+            pass
 
-            else:
-                self.addMessage(message = messages, color = 'white')
-                old_chat_message = messages
+        elif len(messages) <=1:
+            pass
+            
+        elif str(old_chat_message) == str(messages):
+            pass
+
+        elif old_chat_message and messages.startswith(old_chat_message):
+            self.updateLastMessage(messages)
+            old_chat_message = messages
+
+        else:
+            self.addMessage(message = messages, color = 'white')
+            old_chat_message = messages
         
+    def onDataFileChanged(self, path):
+        if path == self.responses_path:
+            self.loadMessages()
+        elif path == self.status_path:
+            self.SpeechRecogText()
+
     def SpeechRecogText(self):
         with open(TempDirectoryPath('Status.data'), "r", encoding='utf-8') as file:
             messages = file.read()
-            self.label.setText(messages)
+            if messages != self.label.text():
+                self.label.setText(messages)
         
     def load_icon(self, path, width = 60, height = 60):
-        pixmap = QPixmap(path)
-        new_pixmap = pixmap.scaled(width, height)
-        self.icon_label.setPixmap(new_pixmap)
+        self.icon_label.setPixmap(CachedPixmap(path, width, height))
         
     def toggle_icon(self, event=None):
 
@@ -198,17 +490,31 @@ class ChatSection(QWidget):
             
         self.toggled = not self.toggled
         
+    def isScrolledToBottom(self):
+        scroll_bar = self.chat_list_view.verticalScrollBar()
+        return scroll_bar.value() >= scroll_bar.maximum() - 4
+
     def addMessage(self, message, color):
-        cursor = self.chat_text_edit.textCursor()
-        format = QTextCharFormat()
-        formatm = QTextBlockFormat()
-        formatm.setTopMargin(10)
-        formatm.setLeftMargin(10)
-        format.setForeground(QColor(color))
-        cursor.setCharFormat(format)
-        cursor.setBlockFormat(formatm)
-        cursor.insertText(message + "\n")
-        self.chat_text_edit.setTextCursor(cursor)
+        at_bottom = self.isScrolledToBottom()
+        self.chat_model.appendMessage(message, color)
+        if at_bottom:
+            self.chat_model.trimVisible()
+            self.chat_list_view.scrollToBottom()
+
+    def updateLastMessage(self, message):
+        at_bottom = self.isScrolledToBottom()
+        self.chat_model.updateLastMessage(message)
+        if at_bottom:
+            self.chat_list_view.scrollToBottom()
+
+    def loadOlderMessages(self, value):
+        scroll_bar = self.chat_list_view.verticalScrollBar()
+        if value != scroll_bar.minimum() or self.chat_model.first == 0:
+            return
+        distance_from_bottom = scroll_bar.maximum() - value
+        if self.chat_model.loadOlder():
+            self.chat_list_view.doItemsLayout()
+            scroll_bar.setValue(scroll_bar.maximum() - distance_from_bottom)
 
 class InitialScreen(QWidget):
 
@@ -220,17 +526,12 @@ class InitialScreen(QWidget):
         content_layout = QVBoxLayout()
         content_layout.setContentsMargins(0, 0, 0, 0)
         gif_label = QLabel()
-        movie = QMovie(GraphicsDirectoryPath('Jarvis.gif'))
-        gif_label.setMovie(movie)
         max_gif_size_H = int(screen_width / 16 * 9)
-        movie.setScaledSize(QSize(screen_width, max_gif_size_H))
+        GetAnimationService().attach(gif_label, GraphicsDirectoryPath('Jarvis.gif'), QSize(screen_width, max_gif_size_H))
         gif_label.setAlignment(Qt.AlignCenter)
-        movie.start()
         gif_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.icon_label = QLabel()
-        pixmap = QPixmap(GraphicsDirectoryPath('Mic_on.png'))
-        new_pixmap = pixmap.scaled(60, 60)
-        self.icon_label.setPixmap(new_pixmap)
+        self.icon_label.setPixmap(GraphicsPixmap('Mic_on.png', 60, 60))
         self.icon_label.setFixedSize(150, 150)
         self.icon_label.setAlignment(Qt.AlignCenter)
         self.toggled = True
@@ -246,19 +547,28 @@ class InitialScreen(QWidget):
         self.setFixedHeight(screen_height)
         self.setFixedWidth(screen_width)
         self.setStyleSheet("background-color: black;")
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.SpeechRecogText)
-        self.timer.start(5)
+        if StatusPollInterval:
+            self.timer = QTimer(self)
+            self.timer.timeout.connect(self.SpeechRecogText)
+            self.timer.start(StatusPollInterval)
+        else:
+            watcher = GetDataFileWatcher()
+            self.status_path = watcher.watch('Status.data')
+            watcher.changed.connect(self.onDataFileChanged)
+            self.SpeechRecogText()
+
+    def onDataFileChanged(self, path):
+        if path == self.status_path:
+            self.SpeechRecogText()
     
     def SpeechRecogText(self):
         with open(TempDirectoryPath('Status.data'), 'r', encoding='utf-8') as file:
             messages = file.read()
-            self.label.setText(messages)
+            if messages != self.label.text():
+                self.label.setText(messages)
     
     def load_icon(self, path, width = 60, height = 60):
-        pixmap = QPixmap(path)
-        new_pixmap = pixmap.scaled(width, height)
-        self.icon_label.setPixmap(new_pixmap)
+        self.icon_label.setPixmap(CachedPixmap(path, width, height))
     
     def toggle_icon(self, event = None):
 
@@ -302,29 +612,29 @@ class CustomTopBar(QWidget):
         layout = QHBoxLayout(self)
         layout.setAlignment(Qt.AlignRight)
         home_button =QPushButton()
-        home_icon = QIcon(GraphicsDirectoryPath("Home.png"))
+        home_icon = GraphicsIcon("Home.png")
         home_button.setIcon(home_icon)
         home_button.setText(" Home")
         home_button.setStyleSheet("height:40px; line-height:40px ; background-color:white ; color: black")
         message_button = QPushButton()
-        message_icon = QIcon(GraphicsDirectoryPath("Chats.png"))
+        message_icon = GraphicsIcon("Chats.png")
         message_button.setIcon(message_icon)
         message_button.setText(" Chat")
         message_button.setStyleSheet("height:40px; line-height:40px; background-color:white; color: black")
         minimize_button = QPushButton()
-        minimize_icon = QIcon(GraphicsDirectoryPath("Minimize2.png"))
+        minimize_icon = GraphicsIcon("Minimize2.png")
         minimize_button.setIcon(minimize_icon)
         minimize_button.setStyleSheet("background-color:white")
         minimize_button.clicked.connect(self.minimizeWindow)
         self.maximize_button = QPushButton()
-        self.maximize_icon = QIcon(GraphicsDirectoryPath('Maximize.png'))
-        self.restore_icon = QIcon(GraphicsDirectoryPath('Minimize.png'))
+        self.maximize_icon = GraphicsIcon('Maximize.png')
+        self.restore_icon = GraphicsIcon('Minimize.png')
         self.maximize_button.setIcon(self.maximize_icon)
         self.maximize_button.setFlat(True)
         self.maximize_button.setStyleSheet("background-color:white")
         self.maximize_button.clicked.connect(self.maximizeWindow)
         close_button = QPushButton()
-        close_icon = QIcon(GraphicsDirectoryPath("Close.png"))
+        close_icon = GraphicsIcon("Close.png")
         close_button.setIcon(close_icon)
         close_button.setStyleSheet("background-color:white")
         close_button.clicked.connect(self.closeWindow)
@@ -335,8 +645,8 @@ class CustomTopBar(QWidget):
         line_frame.setStyleSheet("border-color: black;")
         title_label = QLabel(f" {str(Assistantname).capitalize()}AI  ")
         title_label.setStyleSheet("color: black; font-size: 18px;; background-color:white")
-        home_button.clicked.connect(lambda: self.stacked_widget.setCurrentIndex(0))
-        message_button.clicked.connect(lambda: self.stacked_widget.setCurrentIndex(1))
+        home_button.clicked.connect(self.showInitialScreen)
+        message_button.clicked.connect(self.showMessageScreen)
         layout.addWidget(title_label)
         layout.addStretch(1)
         layout.addWidget(home_button)
@@ -377,25 +687,15 @@ class CustomTopBar(QWidget):
             new_pos = event.globalPos() - self.offset
             self.parent().move(new_pos)
     
+    def showScreen(self, index):
+        self.stacked_widget.setCurrentIndex(index)
+        self.current_screen = self.stacked_widget.currentWidget()
+
     def showMessageScreen(self):
-        if self.current_screen is not None:
-            self.current_screen.hide()
-        
-        message_screen = MessageScreen(self)
-        layout = self.parent().layout()
-        if layout is not None:
-            layout.addWidget(message_screen)
-        self.current_screen = message_screen
+        self.showScreen(1)
     
     def showInitialScreen(self):
-        if self.current_screen is not None:
-            self.current_screen.hide()
-        
-        initial_screen = InitialScreen(self)
-        layout = self.parent().layout()
-        if layout is not None:
-            layout.addWidget(initial_screen)
-        self.current_screen = initial_screen
+        self.showScreen(0)
 
 class MainWindow(QMainWindow):
 
@@ -425,6 +725,31 @@ def GraphicalUserInterFace():
     window.show()
     sys.exit(app.exec_())
 
+def IdleCPUBenchmark(seconds = 10):
+    global StatusPollInterval
+    app = QApplication.instance() or QApplication(sys.argv)
+    results = {}
+    for mode, interval in (("5 ms polling", 5), ("file watcher", None)):
+        StatusPollInterval = interval
+        window = MainWindow()
+        window.show()
+        app.processEvents()
+        start_cpu = time.process_time()
+        start_wall = time.perf_counter()
+        QTimer.singleShot(int(seconds * 1000), app.quit)
+        app.exec_()
+        results[mode] = (time.process_time() - start_cpu) / (time.perf_counter() - start_wall) * 100
+        window.close()
+        window.deleteLater()
+        app.processEvents()
+    StatusPollInterval = None
+    for mode, cpu in results.items():
+        print(f"{mode:>14}: {cpu:5.1f}% of one core while idle")
+    return results
+
 if __name__ == "__main__":
-    GraphicalUserInterFace()
+    if "--benchmark-idle" in sys.argv:
+        IdleCPUBenchmark()
+    else:
+        GraphicalUserInterFace()
 
@@ -1,8 +1,11 @@
 import asyncio
 from random import randint
 from PIL import Image
-import requests
 from dotenv import get_key
+try:
+    from Backend.Cassette import CassetteSession
+except ImportError:  # Run as a script from the Backend folder.
+    from Cassette import CassetteSession
 import os
 from time import sleep
 
@@ -31,6 +34,7 @@ def open_image(prompt):
 # API details for the Hugging Face Stable Diffusion Model
 API_URL = "https://api-inference.huggingface.co/models/stabilityai/stable-diffusion-xl-base-1.0"
 headers = {"Authorization": f"Bearer {get_key('.env', 'HuggingFaceAPIKey')}"}
+session = CassetteSession()  # Records or replays the API responses when a cassette is enabled.
 
 # Async function to send a query to the Hugging Face API
 ''''
@@ -39,7 +43,7 @@ async def query(payload):
     return response.content
 '''
 async def query(payload):
-    response = await asyncio.to_thread(requests.post, API_URL, headers=headers, json=payload)
+    response = await asyncio.to_thread(session.post, API_URL, headers=headers, json=payload)
     if "image" in response.headers.get("Content-Type", ""):
         return response.content
     else:
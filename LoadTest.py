@@ -0,0 +1,184 @@
+# Load test for the local API server (Server.py).
+#
+#     python -m Backend.LoadTest [--url http://127.0.0.1:8765] [--levels 1 2 4 8] [--turns 10] [--speech]
+#     python -m Backend.LoadTest --offline [--speed 1] [--workers 8] [--queue 32] ...
+#
+# At each concurrency level that many clients talk at once, each in its own session, sending turns one
+# after another over a kept-alive connection. For each level it reports the turns per second, the
+# latency to the first answer token and to the end of the turn (p50 and p95), and the turns refused
+# by admission control. With --offline a server is started in this process on the fakes of the offline
+# benchmark (Benchmark.py), replaying the sample session's first turn with its delays scaled by --speed,
+# so the server's own overhead and its behaviour under load can be measured without API keys.
+
+from urllib.parse import urlsplit  # Import urlsplit to read the server address.
+import argparse                     # Import argparse for the command line options.
+import threading                    # Import threading to run the offline server.
+import asyncio                      # Import asyncio for the concurrent clients.
+import json                         # Import json for requests and events.
+import time                         # Import time to measure latency.
+import os                           # Import os to resolve the results path.
+from Backend.Tracer import Percentile  # Import the percentile helper of the tracer.
+
+# Queries the clients send, in turn.
+Queries = [
+    "how are you today",
+    "tell me a joke",
+    "who is ada lovelace",
+    "what can you do",
+]
+
+# A client with a kept-alive HTTP connection to the server.
+class Client:
+
+    def __init__(self, host, port, session):
+        self.host = host
+        self.port = port
+        self.session = session
+        self.reader = None
+        self.writer = None
+
+    async def Connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    def Close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+    # Function to send one turn, returning (status, seconds to the first token, seconds to the end).
+    async def Turn(self, query, speech=False):
+        body = json.dumps({"query": query, "speech": speech}).encode("utf-8")
+        started = time.perf_counter()
+        self.writer.write(
+            f"POST /sessions/{self.session}/turns HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await self.writer.drain()
+
+        head = (await self.reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split()[1])
+        headers = dict(line.lower().split(": ", 1) for line in head[1:] if ": " in line)
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+            return status, None, time.perf_counter() - started
+
+        first_token = None
+        buffer = b""
+        while True:
+            size = int((await self.reader.readuntil(b"\r\n")).strip(), 16)
+            chunk = await self.reader.readexactly(size + 2)
+            if size == 0:
+                break
+            buffer += chunk[:-2]
+            while b"\n" in buffer:
+                line, buffer = buffer.split(b"\n", 1)
+                event = json.loads(line)
+                if event["type"] == "token" and first_token is None:
+                    first_token = time.perf_counter() - started
+                elif event["type"] == "error":
+                    status = event.get("status", 500)
+        return status, first_token, time.perf_counter() - started
+
+# Function to run one concurrency level, returning its statistics.
+async def RunLevel(host, port, clients, turns, speech, level_name):
+    latencies, first_tokens, rejected, failed = [], [], 0, 0
+
+    async def RunClient(index):
+        nonlocal rejected, failed
+        client = Client(host, port, f"loadtest-{level_name}-{index}")
+        await client.Connect()
+        try:
+            for turn in range(turns):
+                status, first_token, seconds = await client.Turn(Queries[(index + turn) % len(Queries)], speech)
+                if status == 503:
+                    rejected += 1
+                elif status != 200:
+                    failed += 1
+                else:
+                    latencies.append(seconds)
+                    if first_token is not None:
+                        first_tokens.append(first_token)
+        finally:
+            client.Close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(RunClient(index) for index in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    first_tokens.sort()
+    return {
+        "clients": clients,
+        "turns": len(latencies),
+        "rejected": rejected,
+        "failed": failed,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50": Percentile(latencies, 50) * 1000 if latencies else None,
+        "p95": Percentile(latencies, 95) * 1000 if latencies else None,
+        "first_token_p50": Percentile(first_tokens, 50) * 1000 if first_tokens else None,
+        "first_token_p95": Percentile(first_tokens, 95) * 1000 if first_tokens else None,
+    }
+
+# Function to print the results of each level.
+def PrintResults(results):
+    def Format(value):
+        return f"{value:>11.1f}" if value is not None else f"{'-':>11}"
+
+    print(f"{'clients':>8}{'turns':>7}{'refused':>9}{'failed':>8}{'turns/s':>10}{'p50 ms':>11}{'p95 ms':>11}{'first p50':>11}{'first p95':>11}")
+    for level in results:
+        print(
+            f"{level['clients']:>8}{level['turns']:>7}{level['rejected']:>9}{level['failed']:>8}{level['throughput']:>10.1f}"
+            f"{Format(level['p50'])}{Format(level['p95'])}{Format(level['first_token_p50'])}{Format(level['first_token_p95'])}"
+        )
+
+# Function to start a server on the offline benchmark fakes in a background thread, returning its URL.
+def StartOfflineServer(speed, workers, queue):
+    from Backend import Benchmark
+    Benchmark.InstallFakes()
+    Benchmark.PrepareWorkspace()
+    Benchmark.ReplaySpeed = speed
+    Benchmark.CurrentTurn = Benchmark.SampleSession["turns"][0]
+
+    from Backend import Server  # Imported once the fakes and the scratch .env are in place.
+    ready = threading.Event()
+    address = {}
+
+    async def Run():
+        server = await Server.StartServer("127.0.0.1", 0, workers, queue)
+        address["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(Run(),), daemon=True).start()
+    ready.wait()
+    return f"http://127.0.0.1:{address['port']}"
+
+async def RunLoadTest(url, levels, turns, speech):
+    parts = urlsplit(url)
+    results = []
+    for clients in levels:
+        results.append(await RunLevel(parts.hostname, parts.port or 80, clients, turns, speech, f"{clients}"))
+    return results
+
+# Main entry point: run each concurrency level and print the results.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the assistant server at several concurrency levels.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="server to test")
+    parser.add_argument("--levels", type=int, nargs="+", default=[1, 2, 4, 8], help="numbers of concurrent clients")
+    parser.add_argument("--turns", type=int, default=10, help="turns each client sends")
+    parser.add_argument("--speech", action="store_true", help="also stream the synthesized speech")
+    parser.add_argument("--offline", action="store_true", help="start a server on the offline benchmark fakes")
+    parser.add_argument("--speed", type=float, default=1.0, help="offline: multiplier for the recorded delays")
+    parser.add_argument("--workers", type=int, default=8, help="offline: server worker threads")
+    parser.add_argument("--queue", type=int, default=32, help="offline: turns allowed to wait")
+    parser.add_argument("--save", help="write the results JSON here")
+    options = parser.parse_args()
+    save_path = os.path.abspath(options.save) if options.save else None  # Resolved before --offline changes directory.
+
+    url = StartOfflineServer(options.speed, options.workers, options.queue) if options.offline else options.url
+    results = asyncio.run(RunLoadTest(url, options.levels, options.turns, options.speech))
+    PrintResults(results)
+
+    if save_path:
+        with open(save_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=4)
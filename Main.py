@@ -5,17 +5,18 @@ from Frontend.GUI import (
     TempDirectoryPath,
     SetMicrophoneStatus,
     AnswerModifier,
-    QueryModifier,
     GetMicrophoneStatus,
     GetAssistantStatus
 )
 
-from Backend.Model import FirstLayerDMM
-from Backend.RealtimeSearchEngine import RealtimeSearchEngine
+from Backend.Model import FirstLayerDMM, AnswerDecision
 from Backend.Automation import Automation
-from Backend.SpeechToText import SpeechRecognition
-from Backend.Chatbot import ChatBot
+from Backend.SpeechToText import SpeechRecognition, BargeInMonitor, HasPendingQuery
 from Backend.TextToSpeech import TextToSpeech
+from Backend.CommandRegistry import Commands
+from Backend.Reminder import StartReminders
+from Backend.WakeWord import StartWakeWordListener
+from Backend.Tracer import Traced, ExportChromeTrace
 from dotenv import dotenv_values
 from asyncio import run
 from time import sleep
@@ -28,11 +29,11 @@ import sys
 env_vars = dotenv_values(".env")
 Username = env_vars.get("Username")
 Assistantname = env_vars.get("Assistantname")
+WakeWordEnabled = str(env_vars.get("WakeWord", "False")).lower() == "true"
 DefaultMessage = f'''{Username} : Hello {Assistantname}, How are you?
 {Assistantname} : Welcome {Username}. I am doing well. How may i help you?'''
 
 subprocesses = []
-Functions = ["open", "close", "play", "system", "content", "google search", "youtube search"]
 
 def ShowDefaultChatIfNoChats():
     File = open(r'Data\ChatLog.json', 'r', encoding='utf-8')
@@ -73,15 +74,27 @@ def ShowChatsOnGUI():
         File.write(result)
         File.close()
 
+def FireReminder(Message):
+    ShowTextToScreen(f"{Assistantname} : Reminder: {Message}")
+    TextToSpeech(f"Reminder, {Message}")
+
+def OnWakeWord():
+    if GetMicrophoneStatus() != "True":
+        SetMicrophoneStatus("True")
+
 def InitialExecution():
     SetMicrophoneStatus("False")
     ShowTextToScreen("")
     ShowDefaultChatIfNoChats()
     ChatLogIntegration()
     ShowChatsOnGUI()
+    StartReminders(FireReminder)
+    if WakeWordEnabled:
+        StartWakeWordListener(OnWakeWord)
 
 InitialExecution()
 
+@Traced("turn")
 def MainExecution():
 
     TaskExecution = False
@@ -98,13 +111,6 @@ def MainExecution():
     print(f"Decision : {Decision}")
     print("")
 
-    G = any([i for i in Decision if i.startswith("general")])
-    R = any([i for i in Decision if i.startswith("realtime")])
-
-    Mearged_query = " and ".join(
-        [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
-    )
-
     for queries in Decision:
         if "generate" in queries:
             ImageGenerationQuery = str(queries)
@@ -112,7 +118,7 @@ def MainExecution():
     
     for queries in Decision:
         if TaskExecution == False:
-            if any(queries.startswith(func) for func in Functions):
+            if Commands.IsAutomation(queries):
                 run(Automation(list(Decision)))
                 TaskExecution = True
     ''''
@@ -163,50 +169,20 @@ def MainExecution():
             with open(r"Frontend\Files\ImageGenStatus.data", 'w') as status_file:
                 status_file.write(f"Error starting image generation: {str(e)}")
 
-    if G and R or R:
-        
-        SetAssistantStatus("Searching... ")
-        Answer = RealtimeSearchEngine(QueryModifier(Mearged_query))
-        ShowTextToScreen(f"{Assistantname} : {Answer}")
-        SetAssistantStatus("Answering... ")
+    Answer, Exit = AnswerDecision(Decision, SetAssistantStatus)
+    if Answer is None:
+        return
+
+    ShowTextToScreen(f"{Assistantname} : {Answer}")
+    SetAssistantStatus("Answering... ")
+
+    if Exit:
         TextToSpeech(Answer)
-        return True
-    
-    else:
-        for Queries in Decision:
-            if "general" in Queries:
-                SetAssistantStatus("Thinking... ")
-                QueryFinal = Queries.replace("general ","")
-                Answer = ChatBot(QueryModifier(QueryFinal))
-                ShowTextToScreen(f"{Assistantname} : {Answer}")
-                SetAssistantStatus("Answering... ")
-                TextToSpeech(Answer)
-                return True
-            
-            elif "realtime" in Queries:
-                SetAssistantStatus("Searching... ")
-                QueryFinal = Queries.replace("realtime ","")
-                Answer = RealtimeSearchEngine(QueryModifier(QueryFinal))
-                ShowTextToScreen(f"{Assistantname} : {Answer}")
-                SetAssistantStatus("Answering... ")
-                TextToSpeech(Answer)
-                return True
-            
-            elif "content" in queries:
-                Prompt = queries.replace("content ", "")
-                result = ChatBot(Prompt)  # Directly send the cleaned prompt
-                ShowTextToScreen(f"{Assistantname} : {result}")
-                TextToSpeech(result)
-                return True
-
-            elif "exit" in Queries:
-                QueryFinal = "Okay, Bye!"
-                Answer = ChatBot(QueryModifier(QueryFinal))
-                ShowTextToScreen(f"{Assistantname} : {Answer}")
-                SetAssistantStatus("Answering... ")
-                TextToSpeech(Answer)
-                SetAssistantStatus("Answering... ")
-                os._exit(1)
+        SetAssistantStatus("Answering... ")
+        os._exit(1)
+
+    TextToSpeech(Answer, BargeInMonitor(Answer))
+    return True
 
 def FirstThread():
 
@@ -216,6 +192,9 @@ def FirstThread():
 
         if CurrentStatus == "True":
             MainExecution()
+            ExportChromeTrace()
+            if WakeWordEnabled and not HasPendingQuery():
+                SetMicrophoneStatus("False")  # Wait for the next wake word, unless a barge-in query is waiting.
         else:
             AIStatus = GetAssistantStatus()
 
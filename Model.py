@@ -1,6 +1,12 @@
 import cohere                      # Import the cohere library for AI services.
 from rich import print             # Import the rich library to enhance terminal outputs.
 from dotenv import dotenv_values   # Import dotenv to load environment variable from a .env file.
+from Backend.CommandRegistry import Commands  # Import the shared command registry.
+from Backend.Tracer import Traced  # Import the tracer to time each stage of a turn.
+from Backend.Cassette import HttpxClient  # Import the record-and-replay layer for API calls.
+from Backend.Prompt import PromptPrefix  # Import the prompt assembly layer to reuse the static prompt.
+from Backend.Chatbot import ChatBot  # Import the chatbot that answers general queries.
+from Backend.RealtimeSearchEngine import RealtimeSearchEngine  # Import the search engine that answers realtime queries.
 
 # Load environment variable from the .env file.
 env_vars = dotenv_values(".env")
@@ -9,17 +15,7 @@ env_vars = dotenv_values(".env")
 CohereAPIKey = env_vars.get("CohereAPIKey")
 
 # Create a Cohere client using the provided API key
-co = cohere.Client(api_key= CohereAPIKey)
-
-# Define a list of recognized function keywords for task categorization
-funcs = [
-    "exit", "general", "realtime", "open", "close", "play",
-    "generate image", "system", "content", "google search",
-    "youtube search", "reminder"
-]
-
-# Initialize an empty list to store user messages
-messages = []
+co = cohere.Client(api_key= CohereAPIKey, httpx_client=HttpxClient())
 
 # Define the preamble that guides the AI model on how to create queries
 preamble = """
@@ -93,6 +89,11 @@ Examples:
 Examples:
 - 'search AI podcast on YouTube' → youtube search (AI podcast)
 - 'youtube search Python tutorials' → youtube search (Python tutorials)
+
+-> Respond with 'presentation (topic)' if a query is asking to make a presentation, slides or a PowerPoint deck on a topic.
+Examples:
+- 'make a presentation on climate change' → presentation (climate change)
+- 'create a powerpoint about machine learning' → presentation (machine learning)
 -> Respond with 'content (topic)' if a query is asking to write any type of content such as an application, code, email, poem, blog, or story.
 
 Examples:
@@ -134,29 +135,32 @@ ChatHistory = [
     {"role": "System", "message": "Reminder: All queries asking 'who is <person>' must be categorized as realtime."}
 ]
 
+# The static part of every request: the preamble and the example chat history, only the query changes.
+DecisionPrompt = PromptPrefix("dmm", preamble=preamble, chat_history=ChatHistory)
+
 # Define the main function for decision-making on queries.
+@Traced("dmm")
 def FirstLayerDMM(prompt: str = "test"):
-    # Add the user's query to the message list.
-    messages.append({"role": "user", "content": f"{prompt}"})
-
-    #create a streaming chat session with the Cohere model.
-    stream = co.chat_stream(
-        model = 'command-r-plus',     # Specify the Cohere model to use
-        message=prompt,               # Pass the user's query
-        temperature=0.7,              # Set the creativity level of the model
-        chat_history=ChatHistory,     # Provide the predefined chat history for context.
-        prompt_truncation='OFF',      # Ensure the prompt is not truncated.
-        connectors=[],                # No additional connectors are used.
-        preamble=preamble
-    )
-
-    # Initialize an empty string to store the generated response.
-    response = ""
-
-    # Iterate over events in the stream and capture text generation events.
-    for event in stream:
-        if event.event_type == "text-generation":
-            response += event.text # Append generated text to the response.
+    with DecisionPrompt.Call(prompt) as call:
+        #create a streaming chat session with the Cohere model.
+        stream = co.chat_stream(
+            model = 'command-r-plus',     # Specify the Cohere model to use
+            message=prompt,               # Pass the user's query
+            temperature=0.7,              # Set the creativity level of the model
+            prompt_truncation='OFF',      # Ensure the prompt is not truncated.
+            connectors=[],                # No additional connectors are used.
+            **DecisionPrompt.fields       # Provide the preamble and the predefined chat history for context.
+        )
+
+        # Initialize an empty string to store the generated response.
+        response = ""
+
+        # Iterate over events in the stream and capture text generation events.
+        for event in stream:
+            call.Answered()  # The Cohere stream sends the request on the first iteration.
+            if event.event_type == "text-generation":
+                call.Token()
+                response += event.text # Append generated text to the response.
 
     # Remove newline characters and split responses into individual tasks.
     response = response.replace("\n", "")
@@ -168,11 +172,10 @@ def FirstLayerDMM(prompt: str = "test"):
     # Initialize an empty list to filter valid tasks.
     temp = []
     
-    # Filter the tasks based on recognized function keywords.
+    # Filter the tasks based on the commands in the shared registry.
     for task in response:
-        for func in funcs:
-            if task.startswith(func):
-                temp.append(task)      # Add valid tasks to the filtered list.
+        if Commands.Match(task):
+            temp.append(task)      # Add valid tasks to the filtered list.
     
         # Backup: Force 'content' if it's clearly a code-related task
     if any(word in prompt.lower() for word in ["write code", "generate code", "build an app", "create script"]):
@@ -187,7 +190,63 @@ def FirstLayerDMM(prompt: str = "test"):
         return newresponse      # Return the clarified response
     else:
         return response         # Return the filtered response.
-    
+
+# Function to tidy a query before answering it: lowercase, then end it with '?' for questions and '.' otherwise.
+def QueryModifier(Query):
+
+    new_query = Query.lower().strip()
+    query_words = new_query.split()
+    question_words = ["how", "what", "who", "where", "when", "why", "which", "whose", "whom", "can you", "what's", "where's", "how's"]
+
+    if any(word + " " in new_query for word in question_words):
+        if query_words[-1][-1] in ['.', '?', '!']:
+            new_query = new_query[:-1] + "?"
+        else:
+            new_query += "?"
+
+    else:
+        if query_words[-1][-1] in ['.', '?', '!']:
+            new_query = new_query[:-1] + '.'
+        else:
+            new_query += "."
+
+    return new_query.capitalize()
+
+# Function to answer a decision with the chatbot or the realtime search engine, returning (answer, exit).
+# exit is True when the decision ends the conversation; set_status, if given, is told the stage before answering.
+# answer(engine, query) makes the call, e.g. to stream the engine's tokens; by default it is engine(query).
+def AnswerDecision(Decision, set_status=None, answer=None):
+    set_status = set_status or (lambda status: None)
+    answer = answer or (lambda engine, query: engine(query))
+
+    G = any([i for i in Decision if i.startswith("general")])
+    R = any([i for i in Decision if i.startswith("realtime")])
+
+    Mearged_query = " and ".join(
+        [" ".join(i.split()[1:]) for i in Decision if i.startswith("general") or i.startswith("realtime")]
+    )
+
+    if G and R or R:
+        set_status("Searching... ")
+        return answer(RealtimeSearchEngine, QueryModifier(Mearged_query)), False
+
+    for Queries in Decision:
+        if "general" in Queries:
+            set_status("Thinking... ")
+            return answer(ChatBot, QueryModifier(Queries.replace("general ", ""))), False
+
+        elif "realtime" in Queries:
+            set_status("Searching... ")
+            return answer(RealtimeSearchEngine, QueryModifier(Queries.replace("realtime ", ""))), False
+
+        elif "content" in Queries:
+            return answer(ChatBot, Queries.replace("content ", "")), False  # Directly send the cleaned prompt.
+
+        elif "exit" in Queries:
+            return answer(ChatBot, QueryModifier("Okay, Bye!")), True
+
+    return None, False
+
 
 # Entry point for the script
 if __name__ == "__main__":
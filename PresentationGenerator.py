@@ -1,34 +1,42 @@
-import requests
 import json
 import os
 import io
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib import cm
-import matplotlib as mpl
 from datetime import datetime
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.text import PP_ALIGN
-from pptx.enum.dml import MSO_THEME_COLOR
 import re
+import sys
 import time
+import hashlib
+import threading
+from collections import OrderedDict
 
-# Set professional matplotlib style
-plt.style.use('default')
-mpl.rcParams.update({
-    'font.size': 14,
-    'font.family': 'sans-serif',
-    'axes.linewidth': 1.2,
-    'axes.spines.top': False,
-    'axes.spines.right': False,
-    'axes.grid': True,
-    'grid.alpha': 0.3,
-    'figure.facecolor': 'white',
-    'axes.facecolor': 'white'
-})
+# requests, python-pptx and matplotlib are imported on first use, so importing this module stays cheap
+
+# Session for the Ollama API, recording or replaying its responses when a cassette is enabled
+session = None
+_session_lock = threading.Lock()
+
+def get_session():
+    """Get the Ollama session, creating it on first use"""
+    global session
+    with _session_lock:
+        if session is None:
+            try:
+                from Backend.Cassette import CassetteSession
+            except ImportError:  # Run as a script from the Backend folder.
+                from Cassette import CassetteSession
+            session = CassetteSession()
+    return session
+
+# python-pptx classes, loaded when the first deck is built
+Presentation = Inches = Pt = RGBColor = None
+
+def load_pptx():
+    """Import the python-pptx classes the decks are built with"""
+    global Presentation, Inches, Pt, RGBColor
+    if Presentation is None:
+        from pptx.util import Inches, Pt
+        from pptx.dml.color import RGBColor
+        from pptx import Presentation  # Bound last, as it marks python-pptx loaded
 
 # Professional color schemes
 COLOR_SCHEMES = {
@@ -56,10 +64,13 @@ def get_topic_category(topic):
     else:
         return 'business'  # Default
 
-def query_ollama_structured(topic):
-    """Query Ollama with structured prompts for consistent output"""
+# Ollama server; point it at a stub server to run without a model
+OLLAMA_URL = "http://localhost:11434"
+
+def build_outline_prompt(topic):
+    """Build the structured outline prompt for a topic"""
     
-    structured_prompt = f"""Create a professional presentation outline for "{topic}". 
+    return f"""Create a professional presentation outline for "{topic}". 
     
 Return EXACTLY 8 slides with this precise format:
 
@@ -105,86 +116,142 @@ SLIDE 8: Conclusion and Next Steps
 
 For each slide, provide exactly 3-4 bullet points. Keep content factual and professional."""
 
+def stream_ollama_text(topic, url=None):
+    """Stream the outline text from Ollama, yielding each piece as it is generated"""
+    
+    response = get_session().post(
+        f"{url or OLLAMA_URL}/api/generate",
+        json={
+            "model": "llama3",
+            "prompt": build_outline_prompt(topic),
+            "stream": True,
+            "options": {
+                "temperature": 0.2,
+                "top_p": 0.8,
+                "num_predict": 2000
+            }
+        },
+        stream=True,
+        timeout=(5, 180)  # Connect quickly, then allow up to 180 s between chunks
+    )
+    
     try:
-        response = requests.post(
-            "http://localhost:11434/api/generate",
-            json={
-                "model": "llama3",
-                "prompt": structured_prompt,
-                "options": {
-                    "temperature": 0.2,
-                    "top_p": 0.8,
-                    "num_predict": 2000
-                }
-            },
-            timeout=180
-        )
-        
-        if response.status_code == 200:
-            full_response = ""
-            for line in response.text.strip().split('\n'):
-                try:
-                    data = json.loads(line)
-                    if "response" in data:
-                        full_response += data["response"]
-                except:
-                    continue
-            return full_response
-        else:
-            print(f"API Error: {response.status_code}")
-            return None
-            
+        if response.status_code != 200:
+            raise ConnectionError(f"API Error: {response.status_code}")
+        
+        # Each NDJSON line is handled as soon as it arrives
+        for line in response.iter_lines():
+            if not line:
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                continue
+            if data.get("response"):
+                yield data["response"]
+            if data.get("done"):
+                break
+    finally:
+        response.close()
+
+def query_ollama_structured(topic, url=None):
+    """Query Ollama with structured prompts for consistent output"""
+    try:
+        return "".join(stream_ollama_text(topic, url))
     except Exception as e:
         print(f"Connection error: {e}")
         return None
 
-def parse_slides_improved(content):
-    """Improved slide parsing with better structure recognition"""
-    slides = []
-    current_slide = None
+# One compiled pattern classifying an outline line in a single pass: SLIDE headers (anywhere in the
+# line, e.g. "**SLIDE 2: Title**"), numbered headers, markdown headers, then bullets at any depth.
+# Indented numbered lines are list items, not headers.
+# Only the title or point group of the matching alternative is set, so match.lastgroup tells them apart.
+OUTLINE_LINE = re.compile(r"""
+    (?P<indent>[ \t]*)
+    (?:
+        [^\n]*?(?i:slide)\s+\d+:\s*(?P<slide>.*)
+      | (?<![ \t])\d+\.?\s+(?P<numbered>.*)
+      | \#+\s*(?P<heading>.*)
+      | (?:[-•*+]|\d+[.)])\s*(?P<point>.*)
+    )
+""", re.VERBOSE)
+
+class SlideStreamParser:
+    """Incremental outline parser that emits each slide once its bullets are complete"""
     
-    lines = content.split('\n')
-    slide_counter = 0
+    def __init__(self):
+        self.buffer = ""
+        self.current_slide = None
+        self.slide_counter = 0
+        self.bullet_indent = None
     
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Detect slide headers
-        slide_match = re.search(r'SLIDE\s+(\d+):\s*(.*)', line, re.IGNORECASE)
-        if not slide_match:
-            # Alternative patterns
-            slide_match = re.search(r'^(\d+)\.?\s+(.*)', line)
-            if not slide_match and line.startswith('#'):
-                slide_match = re.search(r'^#+\s*(.*)', line)
-        
-        if slide_match:
-            # Save previous slide
-            if current_slide and current_slide['points']:
-                slides.append(current_slide)
-            
-            slide_counter += 1
-            title = slide_match.group(2) if len(slide_match.groups()) >= 2 else slide_match.group(1)
-            title = title.strip()
-            
-            current_slide = {
-                'number': slide_counter,
-                'title': title,
-                'points': []
-            }
-            
-        elif line.startswith(('-', '•', '*', '+')):
-            if current_slide:
-                point = re.sub(r'^[-•*+]\s*', '', line).strip()
-                if len(point) > 10:  # Filter out very short points
-                    current_slide['points'].append(point)
+    def feed(self, text):
+        """Add streamed text, returning the slides completed by it"""
+        self.buffer += text
+        lines = self.buffer.split('\n')
+        self.buffer = lines.pop()  # Keep the unfinished line for the next piece
+        
+        completed = []
+        for line in lines:
+            slide = self.parse_line(line)
+            if slide:
+                completed.append(slide)
+        return completed
     
-    # Add last slide
-    if current_slide and current_slide['points']:
-        slides.append(current_slide)
+    def close(self):
+        """Finish the stream, returning the remaining slides"""
+        completed = self.feed('\n')
+        
+        # Add last slide
+        if self.current_slide and self.current_slide['points']:
+            completed.append(self.current_slide)
+        self.current_slide = None
+        return completed
+    
+    def parse_line(self, line):
+        """Parse one complete line, returning the previous slide when a new one starts"""
+        line = line.rstrip()  # Trailing '\r' of CRLF outlines; leading indent is kept for nesting
+        match = OUTLINE_LINE.match(line)
+        if not match or match.lastgroup is None:
+            return None
+        kind = match.lastgroup
+        
+        if kind == 'point':
+            if self.current_slide:
+                point = match.group('point').strip()
+                if len(point) > 10:  # Filter out very short points
+                    self.add_point(point, len(match.group('indent').expandtabs(4)))
+            return None
+        
+        # Slide header: save previous slide
+        finished = None
+        if self.current_slide and self.current_slide['points']:
+            finished = self.current_slide
+        
+        self.slide_counter += 1
+        self.current_slide = {
+            'number': self.slide_counter,
+            'title': match.group(kind).strip(' \t*#'),
+            'points': [],
+            'subpoints': []
+        }
+        self.bullet_indent = None
+        return finished
     
-    # Ensure exactly 8 slides
+    def add_point(self, point, indent):
+        """Add a bullet, nesting it under the previous point when indented deeper than the slide's first bullet"""
+        slide = self.current_slide
+        if self.bullet_indent is None:
+            self.bullet_indent = indent
+        
+        if indent > self.bullet_indent and slide['points']:
+            slide['subpoints'][-1].append(point)
+        else:
+            slide['points'].append(point)
+            slide['subpoints'].append([])
+
+def pad_slides(slides):
+    """Ensure exactly 8 slides"""
     while len(slides) < 8:
         slides.append({
             'number': len(slides) + 1,
@@ -196,144 +263,412 @@ def parse_slides_improved(content):
     
     return slides[:8]
 
-def create_meaningful_chart(slide_title, slide_number, colors):
-    """Create contextually appropriate charts based on slide content"""
+def parse_slides_improved(content):
+    """Improved slide parsing with better structure recognition"""
+    parser = SlideStreamParser()
+    slides = parser.feed(content) + parser.close()
+    return pad_slides(slides)
+
+def stream_slides(topic, url=None):
+    """Stream slides from Ollama, yielding each one as soon as its bullets are complete"""
+    parser = SlideStreamParser()
+    count = 0
+    
+    for text in stream_ollama_text(topic, url):
+        for slide in parser.feed(text):
+            yield slide
+            count += 1
+            if count == 8:
+                return
     
-    # Determine chart type and data based on slide content
+    for slide in parser.close()[:8 - count]:
+        yield slide
+
+# Fixed data behind each chart type; a chart is fully determined by its type and palette
+CHART_TYPES = {
+    'benefits': ['benefit', 'advantage', 'value'],
+    'challenges': ['challenge', 'problem', 'risk'],
+    'trends': ['future', 'trend', 'outlook'],
+    'applications': ['application', 'use', 'practical'],
+    'climate': ['temperature', 'climate', 'environment'],
+    'species': ['species', 'wildlife', 'biodiversity'],
+}
+
+# Chart specs shared by the matplotlib and native chart backends
+CHART_DATA = {
+    'benefits': {
+        'kind': 'column', 'title': 'Key Benefits Distribution',
+        'categories': ['Cost Savings', 'Efficiency', 'Quality', 'Speed', 'Satisfaction'],
+        'values': [25, 35, 30, 20, 40],
+        'value_axis': 'Impact Percentage (%)', 'label': '{}%', 'label_offset': 0.5, 'rotate_labels': True,
+    },
+    'challenges': {
+        'kind': 'pie', 'title': 'Challenge Distribution',
+        'categories': ['Technical', 'Financial', 'Operational', 'Regulatory', 'Other'],
+        'values': [25, 30, 20, 15, 10],
+    },
+    'trends': {
+        'kind': 'line', 'title': 'Growth Trends',
+        'categories': ['2020', '2021', '2022', '2023', '2024', '2025'],
+        'values': [100, 120, 145, 175, 210, 250],
+        'value_axis': 'Index Value',
+    },
+    'applications': {
+        'kind': 'bar', 'title': 'Adoption by Sector',
+        'categories': ['Healthcare', 'Finance', 'Education', 'Manufacturing', 'Retail'],
+        'values': [85, 78, 92, 67, 73],
+        'value_axis': 'Adoption Rate (%)', 'label': '{}%', 'label_offset': 1,
+    },
+    'climate': {
+        'kind': 'line', 'title': 'Global Temperature Change (°C)',
+        'categories': ['1990', '2000', '2010', '2020', '2030', '2040'],
+        'values': [0.0, 0.4, 0.8, 1.2, 1.8, 2.5],
+        'value_axis': 'Temperature Change (°C)', 'legend': 'Temperature Change', 'colors': ['#d62728'],
+    },
+    'species': {
+        'kind': 'column', 'title': 'Climate Impact on Species',
+        'categories': ['Habitat Loss', 'Migration', 'Extinction Risk', 'Population Decline', 'Adaptation'],
+        'values': [85, 70, 65, 75, 45],
+        'value_axis': 'Impact Severity (%)', 'label': '{}%', 'label_offset': 1, 'rotate_labels': True,
+        'colors': ['#d62728', '#ff7f0e', '#2ca02c', '#1f77b4', '#9467bd'],
+    },
+    'default': {
+        'kind': 'column', 'title': 'Key Metrics',
+        'categories': ['Category A', 'Category B', 'Category C', 'Category D'],
+        'values': [30, 45, 25, 35],
+        'value_axis': 'Value', 'label': '{}', 'label_offset': 0.5,
+    },
+}
+
+# Chart backends: 'matplotlib' embeds rendered PNGs, 'native' emits editable PowerPoint charts
+CHART_BACKEND = 'matplotlib'
+
+def get_chart_type(slide_title):
+    """Determine the chart type from the slide title"""
     title_lower = slide_title.lower()
+    for chart_type, words in CHART_TYPES.items():
+        if any(word in title_lower for word in words):
+            return chart_type
+    return 'default'
+
+def chart_spec(slide_title, colors):
+    """Get the (chart type, palette) spec a slide's chart is rendered from"""
+    chart_type = get_chart_type(slide_title)
+    # Charts drawn in their own fixed colors do not depend on the palette
+    palette = () if 'colors' in CHART_DATA[chart_type] else tuple(colors)
+    return chart_type, palette
+
+# matplotlib's pyplot, loaded on the first render
+plt = None
+
+def load_matplotlib():
+    """Import matplotlib with the Agg backend and the professional style"""
+    global plt
+    if plt is None:
+        import matplotlib
+        matplotlib.use('Agg')  # Render charts off-screen, also in the chart worker processes
+        import matplotlib.pyplot as pyplot
+        
+        # Set professional matplotlib style
+        pyplot.style.use('default')
+        matplotlib.rcParams.update({
+            'font.size': 14,
+            'font.family': 'sans-serif',
+            'axes.linewidth': 1.2,
+            'axes.spines.top': False,
+            'axes.spines.right': False,
+            'axes.grid': True,
+            'grid.alpha': 0.3,
+            'figure.facecolor': 'white',
+            'axes.facecolor': 'white'
+        })
+        plt = pyplot
+    return plt
+
+# Figure reused by every render in a thread; charts may render in several threads at once
+# (presentation commands on the automation pool, server sessions), so each has its own
+_chart_figures = threading.local()
+
+def get_chart_axes():
+    """Get this thread's reusable chart figure with a fresh axes"""
+    figure = getattr(_chart_figures, 'figure', None)
+    if figure is None:
+        load_matplotlib()
+        from matplotlib.figure import Figure  # Not registered with pyplot, so threads don't share its figure list
+        figure = _chart_figures.figure = Figure(figsize=(8, 5))
+        figure.patch.set_facecolor('white')
+    figure.clear()
+    return figure, figure.add_subplot()
+
+def render_chart(chart_type, colors):
+    """Render a chart type in the given palette to PNG bytes"""
     
-    fig, ax = plt.subplots(figsize=(8, 5))
-    fig.patch.set_facecolor('white')
+    fig, ax = get_chart_axes()
+    data = CHART_DATA[chart_type]
+    colors = data.get('colors', colors)
+    categories, values = data['categories'], data['values']
     
-    if 'benefit' in title_lower or 'advantage' in title_lower or 'value' in title_lower:
-        # Benefits bar chart
-        categories = ['Cost Savings', 'Efficiency', 'Quality', 'Speed', 'Satisfaction']
-        values = [25, 35, 30, 20, 40]
-        bars = ax.bar(categories, values, color=colors[:5])
+    if data['kind'] == 'column':
+        # Vertical bar chart with value labels
+        bars = ax.bar(categories, values, color=colors[:len(values)])
         
-        # Add value labels
         for bar in bars:
             height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                   f'{height}%', ha='center', va='bottom', fontweight='bold')
-        
-        ax.set_title('Key Benefits Distribution', fontsize=16, fontweight='bold', pad=20)
-        ax.set_ylabel('Impact Percentage (%)')
-        plt.xticks(rotation=45, ha='right')
+            ax.text(bar.get_x() + bar.get_width()/2., height + data['label_offset'],
+                   data['label'].format(height), ha='center', va='bottom', fontweight='bold')
         
-    elif 'challenge' in title_lower or 'problem' in title_lower or 'risk' in title_lower:
-        # Challenges pie chart
-        categories = ['Technical', 'Financial', 'Operational', 'Regulatory', 'Other']
-        values = [25, 30, 20, 15, 10]
+        ax.set_ylabel(data['value_axis'])
+        if data.get('rotate_labels'):
+            plt.setp(ax.get_xticklabels(), rotation=45, ha='right')
         
+    elif data['kind'] == 'pie':
         wedges, texts, autotexts = ax.pie(values, labels=categories, autopct='%1.1f%%',
-                                         colors=colors[:5], startangle=90)
+                                         colors=colors[:len(values)], startangle=90)
         
         for autotext in autotexts:
             autotext.set_color('white')
             autotext.set_fontweight('bold')
-            
-        ax.set_title('Challenge Distribution', fontsize=16, fontweight='bold')
         
-    elif 'future' in title_lower or 'trend' in title_lower or 'outlook' in title_lower:
-        # Future trends line chart
-        years = ['2020', '2021', '2022', '2023', '2024', '2025']
-        growth = [100, 120, 145, 175, 210, 250]
+    elif data['kind'] == 'line':
+        # Line chart with the area below filled
+        ax.plot(categories, values, marker='o', linewidth=3, markersize=8, 
+                color=colors[0], label=data.get('legend'))
+        ax.fill_between(categories, values, alpha=0.3, color=colors[0])
         
-        ax.plot(years, growth, marker='o', linewidth=3, markersize=8, color=colors[0])
-        ax.fill_between(years, growth, alpha=0.3, color=colors[0])
-        
-        ax.set_title('Growth Trends', fontsize=16, fontweight='bold', pad=20)
-        ax.set_ylabel('Index Value')
+        ax.set_ylabel(data['value_axis'])
         ax.grid(True, alpha=0.3)
+        if data.get('legend'):
+            ax.legend()
         
-    elif 'application' in title_lower or 'use' in title_lower or 'practical' in title_lower:
-        # Applications horizontal bar chart
-        applications = ['Healthcare', 'Finance', 'Education', 'Manufacturing', 'Retail']
-        adoption = [85, 78, 92, 67, 73]
-        
-        bars = ax.barh(applications, adoption, color=colors[:5])
+    elif data['kind'] == 'bar':
+        # Horizontal bar chart with value labels
+        bars = ax.barh(categories, values, color=colors[:len(values)])
         
         for i, bar in enumerate(bars):
             width = bar.get_width()
-            ax.text(width + 1, bar.get_y() + bar.get_height()/2,
-                   f'{adoption[i]}%', ha='left', va='center', fontweight='bold')
-        
-        ax.set_title('Adoption by Sector', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel('Adoption Rate (%)')
-        
-    elif 'temperature' in title_lower or 'climate' in title_lower or 'environment' in title_lower:
-        # Climate-specific chart
-        years = ['1990', '2000', '2010', '2020', '2030', '2040']
-        temp_change = [0.0, 0.4, 0.8, 1.2, 1.8, 2.5]
-        
-        ax.plot(years, temp_change, marker='o', linewidth=3, markersize=8, 
-                color='#d62728', label='Temperature Change')
-        ax.fill_between(years, temp_change, alpha=0.3, color='#d62728')
-        
-        ax.set_title('Global Temperature Change (°C)', fontsize=16, fontweight='bold', pad=20)
-        ax.set_ylabel('Temperature Change (°C)')
-        ax.grid(True, alpha=0.3)
-        ax.legend()
-        
-    elif 'species' in title_lower or 'wildlife' in title_lower or 'biodiversity' in title_lower:
-        # Species impact chart
-        impacts = ['Habitat Loss', 'Migration', 'Extinction Risk', 'Population Decline', 'Adaptation']
-        severity = [85, 70, 65, 75, 45]
-        
-        bars = ax.bar(impacts, severity, color=['#d62728', '#ff7f0e', '#2ca02c', '#1f77b4', '#9467bd'])
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-                   f'{height}%', ha='center', va='bottom', fontweight='bold')
-        
-        ax.set_title('Climate Impact on Species', fontsize=16, fontweight='bold', pad=20)
-        ax.set_ylabel('Impact Severity (%)')
-        plt.xticks(rotation=45, ha='right')
+            ax.text(width + data['label_offset'], bar.get_y() + bar.get_height()/2,
+                   data['label'].format(values[i]), ha='left', va='center', fontweight='bold')
         
+        ax.set_xlabel(data['value_axis'])
+    
+    if data['kind'] == 'pie':
+        ax.set_title(data['title'], fontsize=16, fontweight='bold')
     else:
-        # Default comparison chart
-        categories = ['Category A', 'Category B', 'Category C', 'Category D']
-        values = [30, 45, 25, 35]
-        
-        bars = ax.bar(categories, values, color=colors[:4])
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                   f'{height}', ha='center', va='bottom', fontweight='bold')
-        
-        ax.set_title('Key Metrics', fontsize=16, fontweight='bold', pad=20)
-        ax.set_ylabel('Value')
+        ax.set_title(data['title'], fontsize=16, fontweight='bold', pad=20)
     
-    plt.tight_layout()
+    fig.tight_layout()
     
     # Save to buffer
     buf = io.BytesIO()
-    plt.savefig(buf, format='png', dpi=150, bbox_inches='tight', 
+    fig.savefig(buf, format='png', dpi=150, bbox_inches='tight', 
                 facecolor='white', edgecolor='none')
-    buf.seek(0)
-    plt.close()
     
-    return buf
+    return buf.getvalue()
 
-def create_professional_presentation(slides, topic):
-    """Create a professional PowerPoint presentation with proper formatting"""
+def add_native_chart(slide, chart_type, colors, left, top, width, height):
+    """Add a chart as a native, editable PowerPoint chart built from its spec"""
+    load_pptx()
+    from pptx.chart.data import CategoryChartData
+    from pptx.enum.chart import XL_CHART_TYPE, XL_LEGEND_POSITION
     
-    # Create presentation
-    prs = Presentation()
+    data = CHART_DATA[chart_type]
+    colors = data.get('colors', colors)
+    kind = data['kind']
+    
+    chart_data = CategoryChartData()
+    chart_data.categories = data['categories']
+    chart_data.add_series(data.get('legend', data['title']), data['values'])
+    
+    xl_type = {
+        'column': XL_CHART_TYPE.COLUMN_CLUSTERED,
+        'bar': XL_CHART_TYPE.BAR_CLUSTERED,
+        'pie': XL_CHART_TYPE.PIE,
+        'line': XL_CHART_TYPE.LINE_MARKERS,
+    }[kind]
+    chart = slide.shapes.add_chart(xl_type, left, top, width, height, chart_data).chart
+    
+    # Title
+    chart.has_title = True
+    chart.chart_title.text_frame.text = data['title']
+    chart.chart_title.text_frame.paragraphs[0].font.size = Pt(16)
+    chart.chart_title.text_frame.paragraphs[0].font.bold = True
     
-    # Set slide size to widescreen
-    prs.slide_width = Inches(13.33)
-    prs.slide_height = Inches(7.5)
+    series = chart.plots[0].series[0]
     
-    # Get color scheme
-    category = get_topic_category(topic)
-    colors = COLOR_SCHEMES[category]
+    if kind == 'line':
+        series.format.line.color.rgb = RGBColor.from_string(colors[0].lstrip('#'))
+        series.format.line.width = Pt(3)
+        series.smooth = False
+    else:
+        # One color per category, as in the matplotlib charts
+        for i in range(len(data['values'])):
+            fill = series.points[i].format.fill
+            fill.solid()
+            fill.fore_color.rgb = RGBColor.from_string(colors[i % len(colors)].lstrip('#'))
+    
+    # Value labels
+    if kind == 'pie' or 'label' in data:
+        plot = chart.plots[0]
+        plot.has_data_labels = True
+        labels = plot.data_labels
+        labels.font.bold = True
+        if kind == 'pie':
+            labels.number_format = '0.0%'
+            labels.number_format_is_linked = False
+            labels.show_percentage = True
+            labels.show_value = False
+        else:
+            labels.number_format = '0"%"' if '%' in data['label'] else '0'
+            labels.number_format_is_linked = False
+    
+    chart.has_legend = kind == 'pie' or 'legend' in data
+    if chart.has_legend:
+        chart.legend.position = XL_LEGEND_POSITION.BOTTOM
+        chart.legend.include_in_layout = False
+    
+    if kind != 'pie':
+        chart.value_axis.has_title = True
+        chart.value_axis.axis_title.text_frame.text = data['value_axis']
+        chart.value_axis.has_major_gridlines = True
+    
+    return chart
+
+# Rendered charts: an in-memory LRU in front of an on-disk store
+CHART_CACHE_DIR = os.path.join("Data", "ChartCache")
+CHART_CACHE_SIZE = 64
+CHART_CACHE_VERSION = 1  # Bump when the chart drawing changes, so old renders are not reused
+
+_chart_cache = OrderedDict()
+_chart_cache_lock = threading.Lock()
+
+def chart_cache_path(spec):
+    """Get the on-disk cache file of a chart spec"""
+    key = json.dumps([CHART_CACHE_VERSION, spec[0], list(spec[1])])
+    return os.path.join(CHART_CACHE_DIR, hashlib.sha1(key.encode('utf-8')).hexdigest() + ".png")
+
+def get_cached_chart(spec):
+    """Get a rendered chart from memory or disk, or None"""
+    with _chart_cache_lock:
+        if spec in _chart_cache:
+            _chart_cache.move_to_end(spec)
+            return _chart_cache[spec]
     
-    # Create slides
-    for i, slide_data in enumerate(slides):
+    try:
+        with open(chart_cache_path(spec), 'rb') as f:
+            png = f.read()
+    except OSError:
+        return None
+    
+    store_cached_chart(spec, png, write=False)
+    return png
+
+def clear_chart_cache():
+    """Forget the charts kept in memory"""
+    with _chart_cache_lock:
+        _chart_cache.clear()
+
+def store_cached_chart(spec, png, write=True):
+    """Keep a rendered chart in memory and, unless loaded from there, on disk"""
+    with _chart_cache_lock:
+        _chart_cache[spec] = png
+        _chart_cache.move_to_end(spec)
+        if len(_chart_cache) > CHART_CACHE_SIZE:
+            _chart_cache.popitem(last=False)
+    
+    if write:
+        try:
+            os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+            path = chart_cache_path(spec)
+            with open(path + ".tmp", 'wb') as f:
+                f.write(png)
+            os.replace(path + ".tmp", path)
+        except OSError as e:
+            print(f"⚠ Could not store chart in cache: {e}")
+
+def create_meaningful_chart(slide_title, slide_number, colors):
+    """Create contextually appropriate charts based on slide content"""
+    spec = chart_spec(slide_title, colors)
+    png = get_cached_chart(spec)
+    if png is None:
+        png = render_chart(spec[0], colors)
+        store_cached_chart(spec, png)
+    return io.BytesIO(png)
+
+# Slides (0-based) that get a chart: slides 2, 4, 6, 8
+CHART_SLIDES = [1, 3, 5, 7]
+
+# Number of chart worker processes; 0 renders the charts in this process
+CHART_WORKERS = min(4, os.cpu_count() or 1)
+
+_chart_pools = {}
+
+def render_chart_png(chart_type, colors):
+    """Render one chart to PNG bytes (runs in a chart worker process)"""
+    return render_chart(chart_type, colors)
+
+def get_chart_pool(workers):
+    """Get the shared chart process pool with the given number of workers"""
+    if workers not in _chart_pools:
+        from concurrent.futures import ProcessPoolExecutor
+        _chart_pools[workers] = ProcessPoolExecutor(max_workers=workers)
+    return _chart_pools[workers]
+
+def start_chart(slide_title, colors, workers=None):
+    """Start rendering a slide's chart, returning its PNG bytes if cached, a future, or None"""
+    workers = CHART_WORKERS if workers is None else workers
+    
+    # Cached charts need no rendering at all
+    spec = chart_spec(slide_title, colors)
+    png = get_cached_chart(spec)
+    if png is not None or workers <= 0:
+        return png
+    
+    try:
+        return get_chart_pool(workers).submit(render_chart_png, spec[0], colors)
+    except Exception as e:
+        print(f"⚠ Chart workers unavailable, rendering in process: {e}")
+        return None
+
+def collect_chart(job, slide_title, colors):
+    """Get the PNG buffer of a slide's chart, waiting for its worker if needed"""
+    if job is None:
+        return create_meaningful_chart(slide_title, 0, colors)
+    if isinstance(job, bytes):
+        return io.BytesIO(job)
+    
+    png = job.result()
+    store_cached_chart(chart_spec(slide_title, colors), png)
+    return io.BytesIO(png)
+
+class PresentationBuilder:
+    """Builds a deck one slide at a time, so slides can be added while the outline streams in"""
+    
+    def __init__(self, topic, chart_workers=None, output_dir="presentations", chart_backend=None):
+        self.topic = topic
+        self.chart_workers = chart_workers
+        self.output_dir = output_dir
+        self.chart_backend = chart_backend or CHART_BACKEND
+        self.slides = []
+        self.pending_charts = []  # (slide index, pptx slide, chart job), attached in order on save
+        
+        # Create presentation
+        load_pptx()
+        self.prs = Presentation()
+        
+        # Set slide size to widescreen
+        self.prs.slide_width = Inches(13.33)
+        self.prs.slide_height = Inches(7.5)
+        
+        # Get color scheme
+        category = get_topic_category(topic)
+        self.colors = COLOR_SCHEMES[category]
+    
+    def add_slide(self, slide_data):
+        """Add the next slide; its chart starts rendering in a worker right away"""
+        prs = self.prs
+        i = len(self.slides)
+        self.slides.append(slide_data)
+        
         if i == 0:
             # Title slide
             slide_layout = prs.slide_layouts[0]
@@ -361,6 +696,11 @@ def create_professional_presentation(slides, topic):
             slide_layout = prs.slide_layouts[1]
             slide = prs.slides.add_slide(slide_layout)
             
+            # Charts render in worker processes while the text of the slide is assembled
+            chart_job = None
+            if i in CHART_SLIDES and self.chart_backend != 'native':
+                chart_job = start_chart(slide_data['title'], self.colors, self.chart_workers)
+            
             # Title
             title_shape = slide.shapes.title
             title_shape.text = slide_data['title']
@@ -385,7 +725,8 @@ def create_professional_presentation(slides, topic):
             text_frame.margin_left = Inches(0.1)
             text_frame.margin_top = Inches(0.1)
             
-            # Add bullet points
+            # Add bullet points, each with up to two nested points
+            subpoints = slide_data.get('subpoints') or []
             for j, point in enumerate(slide_data['points'][:4]):
                 p = text_frame.paragraphs[0] if j == 0 else text_frame.add_paragraph()
                 p.text = f"• {point}"
@@ -393,30 +734,63 @@ def create_professional_presentation(slides, topic):
                 p.font.name = 'Calibri'
                 p.space_after = Pt(12)
                 p.font.color.rgb = RGBColor(51, 51, 51)
+                
+                for subpoint in (subpoints[j] if j < len(subpoints) else [])[:2]:
+                    sp = text_frame.add_paragraph()
+                    sp.text = f"    ◦ {subpoint}"
+                    sp.font.size = Pt(15)
+                    sp.font.name = 'Calibri'
+                    sp.space_after = Pt(6)
+                    sp.font.color.rgb = RGBColor(89, 89, 89)
             
             # Add chart (right side) for slides 2, 4, 6, 8
-            if i in [1, 3, 5, 7]:  # Slides 2, 4, 6, 8
-                chart_left = Inches(7.5)
-                chart_top = Inches(2.0)
-                chart_width = Inches(5.3)
-                chart_height = Inches(4.5)
-                
-                try:
-                    chart_buffer = create_meaningful_chart(slide_data['title'], i+1, colors)
-                    slide.shapes.add_picture(chart_buffer, chart_left, chart_top, 
-                                           width=chart_width, height=chart_height)
-                    print(f"✓ Added chart to slide {i+1}: {slide_data['title']}")
-                except Exception as e:
-                    print(f"⚠ Could not add chart to slide {i+1}: {e}")
+            if i in CHART_SLIDES:
+                if self.chart_backend == 'native':
+                    self.add_chart(i, slide, None)
+                else:
+                    self.pending_charts.append((i, slide, chart_job))
     
-    # Save presentation
-    os.makedirs("presentations", exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    safe_topic = re.sub(r'[^\w\s-]', '', topic)[:30]
-    filename = f"presentations/{safe_topic}_{timestamp}.pptx"
+    def add_chart(self, i, slide, chart_job):
+        """Place a slide's chart on the right side"""
+        chart_left = Inches(7.5)
+        chart_top = Inches(2.0)
+        chart_width = Inches(5.3)
+        chart_height = Inches(4.5)
+        title = self.slides[i]['title']
+        
+        try:
+            if self.chart_backend == 'native':
+                add_native_chart(slide, get_chart_type(title), self.colors,
+                                 chart_left, chart_top, chart_width, chart_height)
+            else:
+                chart_buffer = collect_chart(chart_job, title, self.colors)
+                slide.shapes.add_picture(chart_buffer, chart_left, chart_top, 
+                                       width=chart_width, height=chart_height)
+            print(f"✓ Added chart to slide {i+1}: {title}")
+        except Exception as e:
+            print(f"⚠ Could not add chart to slide {i+1}: {e}")
     
-    prs.save(filename)
-    return filename
+    def save(self):
+        """Attach the rendered charts in slide order and save the presentation"""
+        for i, slide, chart_job in self.pending_charts:
+            self.add_chart(i, slide, chart_job)
+        self.pending_charts = []
+        
+        # Save presentation
+        os.makedirs(self.output_dir, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_topic = re.sub(r'[^\w\s-]', '', self.topic)[:30]
+        filename = f"{self.output_dir}/{safe_topic}_{timestamp}.pptx"
+        
+        self.prs.save(filename)
+        return filename
+
+def create_professional_presentation(slides, topic, chart_workers=None, output_dir="presentations", chart_backend=None):
+    """Create a professional PowerPoint presentation with proper formatting"""
+    builder = PresentationBuilder(topic, chart_workers, output_dir, chart_backend)
+    for slide_data in slides:
+        builder.add_slide(slide_data)
+    return builder.save()
 
 def create_fallback_presentation(topic):
     """Create a high-quality presentation without LLaMA if needed"""
@@ -506,6 +880,117 @@ def create_fallback_presentation(topic):
     
     return generic_slides
 
+def fetch_outline(topic, url=None):
+    """Get a topic's 8 slides from LLaMA, or the template outline if it is unavailable"""
+    try:
+        slides = list(stream_slides(topic, url))
+    except Exception as e:
+        print(f"Connection error for '{topic}': {e}")
+        slides = []
+    
+    if slides:
+        return pad_slides(slides), 'llm'
+    return create_fallback_presentation(topic), 'template'
+
+def topic_key(topic):
+    """Normalize a topic so repeated topics are generated once"""
+    return ' '.join(topic.lower().split())
+
+def generate_presentations(topics, llm_workers=2, output_dir="presentations", chart_workers=None, chart_backend=None):
+    """Generate a deck per unique topic, pipelining LLM calls, slide/chart building and .pptx writes"""
+    import queue
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    
+    # Deduplicate by topic, keeping the first spelling
+    jobs = {}
+    for topic in topics:
+        topic = topic.strip()
+        if topic and topic_key(topic) not in jobs:
+            jobs[topic_key(topic)] = {'topic': topic, 'requested': 0, 'timings': {}}
+        if topic:
+            jobs[topic_key(topic)]['requested'] += 1
+    
+    build_queue = queue.Queue(maxsize=llm_workers)  # Bounded, so LLM calls cannot run far ahead of building
+    write_queue = queue.Queue(maxsize=llm_workers)
+    start = time.perf_counter()
+    
+    def llm_stage(job):
+        job['queued'] = time.perf_counter() - start
+        begin = time.perf_counter()
+        job['slides'], job['source'] = fetch_outline(job['topic'])
+        job['timings']['llm'] = time.perf_counter() - begin
+        return job
+    
+    def build_stage():
+        # Assembles the text slides and starts the chart renders of one deck at a time
+        while (job := build_queue.get()) is not None:
+            begin = time.perf_counter()
+            try:
+                job['builder'] = PresentationBuilder(job['topic'], chart_workers, output_dir, chart_backend)
+                for slide in job['slides']:
+                    job['builder'].add_slide(slide)
+            except Exception as e:
+                job['error'] = str(e)
+            job['timings']['build'] = time.perf_counter() - begin
+            write_queue.put(job)
+        write_queue.put(None)
+    
+    def write_stage():
+        # Waits for the charts and writes the .pptx, while the next deck is being built
+        while (job := write_queue.get()) is not None:
+            begin = time.perf_counter()
+            if 'error' not in job:
+                try:
+                    job['file'] = job['builder'].save()
+                except Exception as e:
+                    job['error'] = str(e)
+            job['timings']['write'] = time.perf_counter() - begin
+            job['timings']['total'] = time.perf_counter() - start - job['queued']
+            job.pop('builder', None)
+    
+    builder_thread = threading.Thread(target=build_stage, daemon=True)
+    writer_thread = threading.Thread(target=write_stage, daemon=True)
+    builder_thread.start()
+    writer_thread.start()
+    
+    with ThreadPoolExecutor(max_workers=llm_workers) as llm_pool:
+        futures = [llm_pool.submit(llm_stage, job) for job in jobs.values()]
+        for future in as_completed(futures):
+            build_queue.put(future.result())
+    build_queue.put(None)
+    
+    builder_thread.join()
+    writer_thread.join()
+    
+    results = [
+        {key: job.get(key) for key in ('topic', 'requested', 'source', 'file', 'error', 'timings')}
+        for job in jobs.values()
+    ]
+    elapsed = time.perf_counter() - start
+    print_batch_report(results, elapsed)
+    return results
+
+def print_batch_report(results, elapsed):
+    """Print the per-job timing report"""
+    print(f"\n{'topic':<32}{'source':<10}{'llm s':>8}{'build s':>9}{'write s':>9}{'total s':>9}  file")
+    for job in results:
+        timings = job['timings']
+        print(f"{job['topic'][:31]:<32}{job['source'] or '-':<10}{timings.get('llm', 0):>8.2f}{timings.get('build', 0):>9.2f}"
+              f"{timings.get('write', 0):>9.2f}{timings.get('total', 0):>9.2f}  {job['file'] or job['error']}")
+    print(f"{len(results)} decks in {elapsed:.1f} s ({len(results) / elapsed * 60:.1f} decks/min)")
+
+def run_batch_file(path, llm_workers=2):
+    """Generate a deck for every topic in a file (one per line) and save the timing report"""
+    with open(path, 'r', encoding='utf-8') as f:
+        topics = [line for line in f.read().splitlines() if line.strip() and not line.startswith('#')]
+    
+    results = generate_presentations(topics, llm_workers=llm_workers)
+    
+    os.makedirs("presentations", exist_ok=True)
+    with open(os.path.join("presentations", "batch_report.json"), 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    return results
+
 def main():
     """Main execution function"""
     
@@ -521,25 +1006,35 @@ def main():
     print(f"\n🚀 Creating presentation: '{topic}'")
     print("⏳ This may take 1-2 minutes...\n")
     
-    # Try to get content from LLaMA
+    # Slides are built, and their charts rendered, as the outline streams in from LLaMA
     print("🤖 Querying LLaMA for content...")
-    content = query_ollama_structured(topic)
+    builder = PresentationBuilder(topic)
     
-    if content:
+    try:
+        for slide in stream_slides(topic):
+            builder.add_slide(slide)
+            print(f"📄 Slide {len(builder.slides)}: {slide['title']}")
+    except Exception as e:
+        print(f"Connection error: {e}")
+    
+    if builder.slides:
         print("✅ Content generated successfully")
-        slides = parse_slides_improved(content)
-        print(f"📋 Parsed {len(slides)} slides")
+        for slide in pad_slides(list(builder.slides))[len(builder.slides):]:
+            builder.add_slide(slide)
+        print(f"📋 Parsed {len(builder.slides)} slides")
     else:
         print("⚠️  LLaMA unavailable, using professional template")
-        slides = create_fallback_presentation(topic)
-        print(f"📋 Created {len(slides)} template slides")
+        for slide in create_fallback_presentation(topic):
+            builder.add_slide(slide)
+        print(f"📋 Created {len(builder.slides)} template slides")
+    slides = builder.slides
     
     # Create presentation
     print("\n🎨 Building PowerPoint presentation...")
     print("📊 Adding professional charts and formatting...")
     
     try:
-        output_file = create_professional_presentation(slides, topic)
+        output_file = builder.save()
         
         print(f"\n🎉 SUCCESS! Presentation created")
         print(f"📁 File: {output_file}")
@@ -566,7 +1061,194 @@ def main():
     
     return True
 
+def benchmark_decks_per_minute(pool_sizes=(0, 1, 2, 4), decks=6):
+    """Build fallback decks at each chart pool size and report decks per minute"""
+    global CHART_CACHE_DIR
+    import tempfile
+    
+    topics = ["Business Strategy", "Climate and Environment", "Digital Technology", "Healthcare Systems"]
+    results = {}
+    cache_dir = CHART_CACHE_DIR
+    
+    sizes = {}
+    
+    def build_decks(workers, output_dir, cold, backend='matplotlib'):
+        global CHART_CACHE_DIR
+        start = time.perf_counter()
+        for n in range(decks):
+            if cold:
+                # Every deck starts with empty chart caches, so all its charts are rendered
+                clear_chart_cache()
+                CHART_CACHE_DIR = tempfile.mkdtemp(dir=output_dir)
+            topic = topics[n % len(topics)]
+            filename = create_professional_presentation(create_fallback_presentation(topic), topic,
+                                                        chart_workers=workers, output_dir=output_dir,
+                                                        chart_backend=backend)
+            sizes[backend] = os.path.getsize(filename)
+        return decks / (time.perf_counter() - start) * 60
+    
+    try:
+        with tempfile.TemporaryDirectory() as output_dir:
+            for workers in pool_sizes:
+                if workers > 0:
+                    # Start the workers up front so process spawn is not counted
+                    list(get_chart_pool(workers).map(abs, range(workers)))
+                results[workers] = build_decks(workers, output_dir, cold=True)
+            
+            # Repeat decks with the charts already cached
+            results['cached'] = build_decks(0, output_dir, cold=False)
+            
+            # Native PowerPoint charts need no rendering
+            results['native'] = build_decks(0, output_dir, cold=False, backend='native')
+    finally:
+        CHART_CACHE_DIR = cache_dir
+        clear_chart_cache()
+    
+    print(f"\n{'chart workers':<15}{'decks/min':>10}")
+    for workers, rate in results.items():
+        print(f"{workers if workers != 0 else 'in process':<15}{rate:>10.1f}")
+    for backend, size in sizes.items():
+        print(f"{backend} charts: {size / 1024:.0f} KB per deck")
+    return results
+
+def benchmark_parser(slides=100, repeats=20):
+    """Time parsing a large outline in one piece and streamed in small chunks"""
+    header_styles = ["SLIDE {n}: Topic area {n}", "**SLIDE {n}: Topic area {n}**", "{n}. Topic area {n}", "## Topic area {n}"]
+    lines = []
+    for n in range(1, slides + 1):
+        lines.append(header_styles[n % len(header_styles)].format(n=n))
+        for k in range(4):
+            lines.append(f"- Key point {k + 1} about topic area {n}, with some supporting detail")
+            if k % 2 == 0:
+                lines.append(f"    - Nested detail {k + 1} for topic area {n}")
+        lines.append("")
+    outline = "\n".join(lines)
+    
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parser = SlideStreamParser()
+        parsed = parser.feed(outline) + parser.close()
+    whole = (time.perf_counter() - start) / repeats
+    
+    start = time.perf_counter()
+    for _ in range(repeats):
+        parser = SlideStreamParser()
+        for i in range(0, len(outline), 12):  # Ollama-sized pieces
+            parser.feed(outline[i:i + 12])
+        parser.close()
+    streamed = (time.perf_counter() - start) / repeats
+    
+    print(f"{len(parsed)} slides, {len(lines)} lines, {len(outline) / 1024:.0f} KB")
+    print(f"Whole outline: {whole * 1000:.2f} ms ({len(lines) / whole:,.0f} lines/s)")
+    print(f"Streamed in 12-character pieces: {streamed * 1000:.2f} ms")
+    return whole, streamed
+
+def start_stub_ollama(outline, chunk_size=12, delay=0.02):
+    """Serve a fixed outline as a streaming Ollama /api/generate on a local port, returning its URL"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    
+    class StubOllama(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get('Content-Length', 0)))
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/x-ndjson')
+            self.end_headers()
+            
+            for start in range(0, len(outline), chunk_size):
+                time.sleep(delay)
+                line = json.dumps({"response": outline[start:start + chunk_size], "done": False}) + "\n"
+                self.wfile.write(line.encode('utf-8'))
+                self.wfile.flush()
+            self.wfile.write(b'{"response": "", "done": true}\n')
+        
+        def log_message(self, *args):
+            pass
+    
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubOllama)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}"
+
+def benchmark_streaming(chunk_size=12, delay=0.02):
+    """Compare time to first slide with streaming against waiting for the whole outline"""
+    slides = create_fallback_presentation("Streaming Benchmark")
+    outline = "\n".join(
+        f"SLIDE {slide['number']}: {slide['title']}\n" + "\n".join(f"- {point}" for point in slide['points'])
+        for slide in slides
+    )
+    url = start_stub_ollama(outline, chunk_size, delay)
+    
+    start = time.perf_counter()
+    first = None
+    for slide in stream_slides("Streaming Benchmark", url):
+        first = first or time.perf_counter() - start
+    streamed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    parse_slides_improved(query_ollama_structured("Streaming Benchmark", url))
+    buffered = time.perf_counter() - start
+    
+    print(f"First slide after {first:.2f} s streaming vs {buffered:.2f} s waiting for the whole outline ({streamed:.2f} s to the last slide)")
+    return first, buffered
+
+def benchmark_import(runs=5):
+    """Time a cold import of this module with python -X importtime, with and without loading its heavy libraries"""
+    import subprocess
+    
+    here = os.path.dirname(os.path.abspath(__file__))
+    module = os.path.splitext(os.path.basename(__file__))[0]
+    cases = {
+        "import only": f"import {module}",
+        "import + first use": f"import {module}; {module}.load_pptx(); {module}.load_matplotlib(); {module}.get_session()",
+    }
+    
+    for name, code in cases.items():
+        totals = []
+        for _ in range(runs):
+            result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=here, capture_output=True, text=True)
+            # Lines are "import time: self [us] | cumulative | imported package"; top-level imports are not indented,
+            # and those up to this module's line are the interpreter's own startup
+            modules = {}
+            for line in result.stderr.splitlines():
+                fields = line.split("|")
+                if len(fields) == 3 and fields[1].strip().isdigit() and not fields[2].startswith("  "):
+                    package = fields[2].strip()
+                    if package == module:
+                        modules.clear()
+                    modules[package] = int(fields[1])
+            totals.append((sum(modules.values()), modules))
+        
+        total, modules = sorted(totals, key=lambda run: run[0])[runs // 2]  # Median run
+        heaviest = sorted(modules.items(), key=lambda item: -item[1])[:5]
+        print(f"{name}: {total / 1000:.1f} ms")
+        for package, micros in heaviest:
+            print(f"    {package:<28} {micros / 1000:7.1f} ms")
+
 if __name__ == "__main__":
+    if "--native-charts" in sys.argv:
+        CHART_BACKEND = 'native'
+    
+    if "--benchmark" in sys.argv:
+        benchmark_decks_per_minute()
+        sys.exit(0)
+    
+    if "--batch" in sys.argv:
+        # python PresentationGenerator.py --batch topics.txt [--workers N]
+        workers = int(sys.argv[sys.argv.index("--workers") + 1]) if "--workers" in sys.argv else 2
+        run_batch_file(sys.argv[sys.argv.index("--batch") + 1], llm_workers=workers)
+        sys.exit(0)
+    
+    if "--benchmark-parser" in sys.argv:
+        benchmark_parser()
+        sys.exit(0)
+    
+    if "--benchmark-import" in sys.argv:
+        benchmark_import()
+        sys.exit(0)
+    
+    if "--benchmark-stream" in sys.argv:
+        benchmark_streaming()
+        sys.exit(0)
+    
     success = main()
     if success:
         print("\n🎯 Presentation generation completed successfully!")
@@ -0,0 +1,123 @@
+# Prompt assembly for the repeated LLM calls.
+# The static part of a prompt (system prompt, preamble, example chat history) is built, and its size measured, once.
+# Each call only adds the chat history and then, last, the volatile parts such as the date and time or
+# search results, so the prompt prefix stays byte-identical between calls and providers that cache prompt
+# prefixes (Groq does so automatically) can reuse it. Every call is logged with the bytes of prompt sent,
+# the time until the provider answered and until the first token, and the cached prompt tokens if reported.
+
+from collections import deque, defaultdict  # Import containers for the bounded call log.
+import json                                  # Import json to serialize the prompts.
+import time                                  # Import time to measure call latency.
+
+# Number of recent calls kept in the log.
+PromptLogSize = 200
+
+# Recent calls, newest last: {"name", "static_bytes", "dynamic_bytes", "answer_ms", "first_token_ms", "total_ms", "cached_tokens"}.
+PromptLog = deque(maxlen=PromptLogSize)
+
+# Function to get the size of a value serialized as a JSON request body.
+def SerializedSize(value):
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+# Function to wrap volatile text as a trailing system message.
+def SystemMessage(content):
+    return {"role": "system", "content": content}
+
+# The static leading part of a prompt, built once and shared by every call.
+class PromptPrefix:
+
+    def __init__(self, name, messages=(), **fields):
+        self.name = name
+        self.messages = tuple(messages)  # Leading chat messages, e.g. the system prompt.
+        self.fields = fields             # Other static request fields, e.g. a Cohere preamble and chat history.
+        self.size = SerializedSize([list(self.messages), self.fields])  # Measured once, as it never changes.
+
+    # Function to get the messages of a call: the static prefix, the chat history, then the volatile parts.
+    def Messages(self, history, *volatile):
+        return [*self.messages, *history, *(SystemMessage(content) for content in volatile if content)]
+
+    # Function to start timing a call sending these messages, or this message next to the static fields.
+    def Call(self, messages):
+        return PromptCall(self, messages)
+
+# One timed LLM call, used as a context manager around the request and its stream.
+class PromptCall:
+
+    def __init__(self, prefix, messages):
+        self.prefix = prefix
+        dynamic = messages[len(prefix.messages):] if isinstance(messages, list) else messages
+        self.dynamic_bytes = SerializedSize(dynamic)
+        self.started = None
+        self.answered = None
+        self.first_token = None
+        self.cached_tokens = None
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    # Function to mark the provider answering, i.e. the stream opening or its first event.
+    def Answered(self):
+        if self.answered is None:
+            self.answered = time.perf_counter()
+
+    # Function to mark a generated token.
+    def Token(self):
+        self.Answered()
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+
+    # Function to note the cached prompt tokens from a Groq stream chunk, when reported.
+    def Usage(self, chunk):
+        usage = getattr(getattr(chunk, "x_groq", None), "usage", None) or getattr(chunk, "usage", None)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None)
+        if cached is not None:
+            self.cached_tokens = cached
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        PromptLog.append({
+            "name": self.prefix.name,
+            "static_bytes": self.prefix.size,
+            "dynamic_bytes": self.dynamic_bytes,
+            "answer_ms": (self.answered - self.started) * 1000 if self.answered else None,
+            "first_token_ms": (self.first_token - self.started) * 1000 if self.first_token else None,
+            "total_ms": (end - self.started) * 1000,
+            "cached_tokens": self.cached_tokens,
+        })
+        return False
+
+# Function to summarise the logged calls per prompt as averages.
+def PromptSummary():
+    calls = defaultdict(list)
+    for entry in list(PromptLog):
+        calls[entry["name"]].append(entry)
+
+    summary = {}
+    for name, entries in calls.items():
+        def Mean(key):
+            values = [entry[key] for entry in entries if entry[key] is not None]
+            return sum(values) / len(values) if values else None
+        summary[name] = {
+            "count": len(entries),
+            "static_bytes": entries[-1]["static_bytes"],
+            "dynamic_bytes": Mean("dynamic_bytes"),
+            "answer_ms": Mean("answer_ms"),
+            "first_token_ms": Mean("first_token_ms"),
+            "total_ms": Mean("total_ms"),
+            "cached_tokens": Mean("cached_tokens"),
+        }
+    return summary
+
+# Function to print the per-prompt summary.
+def PrintPromptSummary():
+    def Format(value, unit=""):
+        return "-" if value is None else f"{value:.1f}{unit}"
+
+    for name, stats in sorted(PromptSummary().items()):
+        print(
+            f"{name:<10} n={stats['count']:<4} static={stats['static_bytes']} B dynamic={Format(stats['dynamic_bytes'], ' B')} "
+            f"answer={Format(stats['answer_ms'], ' ms')} first token={Format(stats['first_token_ms'], ' ms')} "
+            f"total={Format(stats['total_ms'], ' ms')} cached tokens={Format(stats['cached_tokens'])}"
+        )
@@ -1,8 +1,11 @@
 from googlesearch import search
 from groq import Groq   # Importing the Groq library to use its API
-from json import load, dump  # Importing functions to read and write JSON file.
 import datetime  # Importing the datetime module for real-time date and time information
 from dotenv import dotenv_values  # importing dotenv_values to read environment variables from a .env file.
+from Backend.Tracer import Span, Traced  # importing the tracer to time each stage of a turn.
+from Backend.Cassette import HttpxClient  # importing the record-and-replay layer for API calls.
+from Backend.Prompt import PromptPrefix  # importing the prompt assembly layer to reuse the static prompt.
+from Backend.Session import GetSession  # importing the per-session chat history.
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -13,10 +16,7 @@ Assistantname = env_vars.get("Assistantname")
 GroqAPIKey = env_vars.get("GroqAPIKey")
 
 # Initialize the Groq client with the provided API key.
-client = Groq(api_key=GroqAPIKey)
-
-# Initialize an empty list to store chat messages.
-#messages = []
+client = Groq(api_key=GroqAPIKey, http_client=HttpxClient())
 
 # Define the system instructions for the chatbot.
 System = f"""Hello, I am {Username}, You are a very accurate and advanced AI chatbot named {Assistantname} which has real-time up-to-date information from the internet.
@@ -24,15 +24,11 @@ System = f"""Hello, I am {Username}, You are a very accurate and advanced AI cha
 *** Just answer the question from the provided data in a professional way. ***"""
 
 
-# Try to load the chat log from a JSON file, or create an empty one if it doesn't exist.
-try:
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-except:
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump([], f)
-    
+# Load the chat log of the default session, or create an empty one if it doesn't exist.
+GetSession()
+
 # Functuon to perform a Google search and format tyje results.
+@Traced("realtime.search")
 def GoogleSearch(query):
     results = list(search(query, advanced=True, num_results=5))
     Answer = f"The search results for '{query}' are :\n[start]\n"
@@ -58,6 +54,9 @@ SystemChatBot = [
     {"role": "assistant", "content": "Hello, how can i help you?"}
 ]
 
+# The static prompt prefix, shared by every call; search results and real-time information go last so it stays cacheable.
+RealtimePrompt = PromptPrefix("realtime", SystemChatBot)
+
 # Function to get real-time information like the current date and time.
 def Information():
     data = ""
@@ -119,18 +118,13 @@ def RealtimeSearchEngine(prompt):
     SystemChatBot.pop()
     return AnswerModifier(Answer=Answer)
 """
-def RealtimeSearchEngine(prompt):
-    global SystemChatBot, messages
+@Traced("realtime")
+def RealtimeSearchEngine(prompt, session=None, on_token=None):
+    session = session or GetSession()
 
-    # Load the chat log from the JSON file
-    with open(r"Data\ChatLog.json", "r") as f:
-        messages = load(f)
-    
-    # Limit the chat history to reduce token count
+    # Take a snapshot of the chat history, limited to reduce token count
     # Only keep the most recent messages (e.g., last 5)
-    if len(messages) > 5:
-        messages = messages[-5:]
-        
+    messages = session.History(limit=5)
     messages.append({"role": "user", "content": f"{prompt}"})
 
     # Add Google search results to the system chatbot messages
@@ -138,26 +132,33 @@ def RealtimeSearchEngine(prompt):
     # Truncate search results if they're too long
     if len(search_results) > 1000:
         search_results = search_results[:1000] + "...[results truncated to save tokens]"
-    
-    SystemChatBot.append({"role": "system", "content": search_results}) 
+
+    # Search results and real-time information follow the chat history
+    prompt_messages = RealtimePrompt.Messages(messages, search_results, Information())
 
     try:
         # Generate a response using the Groq client
-        completion = client.chat.completions.create(
-            model = "llama3-70b-8192",
-            messages=SystemChatBot + [{"role": "system", "content": Information()}] + messages,
-            temperature=0.7,
-            max_tokens=1024,  # Reduced from 2048 to save tokens
-            top_p=1,
-            stream = True,
-            stop = None
-        )
-
-        Answer = ""
-        # Concatenate response chunks from the streaming output
-        for chunk in completion:
-            if chunk.choices[0].delta.content:
-                Answer += chunk.choices[0].delta.content
+        with Span("realtime.llm", model="llama3-70b-8192"), RealtimePrompt.Call(prompt_messages) as call:
+            completion = client.chat.completions.create(
+                model = "llama3-70b-8192",
+                messages=prompt_messages,
+                temperature=0.7,
+                max_tokens=1024,  # Reduced from 2048 to save tokens
+                top_p=1,
+                stream = True,
+                stop = None
+            )
+
+            call.Answered()
+            Answer = ""
+            # Concatenate response chunks from the streaming output
+            for chunk in completion:
+                call.Usage(chunk)
+                if chunk.choices[0].delta.content:
+                    call.Token()
+                    Answer += chunk.choices[0].delta.content
+                    if on_token:  # Pass each streamed piece on, e.g. to a server client
+                        on_token(chunk.choices[0].delta.content)
         
     except Exception as e:
         # Handle API errors
@@ -168,14 +169,10 @@ def RealtimeSearchEngine(prompt):
     
     # Clean up the response
     Answer = Answer.strip().replace("</s>", "")
-    messages.append({"role": "assistant", "content": Answer})
 
-    # Save the updated chat log back to the JSON file
-    with open(r"Data\ChatLog.json", "w") as f:
-        dump(messages, f, indent = 4)
+    # Record the query with the answer in the session, which saves its chat log
+    session.Record(messages[-1], {"role": "assistant", "content": Answer})
     
-    # Remove the most recent system message from the chatbot conversation
-    SystemChatBot.pop()
     return AnswerModifier(Answer=Answer)
 
 # Main entry point of the program for interactive querying
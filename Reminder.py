@@ -0,0 +1,301 @@
+import heapq                         # Import heapq for the timer heap.
+import threading                     # Import threading for the scheduler thread.
+import datetime                      # Import datetime for parsing reminder times.
+import json                          # Import json to persist reminders.
+import time                          # Import time for timestamps.
+import re                            # Import re for the natural-language parser.
+from Backend.CommandRegistry import Commands  # Import the shared command registry.
+
+# Path of the persistent reminder store.
+RemindersPath = r"Data\Reminders.json"
+
+# Hour used when a reminder names a day but no time.
+DefaultReminderHour = 9
+
+Months = ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"]
+Weekdays = ["monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday"]
+
+# Seconds between occurrences for each recurrence word.
+RepeatSeconds = {
+    "minute": 60,
+    "hour": 60 * 60,
+    "hourly": 60 * 60,
+    "day": 24 * 60 * 60,
+    "daily": 24 * 60 * 60,
+    "week": 7 * 24 * 60 * 60,
+    "weekly": 7 * 24 * 60 * 60,
+}
+
+# Patterns recognised by the parser; each matched span is removed from the reminder message.
+RepeatPattern = re.compile(r"\bevery\s+(minute|hour|day|week|" + "|".join(Weekdays) + r")\b|\b(hourly|daily|weekly)\b")
+RelativePattern = re.compile(r"\bin\s+(\d+)\s*(second|sec|minute|min|hour|hr|day)s?\b")
+TimePattern = re.compile(r"(?:\bat\s+)?\b(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<meridiem>am|pm|a\.m\.|p\.m\.)(?![a-z])"
+                         r"|(?:\bat\s+)?\b(?P<hour24>\d{1,2}):(?P<minute24>\d{2})\b")
+BareTimePattern = re.compile(r"\bat\s+(?P<bare>\d{1,2})\b(?!\s*(?:st|nd|rd|th)\b)")  # Only tried when TimePattern finds nothing.
+DayMonthPattern = re.compile(r"\b(\d{1,2})(?:st|nd|rd|th)?\s+(?:of\s+)?(" + "|".join(Months) + r")[a-z]*\b")
+MonthDayPattern = re.compile(r"\b(" + "|".join(Months) + r")[a-z]*\s+(\d{1,2})(?:st|nd|rd|th)?\b")
+DayWordPattern = re.compile(r"\b(today|tonight|tomorrow|" + "|".join(Weekdays) + r")\b")
+FillerPattern = re.compile(r"^(?:(?:remind me|set a reminder|reminder|that|to|for|about|at|on|of|,)\s+)+|(?:\s+(?:at|on|to|for|,))+$")
+
+# Function to parse a natural-language reminder into (due datetime, message, repeat seconds or None).
+def ParseReminder(text, now=None):
+    now = now or datetime.datetime.now()
+    text = text.strip().strip("()").strip()
+    lowered = text.lower()
+    spans = []  # Character spans consumed by date, time and recurrence expressions.
+
+    repeat = None
+    weekday = None
+    match = RepeatPattern.search(lowered)
+    if match:
+        word = match.group(1) or match.group(2)
+        if word in Weekdays:
+            repeat = RepeatSeconds["week"]
+            weekday = Weekdays.index(word)
+        else:
+            repeat = RepeatSeconds[word]
+        spans.append(match.span())
+
+    due = None
+    match = RelativePattern.search(lowered)
+    if match:
+        amount, unit = int(match.group(1)), match.group(2)
+        unit = {"sec": "second", "min": "minute", "hr": "hour"}.get(unit, unit)
+        due = now + datetime.timedelta(**{unit + "s": amount})
+        spans.append(match.span())
+
+    hour = minute = None
+    match = TimePattern.search(lowered) or BareTimePattern.search(lowered)
+    if match:
+        if match.re is BareTimePattern:
+            hour, minute = int(match.group("bare")), 0
+        elif match.group("meridiem"):
+            hour, minute = int(match.group("hour")) % 12, int(match.group("minute") or 0)
+            if match.group("meridiem").startswith("p"):
+                hour += 12
+        else:
+            hour, minute = int(match.group("hour24")), int(match.group("minute24"))
+        if hour > 23 or minute > 59:
+            hour = minute = None
+        else:
+            spans.append(match.span())
+
+    date = None
+    explicit_date = False
+    match = DayMonthPattern.search(lowered) or MonthDayPattern.search(lowered)
+    if match:
+        day, month = match.groups() if match.re is DayMonthPattern else match.groups()[::-1]
+        try:
+            date = datetime.date(now.year, Months.index(month[:3]) + 1, int(day))
+            explicit_date = True
+            spans.append(match.span())
+        except ValueError:
+            pass
+
+    if date is None:
+        match = DayWordPattern.search(lowered)
+        if match:
+            word = match.group(1)
+            if word in ("today", "tonight"):
+                date = now.date()
+                if word == "tonight" and hour is not None and hour < 12:
+                    hour += 12
+            elif word == "tomorrow":
+                date = now.date() + datetime.timedelta(days=1)
+            else:
+                weekday = Weekdays.index(word)
+            spans.append(match.span())
+
+    if weekday is not None and date is None:
+        date = now.date() + datetime.timedelta(days=(weekday - now.weekday()) % 7)
+
+    if due is None:
+        if hour is None and date is None:
+            if repeat is None:
+                return None  # Nothing that looks like a time.
+            due = now + datetime.timedelta(seconds=repeat)
+        else:
+            if hour is None:
+                hour, minute = DefaultReminderHour, 0
+            due = datetime.datetime.combine(date or now.date(), datetime.time(hour, minute))
+
+            # Push times that already passed to their next occurrence.
+            if due <= now:
+                if explicit_date:
+                    due = due.replace(year=due.year + 1)
+                elif weekday is not None:
+                    due += datetime.timedelta(days=7)
+                elif repeat is not None and repeat < RepeatSeconds["day"]:
+                    due += datetime.timedelta(seconds=repeat * ((now - due) // datetime.timedelta(seconds=repeat) + 1))
+                else:
+                    due += datetime.timedelta(days=1)
+
+    # Whatever is left after removing the date and time expressions is the message.
+    # Spans may overlap (e.g. "every monday" and "monday"), so blank out each covered character.
+    message = "".join(" " if any(start <= index < end for start, end in spans) else char for index, char in enumerate(text))
+    message = " ".join(message.split())
+    previous = None
+    while previous != message:
+        previous = message
+        message = FillerPattern.sub("", message).strip()
+
+    return due, message or "Reminder", repeat
+
+# Single-thread scheduler keeping every pending reminder in one heap ordered by due time.
+class ReminderScheduler:
+
+    def __init__(self, path=RemindersPath):
+        self.path = path
+        self.reminders = {}                  # Pending reminders by id.
+        self.heap = []                       # (due timestamp, id) pairs; stale pairs are skipped lazily.
+        self.next_id = 1
+        self.callback = print                # Called with the message when a reminder fires.
+        self.condition = threading.Condition()
+        self.dirty = False                   # True when the store needs saving.
+        self.thread = None
+        self.Load()
+
+    # Function to load reminders from the persistent store.
+    def Load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        for reminder in stored:
+            self.reminders[reminder["id"]] = reminder
+            self.heap.append((reminder["due"], reminder["id"]))
+            self.next_id = max(self.next_id, reminder["id"] + 1)
+        heapq.heapify(self.heap)
+
+    # Function to save reminders to the persistent store.
+    def Save(self):
+        try:
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(list(self.reminders.values()), f, indent=4)
+        except OSError as e:
+            print(f"Could not save reminders: {e}")
+
+    # Function to add a reminder and return its id.
+    def Add(self, due, message, repeat=None):
+        with self.condition:
+            reminder = {"id": self.next_id, "due": due.timestamp(), "message": message, "repeat": repeat}
+            self.next_id += 1
+            self.reminders[reminder["id"]] = reminder
+            heapq.heappush(self.heap, (reminder["due"], reminder["id"]))
+            self.dirty = True
+            self.condition.notify()  # Wake the scheduler in case this is now the earliest reminder.
+        return reminder["id"]
+
+    # Function to cancel a reminder by id.
+    def Remove(self, reminder_id):
+        with self.condition:
+            if self.reminders.pop(reminder_id, None) is None:
+                return False
+            self.dirty = True
+            self.condition.notify()
+        return True
+
+    # Function to start the scheduler thread, firing reminders through the callback.
+    def Start(self, callback=None):
+        if callback is not None:
+            self.callback = callback
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.Run, name="ReminderScheduler", daemon=True)
+            self.thread.start()
+
+    # Scheduler loop: sleep until the earliest reminder is due, fire it, and reschedule repeats.
+    def Run(self):
+        while True:
+            due = []
+
+            with self.condition:
+                while True:
+                    # Drop heap entries of removed or rescheduled reminders.
+                    while self.heap and self.reminders.get(self.heap[0][1], {}).get("due") != self.heap[0][0]:
+                        heapq.heappop(self.heap)
+
+                    now = time.time()
+                    if self.heap and self.heap[0][0] <= now:
+                        break
+                    if self.dirty:
+                        self.Save()
+                        self.dirty = False
+                    self.condition.wait(self.heap[0][0] - now if self.heap else None)
+
+                while self.heap and self.heap[0][0] <= now:
+                    _, reminder_id = heapq.heappop(self.heap)
+                    reminder = self.reminders.get(reminder_id)
+                    if reminder is None or reminder["due"] > now:
+                        continue
+                    due.append(reminder["message"])
+
+                    if reminder["repeat"]:
+                        # Skip occurrences missed while the assistant was not running.
+                        missed = (now - reminder["due"]) // reminder["repeat"] + 1
+                        reminder["due"] += missed * reminder["repeat"]
+                        heapq.heappush(self.heap, (reminder["due"], reminder_id))
+                    else:
+                        del self.reminders[reminder_id]
+                self.dirty = True
+
+            for message in due:
+                try:
+                    self.callback(message)
+                except Exception as e:
+                    print(f"Error firing reminder: {e}")
+
+# The shared scheduler instance.
+Scheduler = ReminderScheduler()
+
+# Function to set a reminder from a "reminder (...)" decision.
+def SetReminder(text):
+    parsed = ParseReminder(text)
+    if parsed is None:
+        print(f"Could not understand the reminder: {text}")
+        return False
+
+    due, message, repeat = parsed
+    Scheduler.Add(due, message, repeat)
+    print(f"Reminder set for {due.strftime('%d %B %Y %I:%M %p')}: {message}")
+    return True
+
+# Function to start firing reminders through the given callback.
+def StartReminders(callback):
+    Scheduler.Start(callback)
+
+Commands.Register("reminder", SetReminder, automation=True)
+
+# Main entry point for trying the parser interactively.
+# Reminders with the time and message they should parse to, as in the decision-making model's examples.
+ParserExamples = [
+    ("set a reminder at 9:30pm on 25th june for assignment submission", (21, 30), "assignment submission"),
+    ("remind me at 10:30 to call", (10, 30), "call"),
+    ("every day at 6:45am walk", (6, 45), "walk"),
+    ("at 7 pm dinner", (19, 0), "dinner"),
+    ("at 7 dinner", (7, 0), "dinner"),
+    ("remind me on 5th march at 8 to pay rent", (8, 0), "pay rent"),
+    ("remind me to drink water every day at 10am", (10, 0), "drink water"),
+    ("every monday at 9am standup", (9, 0), "standup"),
+]
+
+# Function to check the parser against the examples, returning the ones it gets wrong.
+def CheckParser():
+    now = datetime.datetime(2024, 1, 1, 12, 0)
+    failures = []
+    for text, (hour, minute), message in ParserExamples:
+        due, parsed_message, _ = ParseReminder(text, now)
+        if (due.hour, due.minute) != (hour, minute) or parsed_message != message:
+            failures.append((text, due, parsed_message))
+            print(f"FAIL {text!r}: {due:%H:%M} {parsed_message!r}, expected {hour:02d}:{minute:02d} {message!r}")
+    print(f"{len(ParserExamples) - len(failures)}/{len(ParserExamples)} reminder examples parsed correctly")
+    return failures
+
+# Main entry point: check the parser against its examples, or parse reminders typed in.
+if __name__ == "__main__":
+    import sys
+    if "check" in sys.argv:
+        sys.exit(1 if CheckParser() else 0)
+    while True:
+        print(ParseReminder(input("Enter a reminder: ")))
@@ -0,0 +1,380 @@
+# Local API server driving the assistant backends for several clients at once.
+#
+#     python -m Backend.Server [--host 127.0.0.1] [--port 8765] [--workers 8] [--queue 32]
+#
+# Each client talks in a named session with its own chat history (Backend.Session). A turn runs the
+# decision model and then the chatbot or the realtime search, streaming the answer as it is generated
+# and, if asked for, the synthesized speech:
+#
+#     POST   /sessions/<name>/turns   {"query": "...", "speech": false}, answered with one JSON event per line
+#     GET    /sessions/<name>/ws      WebSocket; send {"query": ..., "speech": ...}, receive the events
+#     DELETE /sessions/<name>         forget the session
+#     GET    /status                  turns running and waiting, sessions, stage and prompt statistics
+#
+# Events: {"type": "decision", "tasks": [...]}, {"type": "skipped", "tasks": [...]}, {"type": "token", "text": ...},
+# {"type": "answer", "text": ...}, {"type": "audio", "data": base64 MP3 chunk}, {"type": "done", "seconds": ...}
+# and {"type": "error", "message": ..., "status": ...}.
+#
+# Blocking backend calls run on one shared thread pool. Admission control lets ServerWorkers turns run
+# and ServerQueue more wait; a turn beyond that is refused at once (HTTP 503, or an error event on a
+# WebSocket) rather than queued without bound. Turns of one session run one after another.
+# Automation commands act on the machine the server runs on, so they only run with ServerAutomation=True;
+# image generation and reminders are left to the desktop assistant.
+
+from concurrent.futures import ThreadPoolExecutor  # Import a thread pool for the blocking backend calls.
+from dotenv import dotenv_values                    # Import dotenv to read the server settings.
+import contextvars                                  # Import contextvars so traced spans nest across the pool.
+import functools                                    # Import functools to bind the worker calls.
+import argparse                                     # Import argparse for the command line options.
+import weakref                                      # Import weakref for the per-session turn locks.
+import asyncio                                      # Import asyncio for the server.
+import hashlib                                      # Import hashlib for the WebSocket handshake.
+import base64                                       # Import base64 to send audio chunks as JSON.
+import struct                                       # Import struct to read and write WebSocket frames.
+import json                                         # Import json for requests and events.
+import time                                         # Import time to measure turns.
+from Backend.Model import FirstLayerDMM, AnswerDecision  # Import the decision model and the answer dispatch.
+from Backend.TextToSpeech import SpeechAudio         # Import the streamed speech synthesis.
+from Backend.CommandRegistry import Commands         # Import the shared command registry.
+from Backend.Session import GetSession, DropSession, Sessions  # Import the per-session chat histories.
+from Backend.Tracer import Span, StageSummary        # Import the tracer to time each stage of a turn.
+from Backend.Prompt import PromptSummary             # Import the prompt statistics.
+
+# Load environment variables from the .env file.
+env_vars = dotenv_values(".env")
+ServerHost = env_vars.get("ServerHost") or "127.0.0.1"
+ServerPort = int(env_vars.get("ServerPort") or 8765)
+ServerWorkers = int(env_vars.get("ServerWorkers") or 8)     # Turns running at once, and pool threads.
+ServerQueue = int(env_vars.get("ServerQueue") or 32)        # Turns allowed to wait for a worker.
+ServerAutomation = str(env_vars.get("ServerAutomation", "False")).lower() == "true"
+
+# Largest request body or WebSocket message accepted, in bytes.
+MaxRequestBytes = 64 * 1024
+
+WebSocketGuid = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+Reasons = {200: "OK", 101: "Switching Protocols", 400: "Bad Request", 404: "Not Found", 413: "Payload Too Large", 503: "Service Unavailable"}
+
+# Raised for a request the server refuses, with the HTTP status to answer with.
+class RequestError(Exception):
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+# Admission control: a bounded number of turns running, and a bounded number waiting.
+# Used as a context manager around a turn, refusing it when the server is full.
+class Admission:
+
+    def __init__(self, workers, queue):
+        self.workers = workers
+        self.limit = workers + queue
+        self.admitted = 0       # Turns running or waiting.
+        self.running = 0
+        self.rejected = 0
+        self.slots = asyncio.Semaphore(workers)
+
+    def __enter__(self):
+        if self.admitted >= self.limit:
+            self.rejected += 1
+            raise RequestError(503, "The assistant is busy, try again shortly.")
+        self.admitted += 1
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.admitted -= 1
+        return False
+
+# The shared worker pool and admission control, created when the server starts.
+WorkerPool = None
+TurnAdmission = None
+
+# Per-session locks so the turns of a session run in order; dropped once no turn holds them.
+SessionLocks = weakref.WeakValueDictionary()
+
+def SessionLock(name):
+    lock = SessionLocks.get(name)
+    if lock is None:
+        lock = SessionLocks[name] = asyncio.Lock()
+    return lock
+
+# Function to run a blocking call on the shared pool, keeping the caller's tracing context.
+async def InWorker(function, *args, **kwargs):
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(WorkerPool, functools.partial(context.run, function, *args, **kwargs))
+
+# Function to run an answering call on the pool, sending its tokens while it streams; function gets the token callback.
+async def StreamAnswer(send, function):
+    loop = asyncio.get_running_loop()
+    tokens = asyncio.Queue()
+
+    def OnToken(text):
+        loop.call_soon_threadsafe(tokens.put_nowait, text)
+
+    def Run():
+        try:
+            return function(OnToken)
+        finally:
+            loop.call_soon_threadsafe(tokens.put_nowait, None)  # Marks the end of the stream.
+
+    job = asyncio.ensure_future(InWorker(Run))
+    while (text := await tokens.get()) is not None:
+        await send({"type": "token", "text": text})
+    return await job
+
+# Function to run one admitted turn of a session once it gets a worker, sending its events.
+async def RunTurn(name, query, speech, send):
+    started = time.perf_counter()
+    async with SessionLock(name), TurnAdmission.slots:
+        TurnAdmission.running += 1
+        try:
+            with Span("server.turn", session=name):
+                await Turn(name, query, speech, send)
+        finally:
+            TurnAdmission.running -= 1
+    await send({"type": "done", "seconds": time.perf_counter() - started})
+
+# Function to run the stages of a turn; mirrors MainExecution in Main.py.
+async def Turn(name, query, speech, send):
+    session = GetSession(name)
+    Decision = await InWorker(FirstLayerDMM, query)
+    await send({"type": "decision", "tasks": Decision})
+
+    tasks = [queries for queries in Decision if Commands.IsAutomation(queries)]
+    if tasks and ServerAutomation:
+        from Backend.Automation import Automation  # Imported here since it drives the desktop.
+        await Automation(list(Decision))
+        tasks = []
+    skipped = tasks + [queries for queries in Decision if queries.startswith(("generate image", "reminder"))]
+    if skipped:
+        await send({"type": "skipped", "tasks": skipped})
+
+    # The same dispatch as MainExecution, with the engines answering in this session and streaming their tokens.
+    def AnswerTurn(on_token):
+        return AnswerDecision(Decision, answer=lambda engine, query: engine(query, session, on_token))
+
+    Answer, _ = await StreamAnswer(send, AnswerTurn)
+
+    if Answer:
+        await send({"type": "answer", "text": Answer})
+        if speech:
+            with Span("server.speech", characters=len(Answer)):
+                async for data in SpeechAudio(Answer):
+                    await send({"type": "audio", "data": base64.b64encode(data).decode("ascii")})
+
+# Function to read a JSON turn request, checking its query.
+def ParseTurn(body):
+    try:
+        request = json.loads(body)
+    except ValueError:
+        raise RequestError(400, "The request is not valid JSON.")
+    query = str(request.get("query") or "").strip() if isinstance(request, dict) else ""
+    if not query:
+        raise RequestError(400, "The request has no query.")
+    return query, bool(request.get("speech"))
+
+# Function to read one HTTP request, returning (method, path, headers, body), or None once the client is gone.
+async def ReadRequest(reader):
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+        return None
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, path, _ = lines[0].split(" ", 2)
+    except ValueError:
+        raise RequestError(400, "Malformed request line.")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise RequestError(400, "Malformed Content-Length.")
+    if length < 0:
+        raise RequestError(400, "Malformed Content-Length.")
+    if length > MaxRequestBytes:
+        raise RequestError(413, "The request is too large.")
+    body = await reader.readexactly(length) if length else b""
+    return method.upper(), path.split("?", 1)[0], headers, body
+
+def WriteHead(writer, status, headers):
+    writer.write(f"HTTP/1.1 {status} {Reasons.get(status, 'Error')}\r\n".encode("latin-1"))
+    writer.write("".join(f"{key}: {value}\r\n" for key, value in headers.items()).encode("latin-1") + b"\r\n")
+
+async def WriteJson(writer, status, value, headers=None):
+    body = json.dumps(value).encode("utf-8")
+    WriteHead(writer, status, {"Content-Type": "application/json", "Content-Length": len(body), **(headers or {})})
+    writer.write(body)
+    await writer.drain()
+
+# Function to answer a turn over HTTP as a chunked stream of JSON lines.
+async def HttpTurn(writer, name, body):
+    query, speech = ParseTurn(body)
+
+    async def Send(event):
+        line = json.dumps(event).encode("utf-8") + b"\n"
+        writer.write(f"{len(line):x}\r\n".encode("ascii") + line + b"\r\n")
+        await writer.drain()
+
+    with TurnAdmission:  # Admitted before the 200 is sent, so a busy server answers 503.
+        WriteHead(writer, 200, {"Content-Type": "application/x-ndjson", "Transfer-Encoding": "chunked", "Cache-Control": "no-cache"})
+        try:
+            await RunTurn(name, query, speech, Send)
+        except Exception as e:
+            print(f"Error in turn of session {name}: {e}")
+            await Send({"type": "error", "message": str(e), "status": 500})
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+# Function to read one WebSocket message, answering pings; returns None once the client closes.
+async def ReadMessage(reader, writer):
+    message = b""
+    while True:
+        first, second = await reader.readexactly(2)
+        opcode, masked, length = first & 0x0F, second & 0x80, second & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", await reader.readexactly(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", await reader.readexactly(8))[0]
+        if len(message) + length > MaxRequestBytes:
+            raise RequestError(413, "The message is too large.")
+        mask = await reader.readexactly(4) if masked else bytes(4)
+        payload = bytes(byte ^ mask[index % 4] for index, byte in enumerate(await reader.readexactly(length)))
+
+        if opcode == 0x8:    # Close
+            WriteFrame(writer, 0x8, payload[:2])
+            return None
+        if opcode == 0x9:    # Ping
+            WriteFrame(writer, 0xA, payload)
+            continue
+        if opcode == 0xA:    # Pong
+            continue
+        message += payload
+        if first & 0x80:     # Final fragment
+            try:
+                return message.decode("utf-8")
+            except UnicodeDecodeError:
+                raise RequestError(400, "The message is not valid UTF-8.")
+
+def WriteFrame(writer, opcode, payload):
+    length = len(payload)
+    if length < 126:
+        header = struct.pack("!BB", 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack("!BBH", 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack("!BBQ", 0x80 | opcode, 127, length)
+    writer.write(header + payload)
+
+# Function to serve a session over a WebSocket, one turn per message.
+async def WebSocketSession(reader, writer, name, headers):
+    key = headers.get("sec-websocket-key")
+    if headers.get("upgrade", "").lower() != "websocket" or not key:
+        raise RequestError(400, "Expected a WebSocket upgrade.")
+    accept = base64.b64encode(hashlib.sha1((key + WebSocketGuid).encode("ascii")).digest()).decode("ascii")
+    WriteHead(writer, 101, {"Upgrade": "websocket", "Connection": "Upgrade", "Sec-WebSocket-Accept": accept})
+    await writer.drain()
+
+    async def Send(event):
+        WriteFrame(writer, 0x1, json.dumps(event).encode("utf-8"))
+        await writer.drain()
+
+    while True:
+        try:
+            message = await ReadMessage(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            return
+        except RequestError as e:
+            await Send({"type": "error", "message": str(e), "status": e.status})
+            WriteFrame(writer, 0x8, struct.pack("!H", 1009 if e.status == 413 else 1007))  # Too big, or invalid data.
+            return
+        if message is None:
+            return
+
+        try:
+            query, speech = ParseTurn(message)
+            with TurnAdmission:
+                await RunTurn(name, query, speech, Send)
+        except RequestError as e:
+            await Send({"type": "error", "message": str(e), "status": e.status})
+        except Exception as e:
+            print(f"Error in turn of session {name}: {e}")
+            await Send({"type": "error", "message": str(e), "status": 500})
+
+# Function to describe the server's load and the backends' recent latency.
+def Status():
+    return {
+        "running": TurnAdmission.running,
+        "admitted": TurnAdmission.admitted,
+        "rejected": TurnAdmission.rejected,
+        "workers": TurnAdmission.workers,
+        "sessions": len(Sessions),
+        "stages": StageSummary(),
+        "prompts": PromptSummary(),
+    }
+
+# Function to serve the requests of one client connection, keeping it alive between requests.
+async def HandleConnection(reader, writer):
+    try:
+        while True:
+            headers = {}
+            try:
+                request = await ReadRequest(reader)
+                if request is None:
+                    return
+                method, path, headers, body = request
+                parts = [part for part in path.split("/") if part]
+
+                if method == "GET" and parts == ["status"]:
+                    await WriteJson(writer, 200, Status())
+                elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "turns" and method == "POST":
+                    await HttpTurn(writer, parts[1], body)
+                elif len(parts) == 3 and parts[0] == "sessions" and parts[2] == "ws" and method == "GET":
+                    await WebSocketSession(reader, writer, parts[1], headers)
+                    return
+                elif len(parts) == 2 and parts[0] == "sessions" and method == "DELETE":
+                    DropSession(parts[1])
+                    await WriteJson(writer, 200, {"dropped": parts[1]})
+                else:
+                    raise RequestError(404, f"No route for {method} {path}.")
+            except RequestError as e:
+                await WriteJson(writer, e.status, {"error": str(e)}, {"Retry-After": 1} if e.status == 503 else None)
+                if not headers:  # The request could not be read, so the connection can't be reused.
+                    return
+
+            if headers.get("connection", "").lower() == "close":
+                return
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+# Function to start the server, creating the shared worker pool and admission control.
+async def StartServer(host=ServerHost, port=ServerPort, workers=ServerWorkers, queue=ServerQueue):
+    global WorkerPool, TurnAdmission
+    WorkerPool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="Server")
+    TurnAdmission = Admission(workers, queue)
+    return await asyncio.start_server(HandleConnection, host, port)
+
+async def Serve(host, port, workers, queue):
+    server = await StartServer(host, port, workers, queue)
+    print(f"Assistant server listening on http://{host}:{port} ({workers} workers, {queue} queued turns)")
+    async with server:
+        await server.serve_forever()
+
+# Main entry point: run the server until interrupted.
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the assistant to several clients over a local HTTP/WebSocket API.")
+    parser.add_argument("--host", default=ServerHost)
+    parser.add_argument("--port", type=int, default=ServerPort)
+    parser.add_argument("--workers", type=int, default=ServerWorkers, help="turns running at once")
+    parser.add_argument("--queue", type=int, default=ServerQueue, help="turns allowed to wait for a worker")
+    options = parser.parse_args()
+    try:
+        asyncio.run(Serve(options.host, options.port, options.workers, options.queue))
+    except KeyboardInterrupt:
+        pass
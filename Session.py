@@ -0,0 +1,97 @@
+# Per-session conversation state shared by the backends.
+# Each session keeps its chat history in a bounded buffer guarded by its own lock, so turns running at the
+# same time (FirstThread, asyncio.to_thread workers) work from consistent snapshots and record a question
+# together with its answer. The default session is persisted to Data\ChatLog.json, which the GUI reads;
+# the log is written to a temporary file and swapped in, so readers never see it half written.
+
+from collections import OrderedDict, deque  # Import containers for the bounded histories and session table.
+from json import load, dump                 # Import functions to read and write the chat log.
+import threading                            # Import threading to guard the sessions.
+import os                                   # Import os for atomic chat log writes.
+
+# Path of the persisted chat log of the default session.
+ChatLogPath = r"Data\ChatLog.json"
+
+# Name of the session used by the voice assistant itself.
+DefaultSession = "default"
+
+# Number of messages kept per session, and number of sessions kept in memory.
+MaxSessionMessages = 200
+MaxSessions = 64
+
+# The chat history of one session.
+class ChatSession:
+
+    def __init__(self, name, path=None, max_messages=MaxSessionMessages):
+        self.name = name
+        self.path = path                            # Chat log file, or None to keep the history in memory.
+        self.messages = deque(maxlen=max_messages)  # Oldest messages are dropped once full.
+        self.lock = threading.Lock()
+        if path:
+            self.Load()
+
+    # Function to load the chat log, creating an empty one if it doesn't exist or can't be read.
+    def Load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.messages.extend(load(f))
+        except (OSError, ValueError):
+            with self.lock:
+                self.messages.clear()
+                self.Write()
+
+    # Function to get a snapshot of the history, or of its last few messages.
+    def History(self, limit=None):
+        with self.lock:
+            messages = list(self.messages)
+        return messages[-limit:] if limit else messages
+
+    # Function to add messages as one step, e.g. a question with its answer, and save the log.
+    def Record(self, *messages):
+        with self.lock:
+            self.messages.extend(messages)
+            self.Write()
+
+    # Function to forget the history and save the empty log.
+    def Reset(self):
+        with self.lock:
+            self.messages.clear()
+            self.Write()
+
+    # Function to write the chat log; called with the lock held.
+    def Write(self):
+        if not self.path:
+            return
+        temp_path = self.path + ".tmp"
+        try:
+            folder = os.path.dirname(self.path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            with open(temp_path, "w", encoding="utf-8") as f:
+                dump(list(self.messages), f, indent=4)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Could not save chat log {self.path}: {e}")
+
+Sessions = OrderedDict()   # name -> ChatSession, least recently used first.
+SessionsLock = threading.Lock()
+
+# Function to get a session by name, creating it on first use; only the default session is persisted.
+def GetSession(name=DefaultSession):
+    with SessionsLock:
+        session = Sessions.get(name)
+        if session is not None:
+            Sessions.move_to_end(name)
+            return session
+
+        session = ChatSession(name, ChatLogPath if name == DefaultSession else None)
+        Sessions[name] = session
+        if len(Sessions) > MaxSessions:
+            # Forget the least recently used session other than the default one.
+            del Sessions[next(key for key in Sessions if key != DefaultSession)]
+        return session
+
+# Function to forget a session.
+def DropSession(name):
+    with SessionsLock:
+        Sessions.pop(name, None)
@@ -5,7 +5,9 @@ from selenium.webdriver.chrome.options import Options
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import dotenv_values
 import os
-import mtranslate as mt
+import time
+from Backend.Translator import Translate, Prefetch
+from Backend.Tracer import Traced
 
 # Load environment variables from the .env file.
 env_vars = dotenv_values(".env")
@@ -23,18 +25,28 @@ HtmlCode = '''<!DOCTYPE html>
     <button id="start" onclick="startRecognition()">Start Recognition</button>
     <button id="end" onclick="stopRecognition()">Stop Recognition</button>
     <p id="output"></p>
+    <p id="interim"></p>
     <script>
         const output = document.getElementById('output');
+        const interim = document.getElementById('interim');
         let recognition;
 
         function startRecognition() {
             recognition = new webkitSpeechRecognition() || new SpeechRecognition();
             recognition.lang = '';
             recognition.continuous = true;
+            recognition.interimResults = true;
 
             recognition.onresult = function(event) {
-                const transcript = event.results[event.results.length - 1][0].transcript;
-                output.textContent += transcript;
+                let interimTranscript = '';
+                for (let i = event.resultIndex; i < event.results.length; i++) {
+                    if (event.results[i].isFinal) {
+                        output.textContent += event.results[i][0].transcript;
+                    } else {
+                        interimTranscript += event.results[i][0].transcript;
+                    }
+                }
+                interim.textContent = interimTranscript;
             };
 
             recognition.onend = function() {
@@ -46,6 +58,7 @@ HtmlCode = '''<!DOCTYPE html>
         function stopRecognition() {
             recognition.stop();
             output.innerHTML = "";
+            interim.innerHTML = "";
         }
     </script>
 </body>
@@ -79,6 +92,18 @@ driver = webdriver.Chrome(service=service, options=chrome_options)
 # Define the path for temporary files.
 TempDirPath = rf"{current_dir}/Frontend/Files"
 
+# Query heard while the assistant was speaking, used as the next turn's input.
+PendingQuery = None
+
+# Barge-in tuning: minimum words to count as speech, the share of words that may come from the
+# assistant's own voice before the text is treated as echo, and how often the page is polled.
+BargeInMinWords = 2
+BargeInEchoOverlap = 0.6
+BargeInPollInterval = 0.05
+
+# How long an interim result must stay unchanged before its translation is started in the background.
+InterimStableSeconds = 0.3
+
 # Function to set the assistant;s status by writing it to a file.
 def SetAssistantStatus(Status):
     with open(rf'{TempDirPath}/Status.data', "w", encoding='utf-8') as file:
@@ -105,18 +130,96 @@ def QueryModifier(Query):
     
     return new_query.capitalize()
 
-# Function to translate text into English using the mtranslate library.
+# Function to translate text into English through the cached translation layer.
+@Traced("translate")
 def UniversalTranslator(Text):
-    english_translation = mt.translate(Text, "en", "auto")
+    english_translation = Translate(Text, "en", "auto")
     return english_translation.capitalize()
 
+# Function to check whether the input language needs translating.
+def IsEnglishInput():
+    return InputLanguage.lower() == "en" or "en" in InputLanguage.lower()
+
+# Function to turn recognized text into a query, translating it if needed.
+def ProcessRecognizedText(Text):
+    # If the input language is English, return the modified query.
+    if IsEnglishInput():
+        return QueryModifier(Text)
+    else:
+        # if the input language is not English, translate the text and return it.
+        SetAssistantStatus("Translating...")
+        return QueryModifier(UniversalTranslator(Text))
+
+# Function to check whether heard text is just the assistant's own voice picked up by the mic.
+def IsEcho(Heard, Speaking):
+    heard_words = Heard.lower().split()
+    speaking_words = set(Speaking.lower().split())
+    if not heard_words:
+        return True
+    overlap = sum(1 for word in heard_words if word in speaking_words) / len(heard_words)
+    return overlap >= BargeInEchoOverlap
+
+# Callable passed to TextToSpeech that keeps listening while the assistant speaks and stops playback on barge-in.
+class BargeInMonitor:
+
+    def __init__(self, Speaking):
+        self.speaking = Speaking
+        self.interrupted = False
+        self.last_poll = 0.0
+        try:
+            # Clear anything heard before playback; recognition keeps running in the page.
+            driver.execute_script("document.getElementById('output').textContent = '';")
+        except Exception:
+            pass
+
+    def __call__(self, r=None):
+        global PendingQuery
+
+        if r is False:  # End-of-playback signal from TTS.
+            return True
+        if self.interrupted:
+            return False
+
+        now = time.monotonic()
+        if now - self.last_poll < BargeInPollInterval:
+            return True
+        self.last_poll = now
+
+        try:
+            Text = driver.find_element(by=By.ID, value="output").text
+        except Exception:
+            return True
+
+        if len(Text.split()) >= BargeInMinWords and not IsEcho(Text, self.speaking):
+            self.interrupted = True
+            PendingQuery = Text
+            driver.execute_script("document.getElementById('output').textContent = '';")
+            return False
+        return True
+
+# Function to check whether a query heard during barge-in is waiting to be the next turn.
+def HasPendingQuery():
+    return bool(PendingQuery)
+
 # Function to perform speech recognition using the WebDriver.
+@Traced("stt")
 def SpeechRecognition():
+    global PendingQuery
+
+    # Use the query heard while the assistant was speaking, if any.
+    if PendingQuery:
+        Text, PendingQuery = PendingQuery, None
+        return ProcessRecognizedText(Text)
+
     # Open the HTML file in the browser.
     driver.get("file:///" + Link)
     #Start speech recognition by clicking the start button.
     driver.find_element(by=By.ID, value="start").click()
 
+    Interim = ""
+    InterimSince = 0.0
+    Prefetched = ""
+
     while True:
         try:
             # Get the recognized text from the HTML output elements.
@@ -125,14 +228,16 @@ def SpeechRecognition():
             if Text:
                 # Stop recognition by clicking the stop button.
                 driver.find_element(by=By.ID, value="end").click()
-
-                # If the input language is English, return the modified query.
-                if InputLanguage.lower() == "en" or "en" in InputLanguage.lower():
-                    return QueryModifier(Text)
-                else:
-                    # if the input language is not English, translate the text and return it.
-                    SetAssistantStatus("Translating...")
-                    return QueryModifier(UniversalTranslator(Text))
+                return ProcessRecognizedText(Text)
+
+            if not IsEnglishInput():
+                # Start translating a stable interim result while recognition continues.
+                Partial = driver.find_element(by=By.ID, value="interim").text
+                if Partial != Interim:
+                    Interim, InterimSince = Partial, time.monotonic()
+                elif Partial and Partial != Prefetched and time.monotonic() - InterimSince >= InterimStableSeconds:
+                    Prefetch(Partial)
+                    Prefetched = Partial
         
         except Exception as e:
             pass
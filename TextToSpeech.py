@@ -3,7 +3,9 @@ import random  # Import random library for generating random choices
 import asyncio  # Import asyncio for asynchronous operations
 import edge_tts  # Import edge_tts for text-to-speech functionality
 import os        # Import os for file path handling
+import threading  # Import threading to let one thread speak at a time
 from dotenv import dotenv_values  # Import dotenv for reading environment variables from a .env file
+from Backend.Tracer import Span, Traced  # Import the tracer to time each stage of a turn
 
 # Load environment variables from a .env file
 env_vars = dotenv_values(".env")
@@ -11,40 +13,62 @@ env_vars = dotenv_values(".env")
 # Get the AssistantVoice from the environment variables.
 AssistantVoice = env_vars.get("AssistantVoice")
 
+# Held while speaking, since every thread shares Data\speech.mp3 and the pygame mixer
+# (e.g. a reminder firing on the scheduler thread while a turn is being answered).
+SpeechLock = threading.Lock()
+
+# Asynchronous generator yielding the synthesized speech as MP3 chunks while it is generated
+async def SpeechAudio(text):
+    # Create the communicate object to generate speech
+    communicate = edge_tts.Communicate(text, AssistantVoice, pitch = '+5Hz', rate ='+13%')
+    async for chunk in communicate.stream():
+        if chunk["type"] == "audio":
+            yield chunk["data"]
+
 # Asynchronous function to convert text to an audio file
-async def TextToAudioFile(text) -> None:
+async def TextToAudioFile(text, func=lambda r=None: True) -> bool:
     file_path = r"Data\speech.mp3"  # Define the path where the speech file will be saved/
 
     if os.path.exists(file_path):  # Check if the file already exists
         os.remove(file_path)
     
-    # Create the communicate object to generate speech
-    communicate = edge_tts.Communicate(text, AssistantVoice, pitch = '+5Hz', rate ='+13%')
     #await communicate.save(r'Data\speech.mp3')  # Save the generated speech as an mp3 file
-    async for chunk in communicate.stream():
-        if chunk["type"] == "audio":
-            with open(file_path, "ab") as f:
-                f.write(chunk["data"])
+    with open(file_path, "ab") as f:
+        async for data in SpeechAudio(text):
+            if func() == False:  # Stop synthesising if the playback was cancelled.
+                return False
+            f.write(data)
+    return True
 
 # Function to manage Text-to-Speech (TTS) functionality
 def TTS(Text, func=lambda r=None: True):
+    with SpeechLock:
+        return SpeakLocked(Text, func)
+
+# Function to synthesize and play the text; called with the speech lock held
+def SpeakLocked(Text, func):
     while True:
         try:
-            # convert text to an audio file asynchronously
-            asyncio.run(TextToAudioFile(Text))
+            # convert text to an audio file asynchronously, stopping early if cancelled
+            with Span("tts.synthesis", characters=len(Text)):
+                synthesized = asyncio.run(TextToAudioFile(Text, func))
+            if not synthesized:
+                return False
 
-            # Initialize pygame mixer for audio playback
-            pygame.mixer.init()
+            with Span("tts.playback"):
+                # Initialize pygame mixer for audio playback
+                pygame.mixer.init()
 
-            # Load the generated speech file into pygame mixer
-            pygame.mixer.music.load(r"Data\speech.mp3")
-            pygame.mixer.music.play()   # Play the audio
+                # Load the generated speech file into pygame mixer
+                pygame.mixer.music.load(r"Data\speech.mp3")
+                pygame.mixer.music.play()   # Play the audio
 
-            # Loop until the audio is done playing or the function stops
-            while pygame.mixer.music.get_busy():
-                if func() == False:  # check if the external function return false
-                    break
-                pygame.time.Clock().tick(10)  # Limit the loop to 10 ticks per second
+                # Loop until the audio is done playing or the function stops
+                clock = pygame.time.Clock()
+                while pygame.mixer.music.get_busy():
+                    if func() == False:  # check if the external function return false
+                        break
+                    clock.tick(50)  # Check 50 times per second so an interruption stops playback quickly
 
             return True  # Return True if the audio played successfully
         
@@ -55,14 +79,16 @@ def TTS(Text, func=lambda r=None: True):
             try:
                 # call the provided function with False to signal the end of TTS
                 func(False)
-                pygame.mixer.music.stop()  # Stop the audio playback
-                pygame.mixer.quit()  # Quit the pygame mixer
+                if pygame.mixer.get_init():
+                    pygame.mixer.music.stop()  # Stop the audio playback
+                    pygame.mixer.quit()  # Quit the pygame mixer
             
             except Exception as e:  # Handle any exception during cleanup
                 print(f"Error in finally block: {e}")
 
 
 # Function to manage Text-To-Speech with additional responses for long text
+@Traced("tts")
 def TextToSpeech(Text, func=lambda r=None: True):
     Data = str(Text).split(".")  # Split the text by periods into a list of sentences
 
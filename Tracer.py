@@ -0,0 +1,111 @@
+from collections import deque, defaultdict  # Import containers for the bounded event and duration buffers.
+import contextvars                           # Import contextvars so spans nest correctly across threads and tasks.
+import functools                             # Import functools to build the tracing decorator.
+import threading                             # Import threading to guard shared buffers.
+import asyncio                               # Import asyncio to detect coroutine functions.
+import json                                  # Import json to export Chrome traces.
+import time                                  # Import time for monotonic timestamps.
+import os                                    # Import os for the process id.
+
+# Path the Chrome trace-event file is exported to (open it in chrome://tracing or Perfetto).
+TracePath = r"Data\Trace.json"
+
+# Number of finished spans kept for export, and number of recent durations kept per stage.
+MaxTraceEvents = 20000
+StageWindow = 200
+
+CurrentSpan = contextvars.ContextVar("CurrentSpan", default=None)  # Innermost open span.
+TraceEvents = deque(maxlen=MaxTraceEvents)                          # Finished spans as trace events.
+StageDurations = defaultdict(lambda: deque(maxlen=StageWindow))     # Recent durations in ms per stage.
+TraceLock = threading.Lock()
+TraceOrigin = time.perf_counter_ns()
+ProcessId = os.getpid()
+
+# A timed, nestable section of work, used as a context manager.
+class Span:
+
+    def __init__(self, name, **args):
+        self.name = name
+        self.args = args
+        self.parent = None
+        self.start = None
+        self.token = None
+
+    def __enter__(self):
+        self.parent = CurrentSpan.get()
+        self.token = CurrentSpan.set(self)
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter_ns()
+        CurrentSpan.reset(self.token)
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+
+        event = {
+            "name": self.name,
+            "cat": self.parent.name if self.parent else "turn",
+            "ph": "X",
+            "ts": (self.start - TraceOrigin) / 1000,
+            "dur": (end - self.start) / 1000,
+            "pid": ProcessId,
+            "tid": threading.get_ident(),
+            "args": {key: str(value) for key, value in self.args.items()},
+        }
+        with TraceLock:
+            TraceEvents.append(event)
+            StageDurations[self.name].append((end - self.start) / 1e6)
+        return False
+
+# Decorator tracing every call of a function (or coroutine function) as a span.
+def Traced(name):
+    def Decorator(function):
+        if asyncio.iscoroutinefunction(function):
+            @functools.wraps(function)
+            async def AsyncWrapper(*args, **kwargs):
+                with Span(name):
+                    return await function(*args, **kwargs)
+            return AsyncWrapper
+
+        @functools.wraps(function)
+        def Wrapper(*args, **kwargs):
+            with Span(name):
+                return function(*args, **kwargs)
+        return Wrapper
+    return Decorator
+
+# Function to get a nearest-rank percentile of sorted values.
+def Percentile(values, percent):
+    index = max(0, min(len(values) - 1, round(percent / 100 * len(values) + 0.5) - 1))
+    return values[index]
+
+# Function to summarise the recent durations of each stage as count, p50 and p95 in ms.
+def StageSummary():
+    with TraceLock:
+        stages = {name: sorted(durations) for name, durations in StageDurations.items() if durations}
+    return {
+        name: {"count": len(values), "p50": Percentile(values, 50), "p95": Percentile(values, 95)}
+        for name, values in stages.items()
+    }
+
+# Function to print the per-stage summary.
+def PrintStageSummary():
+    for name, stats in sorted(StageSummary().items()):
+        print(f"{name:<24} n={stats['count']:<4} p50={stats['p50']:9.1f} ms  p95={stats['p95']:9.1f} ms")
+
+# Function to export the recorded spans as Chrome trace-event JSON.
+def ExportChromeTrace(path=TracePath):
+    with TraceLock:
+        events = list(TraceEvents)
+    trace = {
+        "traceEvents": events,
+        "displayTimeUnit": "ms",
+        "otherData": {"stages": StageSummary()},
+    }
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+    except OSError as e:
+        print(f"Could not export trace: {e}")
+    return path
@@ -0,0 +1,109 @@
+from concurrent.futures import ThreadPoolExecutor  # Import a thread pool for background translation.
+from collections import OrderedDict, deque          # Import containers for the LRU cache and latency log.
+from dotenv import dotenv_values                    # Import dotenv to read the backend settings.
+import mtranslate as mt                             # Import mtranslate as the default web backend.
+import threading                                    # Import threading to guard the cache.
+import time                                         # Import time to measure translation latency.
+
+# Load environment variables from the .env file.
+env_vars = dotenv_values(".env")
+InputLanguage = str(env_vars.get("InputLanguage") or "en")
+TranslationBackend = env_vars.get("TranslationBackend") or "mtranslate"
+
+# Number of translations kept in the LRU cache.
+TranslationCacheSize = 512
+
+# Latency of recent translations, newest last: {"text", "seconds", "cached", "backend"}.
+TranslationLatencies = deque(maxlen=100)
+
+# Function to translate through the mtranslate web scraper.
+def MTranslateBackend(text, target, source):
+    return mt.translate(text, target, source)
+
+# Function to translate offline with Argos Translate, if it is installed with the language package.
+def ArgosBackend(text, target, source):
+    import argostranslate.translate  # Imported here since the offline backend is optional.
+    if source == "auto":
+        source = InputLanguage.split("-")[0].lower()
+    return argostranslate.translate.translate(text, source, target)
+
+# Registered translation backends by name.
+Backends = {
+    "mtranslate": MTranslateBackend,
+    "argos": ArgosBackend,
+}
+
+# Function to plug in another translation backend.
+def RegisterBackend(name, function):
+    Backends[name] = function
+
+TranslationCache = OrderedDict()   # (text, target, source) -> translation, least recently used first.
+InFlight = {}                      # (text, target, source) -> future of a translation being computed.
+CacheLock = threading.Lock()
+TranslationExecutor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="Translator")
+
+# Function to run the configured backend, falling back to mtranslate if it fails.
+def RunBackend(text, target, source):
+    backend = Backends.get(TranslationBackend, MTranslateBackend)
+    try:
+        return backend(text, target, source)
+    except Exception as e:
+        if backend is MTranslateBackend:
+            raise
+        print(f"Translation backend '{TranslationBackend}' failed, using mtranslate: {e}")
+        return MTranslateBackend(text, target, source)
+
+# Function to compute a translation and store it in the cache.
+def ComputeTranslation(key):
+    try:
+        translation = RunBackend(*key)
+        with CacheLock:
+            TranslationCache[key] = translation
+            if len(TranslationCache) > TranslationCacheSize:
+                TranslationCache.popitem(last=False)
+        return translation
+    finally:
+        with CacheLock:
+            InFlight.pop(key, None)
+
+# Function to get the cached translation or the future of one in flight, starting it if needed.
+def Lookup(key, start):
+    with CacheLock:
+        if key in TranslationCache:
+            TranslationCache.move_to_end(key)
+            return TranslationCache[key], None
+        future = InFlight.get(key)
+        if future is None and start:
+            future = TranslationExecutor.submit(ComputeTranslation, key)
+            InFlight[key] = future
+        return None, future
+
+# Function to start translating text in the background, e.g. an interim recognition result.
+def Prefetch(text, target="en", source="auto"):
+    text = " ".join(text.split())
+    if text:
+        Lookup((text, target, source), start=True)
+
+# Function to translate text, reusing cached and in-flight translations, and record the latency.
+def Translate(text, target="en", source="auto"):
+    started = time.perf_counter()
+    key = (" ".join(text.split()), target, source)
+    translation, future = Lookup(key, start=True)
+    cached = future is None
+
+    if translation is None:
+        translation = future.result()
+
+    TranslationLatencies.append({
+        "text": key[0],
+        "seconds": time.perf_counter() - started,
+        "cached": cached,
+        "backend": TranslationBackend,
+    })
+    return translation
+
+# Main entry point for trying translations interactively.
+if __name__ == "__main__":
+    while True:
+        print(Translate(input("Enter text to translate: ")))
+        print(TranslationLatencies[-1])
@@ -0,0 +1,343 @@
+import numpy as np                  # Import numpy for feature extraction and template matching.
+from dotenv import dotenv_values    # Import dotenv to read the assistant name from the .env file.
+import threading                    # Import threading for the listener thread.
+import queue                        # Import queue to hand audio frames to the listener thread.
+import wave                         # Import wave to read and write WAV templates.
+import glob                         # Import glob to find template and benchmark files.
+import tempfile                     # Import tempfile for generated benchmark inputs.
+import time                         # Import time for CPU measurements.
+import sys                          # Import sys for command line arguments.
+import os                           # Import os for file path handling.
+
+# Load environment variables from the .env file.
+env_vars = dotenv_values(".env")
+Assistantname = str(env_vars.get("Assistantname") or "jarvis")
+WakeWordThreshold = env_vars.get("WakeWordThreshold")  # Optional override of the calibrated threshold.
+
+# Directory holding the recorded wake word templates and the benchmark fixtures.
+WakeWordDir = r"Data\WakeWord"
+
+# Audio format: 16 kHz mono, processed in 10 ms frames with a 25 ms analysis window.
+SampleRate = 16000
+FrameSamples = 160
+WindowSamples = 400
+FFTSize = 512
+MelBands = 24
+CepstralCoefficients = 13
+
+# Voice activity gate: a frame is speech when its energy is this many times the noise floor.
+SpeechFactor = 4.0
+MinSpeechEnergy = 1e-6
+HangoverFrames = 20         # 200 ms of silence ends an utterance.
+EvaluateEveryFrames = 10    # While speaking, look for the wake word every 100 ms.
+RefractoryFrames = 150      # Ignore the 1.5 s after a detection.
+DefaultThreshold = 0.25     # Used when there are too few templates to calibrate.
+
+# Function to build the triangular mel filterbank.
+def MelFilterbank():
+    def HzToMel(hz):
+        return 2595 * np.log10(1 + hz / 700)
+
+    def MelToHz(mel):
+        return 700 * (10 ** (mel / 2595) - 1)
+
+    points = MelToHz(np.linspace(HzToMel(60), HzToMel(SampleRate / 2), MelBands + 2))
+    bins = np.floor((FFTSize + 1) * points / SampleRate).astype(int)
+    filters = np.zeros((MelBands, FFTSize // 2 + 1))
+    for band in range(MelBands):
+        left, centre, right = bins[band], bins[band + 1], bins[band + 2]
+        if centre > left:
+            filters[band, left:centre] = (np.arange(left, centre) - left) / (centre - left)
+        if right > centre:
+            filters[band, centre:right] = (right - np.arange(centre, right)) / (right - centre)
+    return filters
+
+# Function to build the DCT-II matrix turning log mel energies into cepstral coefficients.
+def DCTMatrix():
+    n = np.arange(MelBands)
+    return np.cos(np.pi / MelBands * (n + 0.5) * np.arange(CepstralCoefficients)[:, None])
+
+MelFilters = MelFilterbank()
+CepstralMatrix = DCTMatrix()
+AnalysisWindow = np.hamming(WindowSamples)
+
+# Streaming MFCC extractor producing one feature vector per 10 ms frame.
+class FeatureExtractor:
+
+    def __init__(self):
+        self.buffer = np.zeros(WindowSamples)
+
+    # Function to add a frame and return (features, energy) for it.
+    def process(self, frame):
+        self.buffer[:-len(frame)] = self.buffer[len(frame):]
+        self.buffer[-len(frame):] = frame
+        energy = float(np.mean(frame ** 2))
+        spectrum = np.abs(np.fft.rfft(self.buffer * AnalysisWindow, FFTSize)) ** 2
+        features = CepstralMatrix @ np.log(MelFilters @ spectrum + 1e-10)
+        return features[1:], energy  # Drop c0 so matching ignores loudness.
+
+# Function to normalise a sequence of feature vectors for cosine matching.
+def NormaliseFeatures(features):
+    features = features - features.mean(axis=0)
+    return features / (np.linalg.norm(features, axis=1, keepdims=True) + 1e-10)
+
+# Function to find the best match of a template anywhere inside a sequence, as a per-frame cosine distance.
+def SubsequenceDistance(template, sequence):
+    cost = 1 - template @ sequence.T
+    total = cost[0].copy()  # Free start: the match may begin at any frame of the sequence.
+
+    for row in cost[1:]:
+        # Each template frame advances the sequence by 0, 1 or 2 frames (0.5x to 2x speaking rate).
+        best = total.copy()
+        best[1:] = np.minimum(best[1:], total[:-1])
+        best[2:] = np.minimum(best[2:], total[:-2])
+        total = row + best
+
+    return float(total.min()) / len(template)  # Free end.
+
+# Function to read a WAV file as 16 kHz mono floats.
+def ReadWav(path):
+    with wave.open(path, "rb") as f:
+        channels, width, rate = f.getnchannels(), f.getsampwidth(), f.getframerate()
+        data = f.readframes(f.getnframes())
+
+    dtype = {1: np.uint8, 2: np.int16, 4: np.int32}[width]
+    samples = np.frombuffer(data, dtype=dtype).astype(np.float64)
+    if width == 1:
+        samples -= 128
+    samples /= float(2 ** (8 * width - 1))
+    if channels > 1:
+        samples = samples.reshape(-1, channels).mean(axis=1)
+    if rate != SampleRate:
+        positions = np.arange(0, len(samples), rate / SampleRate)
+        samples = np.interp(positions, np.arange(len(samples)), samples)
+    return samples
+
+# Function to write 16 kHz mono floats to a WAV file.
+def WriteWav(path, samples):
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SampleRate)
+        f.writeframes((np.clip(samples, -1, 1) * 32767).astype(np.int16).tobytes())
+
+# Function to split samples into 10 ms frames.
+def Frames(samples):
+    for start in range(0, len(samples) - FrameSamples + 1, FrameSamples):
+        yield samples[start:start + FrameSamples]
+
+# Function to turn a recorded wake word into a normalised template, trimming surrounding silence.
+def TemplateFromSamples(samples):
+    extractor = FeatureExtractor()
+    features, energies = [], []
+    for frame in Frames(samples):
+        vector, energy = extractor.process(frame)
+        features.append(vector)
+        energies.append(energy)
+
+    energies = np.array(energies)
+    voiced = np.nonzero(energies > energies.max() * 0.05)[0]
+    if len(voiced) == 0:
+        return None
+    return NormaliseFeatures(np.array(features[voiced[0]:voiced[-1] + 1]))
+
+# Function to load the templates recorded for the assistant name.
+def LoadTemplates(directory=WakeWordDir):
+    templates = []
+    for path in sorted(glob.glob(os.path.join(directory, f"{Assistantname.lower()}*.wav"))):
+        template = TemplateFromSamples(ReadWav(path))
+        if template is not None:
+            templates.append(template)
+    return templates
+
+# Function to pick a detection threshold from how far the templates are from each other.
+def CalibrateThreshold(templates):
+    if WakeWordThreshold:
+        return float(WakeWordThreshold)
+    if len(templates) < 2:
+        return DefaultThreshold
+    distances = [SubsequenceDistance(a, b) for a in templates for b in templates if a is not b]
+    return max(distances) * 2
+
+# Low-CPU wake word detector: an energy gate decides when to run template matching at all.
+class WakeWordDetector:
+
+    def __init__(self, templates, threshold=None):
+        if not templates:
+            raise ValueError("No wake word templates found; record some with 'python WakeWord.py enroll'.")
+        self.templates = templates
+        self.threshold = threshold if threshold is not None else CalibrateThreshold(templates)
+        self.max_frames = int(max(len(template) for template in templates) * 2) + HangoverFrames
+        self.min_frames = int(min(len(template) for template in templates) / 2)
+        self.extractor = FeatureExtractor()
+        self.noise = None
+        self.segment = []
+        self.silence = 0
+        self.since_evaluation = 0
+        self.refractory = 0
+        self.comparisons = 0
+
+    # Function to match the current utterance against the templates.
+    def evaluate(self):
+        self.since_evaluation = 0
+        if len(self.segment) < self.min_frames:
+            return False
+        self.comparisons += 1
+        sequence = NormaliseFeatures(np.array(self.segment[-self.max_frames:]))
+        return min(SubsequenceDistance(template, sequence) for template in self.templates) <= self.threshold
+
+    # Function to process one 10 ms frame, returning True when the wake word was just heard.
+    def process(self, frame):
+        if self.refractory:
+            self.refractory -= 1
+            return False
+
+        features, energy = self.extractor.process(frame)
+        if self.noise is None:
+            self.noise = energy
+
+        if energy > max(self.noise * SpeechFactor, MinSpeechEnergy):
+            self.segment.append(features)
+            self.silence = 0
+            self.since_evaluation += 1
+            detected = self.since_evaluation >= EvaluateEveryFrames and self.evaluate()
+        elif self.segment:
+            self.segment.append(features)
+            self.silence += 1
+            detected = self.silence >= HangoverFrames and self.evaluate()
+            if self.silence >= HangoverFrames:
+                self.segment = []
+        else:
+            self.noise = 0.95 * self.noise + 0.05 * energy  # Track the noise floor between utterances.
+            detected = False
+
+        if len(self.segment) > self.max_frames:
+            del self.segment[:len(self.segment) - self.max_frames]
+
+        if detected:
+            self.segment = []
+            self.refractory = RefractoryFrames
+        return detected
+
+# Function to listen on the microphone and call the callback whenever the wake word is heard.
+def StartWakeWordListener(callback, templates=None):
+    import sounddevice as sd  # Imported here so the module loads on machines without audio input.
+
+    detector = WakeWordDetector(templates or LoadTemplates())
+    frames = queue.Queue(maxsize=200)
+
+    def OnAudio(data, frame_count, time_info, status):
+        try:
+            frames.put_nowait(data[:, 0].astype(np.float64))
+        except queue.Full:
+            pass  # Drop audio rather than fall further behind.
+
+    def Listen():
+        with sd.InputStream(samplerate=SampleRate, channels=1, dtype="float32", blocksize=FrameSamples, callback=OnAudio):
+            while True:
+                if detector.process(frames.get()):
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"Error in wake word callback: {e}")
+
+    thread = threading.Thread(target=Listen, name="WakeWord", daemon=True)
+    thread.start()
+    return thread
+
+# Function to record wake word templates from the microphone.
+def EnrollWakeWord(samples=3, seconds=1.5):
+    import sounddevice as sd
+
+    os.makedirs(WakeWordDir, exist_ok=True)
+    for index in range(1, samples + 1):
+        input(f"Press Enter and say '{Assistantname}' ({index}/{samples})...")
+        recording = sd.rec(int(seconds * SampleRate), samplerate=SampleRate, channels=1, dtype="float32")
+        sd.wait()
+        WriteWav(os.path.join(WakeWordDir, f"{Assistantname.lower()}_{index}.wav"), recording[:, 0])
+    print(f"Saved {samples} templates to {WakeWordDir}")
+
+# Pitch contours (Hz) of the generated benchmark inputs: one stands in for the wake word, the others for other speech.
+SyntheticWakeWord = [180, 260, 420, 300, 200]
+SyntheticOtherWords = [[300, 300, 250], [150, 200, 150, 220], [400, 250, 400], [220, 180, 140], [500, 350, 250, 350]]
+
+# Function to synthesize a voiced "word": a harmonic tone following a pitch contour, varied slightly in speed and pitch.
+def SyntheticWord(rng, contour, seconds=0.6):
+    count = int(seconds * rng.uniform(0.9, 1.1) * SampleRate)
+    pitch = np.interp(np.linspace(0, 1, count), np.linspace(0, 1, len(contour)), contour) * rng.uniform(0.95, 1.05)
+    phase = 2 * np.pi * np.cumsum(pitch) / SampleRate
+    envelope = np.sin(np.pi * np.linspace(0, 1, count)) ** 0.5
+    return 0.3 * envelope * sum(np.sin(harmonic * phase) / harmonic for harmonic in range(1, 6))
+
+# Function to write synthetic templates and benchmark inputs, for when no recorded fixtures are available.
+def GenerateBenchmarkInputs(directory, positives=20, negatives=10, seed=0):
+    rng = np.random.default_rng(seed)
+    def Silence(seconds):
+        return np.zeros(int(seconds * SampleRate))
+    def Write(path, samples):
+        WriteWav(path, samples + rng.normal(0, 0.005, len(samples)))  # Light background noise.
+
+    for name in ("templates", "positive", "negative"):
+        os.makedirs(os.path.join(directory, name), exist_ok=True)
+    for index in range(1, 4):
+        Write(os.path.join(directory, "templates", f"{Assistantname.lower()}_{index}.wav"), np.concatenate([Silence(0.2), SyntheticWord(rng, SyntheticWakeWord), Silence(0.2)]))
+    for index in range(positives):
+        Write(os.path.join(directory, "positive", f"{index}.wav"), np.concatenate([Silence(1), SyntheticWord(rng, SyntheticWakeWord), Silence(1)]))
+    for index in range(negatives):
+        parts = []
+        for _ in range(10):
+            contour = SyntheticOtherWords[rng.integers(len(SyntheticOtherWords))]
+            parts += [Silence(rng.uniform(0.3, 1.0)), SyntheticWord(rng, contour, rng.uniform(0.3, 0.8))]
+        Write(os.path.join(directory, "negative", f"{index}.wav"), np.concatenate(parts))
+
+# Function to measure false rejects, false accepts and CPU use over WAV fixtures.
+# Without recorded fixtures in positive_dir, synthetic inputs and templates are generated and used instead.
+def WakeWordBenchmark(positive_dir=os.path.join(WakeWordDir, "positive"), negative_dir=os.path.join(WakeWordDir, "negative"), templates=None):
+    if not glob.glob(os.path.join(positive_dir, "*.wav")):
+        with tempfile.TemporaryDirectory() as directory:
+            print(f"No fixtures in {positive_dir}; using generated inputs.")
+            GenerateBenchmarkInputs(directory)
+            return WakeWordBenchmark(os.path.join(directory, "positive"), os.path.join(directory, "negative"), LoadTemplates(os.path.join(directory, "templates")))
+
+    templates = templates or LoadTemplates()
+    threshold = CalibrateThreshold(templates)
+    padding = np.zeros(SampleRate // 2)  # Trailing silence so utterances at the end of a file are evaluated.
+    results = {"positives": 0, "false_rejects": 0, "negative_hours": 0.0, "false_accepts": 0}
+    audio_seconds = 0.0
+    cpu_seconds = 0.0
+
+    for label, directory in (("positive", positive_dir), ("negative", negative_dir)):
+        for path in sorted(glob.glob(os.path.join(directory, "*.wav"))):
+            samples = np.concatenate([ReadWav(path), padding])
+            detector = WakeWordDetector(templates, threshold)
+
+            started = time.process_time()
+            detections = sum(detector.process(frame) for frame in Frames(samples))
+            cpu_seconds += time.process_time() - started
+            audio_seconds += len(samples) / SampleRate
+
+            if label == "positive":
+                results["positives"] += 1
+                results["false_rejects"] += detections == 0
+            else:
+                results["negative_hours"] += len(samples) / SampleRate / 3600
+                results["false_accepts"] += detections
+
+    results["false_reject_rate"] = results["false_rejects"] / max(results["positives"], 1)
+    results["false_accepts_per_hour"] = results["false_accepts"] / max(results["negative_hours"], 1e-9)
+    results["cpu_percent"] = cpu_seconds / max(audio_seconds, 1e-9) * 100
+
+    print(f"Threshold: {threshold:.3f}")
+    print(f"False rejects: {results['false_rejects']}/{results['positives']} ({results['false_reject_rate']:.1%})")
+    print(f"False accepts: {results['false_accepts']} in {results['negative_hours'] * 60:.1f} min ({results['false_accepts_per_hour']:.2f}/hour)")
+    print(f"CPU: {results['cpu_percent']:.2f}% of one core")
+    return results
+
+# Main entry point: enroll templates, run the benchmark, or print detections from the microphone.
+if __name__ == "__main__":
+    if "enroll" in sys.argv:
+        EnrollWakeWord()
+    elif "benchmark" in sys.argv:
+        WakeWordBenchmark()
+    else:
+        StartWakeWordListener(lambda: print(f"Wake word '{Assistantname}' detected")).join()